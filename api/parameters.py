@@ -17,6 +17,12 @@ def parse_common_vrp_parameters(content: dict, errors):
     }
 
 
+def parse_vrp_bf_parameters(content: dict, errors):
+    return {
+        "gap": get_parameter("gap", content, errors, optional=True),
+    }
+
+
 def parse_vrp_ga_parameters(content: dict, errors):
     return {
         "multi_threaded": get_parameter("multiThreaded", content, errors),
@@ -24,6 +30,12 @@ def parse_vrp_ga_parameters(content: dict, errors):
         "iteration_count": get_parameter("iterationCount", content, errors),
         "max_k": get_parameter("max_k", content, errors),
         "k_lower_limit": get_parameter("k_lower_limit", content, errors),
+        "crossover": get_parameter("crossover", content, errors, optional=True),
+        "decoder": get_parameter("decoder", content, errors, optional=True),
+        "stall_generations": get_parameter("stallGenerations", content, errors, optional=True),
+        "diversity_floor": get_parameter("diversityFloor", content, errors, optional=True),
+        "time_limit": get_parameter("timeLimit", content, errors, optional=True),
+        "initializer": get_parameter("initializer", content, errors, optional=True),
     }
 
 
@@ -34,6 +46,10 @@ def parse_vrp_sa_parameters(content: dict, errors):
         "cooldown_factor": get_parameter("cooldownFactor", content, errors),
         "step_length": get_parameter("slowdownMultiplier", content, errors),
         "terminate_after": get_parameter("totalIterations", content, errors),
+        "replicas": get_parameter("replicas", content, errors, optional=True),
+        "exchange_interval": get_parameter("exchangeInterval", content, errors, optional=True),
+        "operator_selection": get_parameter("operatorSelection", content, errors, optional=True),
+        "decoder": get_parameter("decoder", content, errors, optional=True),
     }
 
 
@@ -69,11 +85,18 @@ def parse_common_tsp_parameters(content: dict, errors):
     }
 
 
+def parse_tsp_bf_parameters(content: dict, errors):
+    return {
+        "gap": get_parameter("gap", content, errors, optional=True),
+    }
+
+
 def parse_tsp_ga_parameters(content: dict, errors):
     return {
         "multi_threaded": get_parameter("multiThreaded", content, errors),
         "random_permutationCount": get_parameter("randomPermutationCount", content, errors),
         "iteration_count": get_parameter("iterationCount", content, errors),
+        "crossover": get_parameter("crossover", content, errors, optional=True),
     }
 
 
@@ -86,6 +109,18 @@ def parse_tsp_sa_parameters(content: dict, errors):
         "init": get_parameter("init", content, errors),
         "termination": get_parameter("termination", content, errors),
         "neighborhood": get_parameter("neighborhood", content, errors),
+        "gap": get_parameter("gap", content, errors, optional=True),
+        "batch_size": get_parameter("batch_size", content, errors, optional=True),
+        "target_acceptance": get_parameter("target_acceptance", content, errors, optional=True),
+        "reheat_after": get_parameter("reheat_after", content, errors, optional=True),
+        "time_limit": get_parameter("time_limit", content, errors, optional=True),
+        "max_evaluations": get_parameter("max_evaluations", content, errors, optional=True),
+    }
+
+
+def parse_tsp_dp_parameters(content: dict, errors):
+    return {
+        "beam_width": get_parameter("beam_width", content, errors, optional=True),
     }
 
 
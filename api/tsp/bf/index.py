@@ -3,7 +3,7 @@ import json
 from http.server import BaseHTTPRequestHandler
 from api.database import DatabaseTSP
 from api.helpers import fail, success
-from api.parameters import parse_common_tsp_parameters
+from api.parameters import parse_common_tsp_parameters, parse_tsp_bf_parameters
 from src.tsp.brute_force.brute_force import run_request
 from src.utilities.helper.locations_helper import (
     convert_locations,
@@ -36,6 +36,7 @@ class handler(BaseHTTPRequestHandler):
         # Parse parameters
         errors = []
         params = parse_common_tsp_parameters(content, errors)
+        params_bf = parse_tsp_bf_parameters(content, errors)
 
         if len(errors) > 0:
             fail(self, errors)
@@ -85,6 +86,7 @@ class handler(BaseHTTPRequestHandler):
             load=demands,
             do_loading_unloading=do_loading_unloading,
             cancelled_customers=cancel_customers,
+            gap=params_bf["gap"] if params_bf["gap"] is not None else 0,
         )
         result = tsp_result_2_output(
             start_time=params["start_time"],
@@ -100,6 +102,8 @@ class handler(BaseHTTPRequestHandler):
         time_end = datetime.datetime.now()
         time_diff = (time_end - time_start).total_seconds()
         result["time_diff"] = time_diff
+        result["lowerBound"] = tsp_result["lower_bound"]
+        result["gap"] = tsp_result["gap"]
 
         # Save results
         if params["auth"]:
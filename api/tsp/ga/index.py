@@ -3,6 +3,7 @@ from http.server import BaseHTTPRequestHandler
 from api.database import DatabaseTSP
 from api.helpers import fail, success
 from api.parameters import parse_common_tsp_parameters, parse_tsp_ga_parameters
+from src.genetic_algorithm.crossover import DEFAULT_CROSSOVER_METHOD
 from src.genetic_algorithm.genetic_algorithm import run_GA as run
 from api.helpers import remove_unused_locations_tsp
 from src.utilities.helper.locations_helper import remove_unused_locations_tsp
@@ -82,6 +83,7 @@ class handler(BaseHTTPRequestHandler):
             do_load_unload=params["do_loading_unloading"],
             max_k=-1,
             k_lower_limit=True,
+            crossover_method=params_ga["crossover"] if params_ga["crossover"] is not None else DEFAULT_CROSSOVER_METHOD,
         )
 
         filtered_locations = remove_unused_locations_tsp(locations, params["customers"], params["start_node"])
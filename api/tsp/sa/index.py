@@ -4,7 +4,7 @@ from http.server import BaseHTTPRequestHandler
 from api.database import DatabaseTSP
 from api.helpers import fail, success
 from api.parameters import parse_common_tsp_parameters, parse_tsp_sa_parameters
-from src.tsp.simulated_annealing.simulated_annealing import run_request
+from src.tsp.simulated_annealing.simulated_annealing import DEFAULT_TARGET_ACCEPTANCE, run_request
 from src.utilities.helper.locations_helper import (
     convert_locations,
     remove_unused_locations_tsp,
@@ -93,6 +93,16 @@ class handler(BaseHTTPRequestHandler):
             init=params_sa["init"],
             termination=params_sa["termination"],
             neighborhood=params_sa["neighborhood"],
+            gap=params_sa["gap"] if params_sa["gap"] is not None else 0,
+            batch_size=params_sa["batch_size"],
+            target_acceptance=(
+                params_sa["target_acceptance"]
+                if params_sa["target_acceptance"] is not None
+                else DEFAULT_TARGET_ACCEPTANCE
+            ),
+            reheat_after=params_sa["reheat_after"],
+            time_limit=params_sa["time_limit"],
+            max_evaluations=params_sa["max_evaluations"],
         )
         result = tsp_result_2_output(
             start_time=params["start_time"],
@@ -108,6 +118,8 @@ class handler(BaseHTTPRequestHandler):
         time_end = datetime.datetime.now()
         time_diff = (time_end - time_start).total_seconds()
         result["time_diff"] = time_diff
+        result["lowerBound"] = tsp_result["lower_bound"]
+        result["gap"] = tsp_result["gap"]
 
         # Save results
         if params["auth"]:
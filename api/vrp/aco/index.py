@@ -112,6 +112,8 @@ class handler(BaseHTTPRequestHandler):
         time_end = datetime.datetime.now()
         time_diff = (time_end - time_start).total_seconds()
         result["time_diff"] = time_diff
+        result["lowerBound"] = vrp_result["lower_bound"]
+        result["gap"] = vrp_result["gap"]
 
         # Save results
         if params["auth"]:
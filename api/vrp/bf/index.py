@@ -3,7 +3,7 @@ import json
 from http.server import BaseHTTPRequestHandler
 from api.database import DatabaseVRP
 from api.helpers import fail, success
-from api.parameters import parse_common_vrp_parameters
+from api.parameters import parse_common_vrp_parameters, parse_vrp_bf_parameters
 from src.vrp.brute_force.brute_force import run_request
 from src.utilities.helper.locations_helper import (
     convert_locations,
@@ -37,6 +37,7 @@ class handler(BaseHTTPRequestHandler):
         # Parse parameters
         errors = []
         params = parse_common_vrp_parameters(content, errors)
+        params_bf = parse_vrp_bf_parameters(content, errors)
 
         if len(errors) > 0:
             fail(self, errors)
@@ -88,6 +89,7 @@ class handler(BaseHTTPRequestHandler):
             load=demands,
             available_customers=available_customers,
             vehicles_start_times=params["start_times"],
+            gap=params_bf["gap"] if params_bf["gap"] is not None else 0,
         )
         result = vrp_result_2_output(
             vehicles_start_times=params["start_times"],
@@ -101,6 +103,8 @@ class handler(BaseHTTPRequestHandler):
         time_end = datetime.datetime.now()
         time_diff = (time_end - time_start).total_seconds()
         result["time_diff"] = time_diff
+        result["lowerBound"] = vrp_result["lower_bound"]
+        result["gap"] = vrp_result["gap"]
 
         # Save results
         if params["auth"]:
@@ -3,9 +3,14 @@ from http.server import BaseHTTPRequestHandler
 from api.database import DatabaseVRP
 from api.helpers import fail, success
 from api.parameters import parse_common_vrp_parameters, parse_vrp_ga_parameters
+from src.genetic_algorithm.crossover import DEFAULT_CROSSOVER_METHOD
+from src.utilities.helper.split_helper import DEFAULT_DECODER
 from src.genetic_algorithm.genetic_algorithm import run_GA as run
+from src.genetic_algorithm.TDVRP.genetic_algorithm_vrp import DEFAULT_INITIALIZER
 from api.helpers import remove_unused_locations
 
+DEFAULT_TIME_LIMIT = 240  # seconds, leaves time to save the solution within the maxDuration of 300 s in vercel.json
+
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -82,6 +87,12 @@ class handler(BaseHTTPRequestHandler):
             do_load_unload=False,
             max_k=params_ga["max_k"] if params_ga["max_k"] != None else -1,
             k_lower_limit=params_ga["k_lower_limit"] if params_ga["k_lower_limit"] != None else True,
+            crossover_method=params_ga["crossover"] if params_ga["crossover"] is not None else DEFAULT_CROSSOVER_METHOD,
+            decoder=params_ga["decoder"] if params_ga["decoder"] is not None else DEFAULT_DECODER,
+            stall_generations=params_ga["stall_generations"],
+            diversity_floor=params_ga["diversity_floor"],
+            time_limit=params_ga["time_limit"] if params_ga["time_limit"] is not None else DEFAULT_TIME_LIMIT,
+            initializer=params_ga["initializer"] if params_ga["initializer"] is not None else DEFAULT_INITIALIZER,
         )
 
         # Save results
@@ -3,7 +3,8 @@ from http.server import BaseHTTPRequestHandler
 from api.database import DatabaseVRP
 from api.helpers import fail, success, remove_unused_locations
 from api.parameters import parse_common_vrp_parameters, parse_vrp_sa_parameters
-from src.vrp.sa.simulated_annealing import solve
+from src.utilities.helper.split_helper import DEFAULT_DECODER
+from src.vrp.sa.simulated_annealing import DEFAULT_EXCHANGE_INTERVAL, solve
 
 
 class handler(BaseHTTPRequestHandler):
@@ -74,7 +75,13 @@ class handler(BaseHTTPRequestHandler):
             step_length=params_sa["step_length"],
             terminate_after=params_sa["terminate_after"],
             repeat_annealing=5,
-            ignored_customers=params["ignored_customers"])
+            ignored_customers=params["ignored_customers"],
+            replicas=params_sa["replicas"] if params_sa["replicas"] is not None else 1,
+            exchange_interval=params_sa["exchange_interval"]
+            if params_sa["exchange_interval"] is not None else DEFAULT_EXCHANGE_INTERVAL,
+            operator_selection=params_sa["operator_selection"]
+            if params_sa["operator_selection"] is not None else "all",
+            decoder=params_sa["decoder"] if params_sa["decoder"] is not None else DEFAULT_DECODER)
         
         # Save results
         if params["auth"]:
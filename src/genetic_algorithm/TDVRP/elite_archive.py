@@ -0,0 +1,71 @@
+import heapq
+from itertools import count
+
+from src.genetic_algorithm.fitness_cache import FitnessCache
+from src.genetic_algorithm.TDVRP.population import Population
+
+
+class EliteArchive:
+    """
+    Fixed-capacity archive of the best distinct individuals found so far, ordered by route max time then route sum time
+    The worst archived individual is kept at the top of a heap, so that it can be replaced in O(log capacity)
+    Chromosomes are deduplicated by their FitnessCache key, a chromosome found again is counted instead of stored again
+    The memory and the size of the population built from the archive do not grow with the number of iterations
+    """
+
+    def __init__(self, capacity: int):
+        """
+        :param capacity: Maximum number of individuals to be kept
+        """
+        assert capacity > 0, "capacity should be positive"
+        self.capacity = capacity
+        # max-heap of (-duration, -sum duration, -insertion order, key, chromosome), the worst individual is heap[0]
+        self.heap = []
+        # number of times each archived chromosome was added, i.e. found again by the islands
+        self.copies = {}
+        self.counter = count()
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def add(self, population: Population) -> None:
+        """
+        Archives the individuals of the population that are distinct and better than the worst archived one
+
+        :param population: Individuals to be archived
+        """
+        for idx in range(len(population)):
+            duration = float(population.durations[idx])
+            sum_duration = float(population.sum_durations[idx])
+            if len(self.heap) == self.capacity and (-self.heap[0][0], -self.heap[0][1]) < (duration, sum_duration):
+                continue
+            chromosome = population.get_chromosome(idx)
+            key = FitnessCache.key(chromosome)
+            if key in self.copies:
+                self.copies[key] += 1
+                continue
+            if len(self.heap) == self.capacity and (-self.heap[0][0], -self.heap[0][1]) == (duration, sum_duration):
+                continue
+            # earlier individuals are preferred among equals, so the later ones are dropped first
+            entry = (-duration, -sum_duration, -next(self.counter), key, chromosome)
+            self.copies[key] = 1
+            if len(self.heap) < self.capacity:
+                heapq.heappush(self.heap, entry)
+            else:
+                del self.copies[heapq.heapreplace(self.heap, entry)[3]]
+
+    def population(self) -> Population:
+        """
+        :return: Archived individuals sorted by route max time then route sum time, earlier ones first among equals
+            Each individual is repeated as many times as it was added, up to the capacity in total
+        """
+        entries = []
+        for entry in sorted(self.heap, reverse=True):
+            entries.extend(min(self.copies[entry[3]], self.capacity - len(entries)) * [entry])
+            if len(entries) == self.capacity:
+                break
+        return Population.from_lists(
+            permutations=[entry[4] for entry in entries],
+            durations=[-entry[0] for entry in entries],
+            sum_durations=[-entry[1] for entry in entries],
+        )
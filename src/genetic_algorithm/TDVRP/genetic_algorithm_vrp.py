@@ -6,23 +6,51 @@
 # Imports: General
 import copy
 from datetime import datetime
+import heapq
 from iteration_utilities import random_permutation
 import math
 import random
+import time
 from typing import List, Optional, Tuple, Dict
 from collections import defaultdict
 from itertools import groupby
-
-# Imports: Libraries for Parallel Processing
-import multiprocessing
-from joblib import Parallel, delayed
-from tqdm import tqdm
+import numpy as np
 
 # Imports: Project Files to be Imported
+from src.genetic_algorithm.crossover import (
+    CROSSOVER_METHODS,
+    DEFAULT_CROSSOVER_METHOD,
+    DEFAULT_CROSSOVER_RATE,
+    crossover,
+)
+from src.genetic_algorithm.fitness_cache import DEFAULT_FITNESS_CACHE_SIZE, FitnessCache
+from src.genetic_algorithm.selection import (
+    DEFAULT_SELECTION_METHOD,
+    SELECTION_METHODS,
+    random_indices,
+    select_indices,
+    selection_rng,
+)
+from src.genetic_algorithm.stopping import PHASE_1_TIME_SHARE, StoppingRules
+from src.genetic_algorithm.TDVRP.elite_archive import EliteArchive
+from src.genetic_algorithm.TDVRP.islands import (
+    DEFAULT_MIGRATION_EPOCH,
+    DEFAULT_MIGRATION_SIZE,
+    IslandPool,
+    dominated_groups,
+    migrate,
+)
+from src.genetic_algorithm.TDVRP.population import Population
+from src.utilities.helper.cpu_helper import CPU_BUDGET
+from src.utilities.helper.split_helper import DECODERS, DEFAULT_DECODER, split
+from src.utilities.helper.surrogate_helper import SurrogateScreen
 from src.utilities.vehicles_priority_queue.vehicles_pq import VehiclesPQ
 
 # PARAMETERS
 MIN_ENTRY_COUNT = 25  # used for deciding on making or skipping the selection & replacement step
+MIN_SUBPOPULATION_COUNT = MIN_ENTRY_COUNT  # smallest population of an island exploring a single k value
+INITIALIZERS = ["random", "packing"]  # generation methods of a new population, see ga
+DEFAULT_INITIALIZER = "packing"
 INF = float("inf")
 N_TIME_SLICES = 12
 N_TIME_ZONES = 12  # hours = time slices
@@ -35,274 +63,140 @@ DEPOT = 0
 # GENETIC ALGORITHM LOGIC
 
 
-def random_selection(permutations, sel_count, already_selected=[]):
+def random_selection(population, sel_count, already_selected=None):
     """
-    Randomly selects 'sel_count' many permutations and starts the process with the permutations available in
+    Randomly selects 'sel_count' many distinct individuals and starts the process with the individuals available in
     'already selected' list
 
-    :param permutations: all available permutations
-    :param sel_count: number of permutations to be selected
-    :param already_selected: previously selected permutations
+    :param population: all available individuals
+    :param sel_count: number of individuals to be selected
+    :param already_selected: indices of the previously selected individuals
     """
-    # select 'sel_count' many permutations in a random fashion
-    selection_indices = []
-    while len(already_selected) < sel_count:
-        rand_index = random.randint(0, len(permutations) - 1)
-        while rand_index in selection_indices:
-            rand_index = random.randint(0, len(permutations) - 1)
-
-        already_selected.append(permutations[rand_index])
-        selection_indices.append(rand_index)
+    return population.take(random_indices(len(population), sel_count, already_selected))
 
-    return already_selected
 
-
-def reverse_insert_probability_list(permutations, probability_list, inf_start_at_index):
-    """
-    Reverses the probability ranges to be matched with each permutation available
-    This allows the permutations with smaller duration to get a bigger portion
-    in the fitness proportional selection
-
-    :param permutations: all available permutations
-    :param probability_list: duration based fitness intervals
-    :param inf_start_at_index: indicates the index at which the infeasible permutations start getting listed in
-                                the 'permutations' list
+def select_based_on_fitness_proportional(population):
     """
+     Select a predefined number of individuals from the given population, the individuals with shorter durations
+     get bigger portions of the roulette wheel
 
-    # the fitness and total cost are inversely related
-    # permutations with shorter duration will get higher fitness value
-
-    # divide the probability list into two depending on the inf total duration values
-    probability_list_non_inf_values = probability_list[:inf_start_at_index]
-    probability_list_inf_values = probability_list[inf_start_at_index:]
-
-    # reverse the duration based probability list and assign bigger portions for the permutations with lower duration
-    probability_list_non_inf_values.reverse()
-    current_fitness_level = 0
-    for index in range(0, len(probability_list_non_inf_values)):
-
-        if not len(permutations[index]) >= 7:
-
-            permutations[index].append(
-                [current_fitness_level, current_fitness_level + probability_list_non_inf_values[index]]
-            )
-            current_fitness_level = current_fitness_level + probability_list_non_inf_values[index]
-
-        else:
-            permutations[index][6] = [
-                current_fitness_level,
-                current_fitness_level + probability_list_non_inf_values[index],
-            ]
-            current_fitness_level = current_fitness_level + probability_list_non_inf_values[index]
-
-    # fills in the rest of the probability range values for the remaining permutations in the list
-    count = 0
-    for index in range(len(probability_list_non_inf_values), len(permutations)):
-
-        if not len(permutations[index]) >= 7:
-            permutations[index].append(
-                [current_fitness_level, current_fitness_level + probability_list_inf_values[count]]
-            )
-            current_fitness_level = current_fitness_level + probability_list_inf_values[count]
-
-        else:
-            permutations[index][6] = [current_fitness_level, current_fitness_level + probability_list_inf_values[count]]
-            current_fitness_level = current_fitness_level + probability_list_inf_values[count]
-
-        count = count + 1
-
-    return permutations
-
-
-def calculate_fitness_level(remaining_permutations):
-    """
-     Based on the previously calculated duration information, calculate the fitness level of each permutation
-
-    :param remaining_permutations: all available permutations
+    :param population: all available individuals
     """
-    # print("SELECTION: Calculating fitness level...")
-
-    sorted(remaining_permutations, key=lambda x: x[2], reverse=False)
-    shortest_duration = remaining_permutations[0][2]
-    total_sum = 0
-
-    for elem in remaining_permutations:
-        # if the permutation is not infeasible then add the total duration to the total sum
-        if elem[2] != math.inf:
-            total_sum = total_sum + elem[2]
-        # if the permutation is infeasible then add the shortest duration of the permutation list as the
-        # total duration of the infeasible solution so that the fitness value distribution would be balanced
-        else:
-            total_sum = total_sum + shortest_duration
-
-    probability_list = []
-    inf_starts_at_index = 0
-
-    # the index at which the infeasible solutions start is found and stored for it to be used in the reversion method
-    for index in range(0, len(remaining_permutations)):
-
-        # find the non-reversed fitness level of each permutation
-        if remaining_permutations[index][2] != math.inf:
-            fitness_level = remaining_permutations[index][2] / total_sum
-        else:
-            fitness_level = (shortest_duration) / total_sum
-
-            if inf_starts_at_index == 0:  # if it has been already changed then do not change it again
-                inf_starts_at_index = index
-
-        # store the non-reversed fitness level
-        probability_list.append(fitness_level)
-
-    # find the original/adjusted/reversed fitness levels
-    remaining_permutations = reverse_insert_probability_list(
-        remaining_permutations, probability_list, inf_starts_at_index
-    )
-
-    return remaining_permutations
-
-
-def select_based_on_fitness_proportional(permutations):
-    """
-     Select a predefined number of permutations from the given permutations list
-
-    :param permutations: all available permutations
-    """
-
-    start = datetime.now()
-    mode = "FITNESS"
-    selection_len = int(len(permutations) * 5 / 8)
-    selected = []
-
-    # continue fitness proportional selection until the selection length is reached
-    while len(selected) < selection_len:
-
-        end = datetime.now()
-
-        if (end - start).seconds >= 0.5:
-            # current implementation of the fitness proportional method might take some time
-            # current time limit is 10 seconds
-            # if the threshold is exceeded than selection mode is switched to RANDOM selection
-            mode = "RANDOM"
-            break
-
-        else:  # time limit has not reached, continue fitness proportional selection
-            # generate random number between 0 and 1
-            rand = random.uniform(0, 1)
-
-            # find the permutation which has this value in its own fitness range
-            for index in range(0, len(permutations)):
-                elem = permutations[index]
-                if elem[6][0] <= rand <= elem[6][1] and elem[1]:
-                    selected.append(elem)
-                    break
-
-    if mode == "RANDOM":
-        return random_selection(permutations=permutations, sel_count=selection_len, already_selected=selected)
-
-    return selected
+    selection_len = int(len(population) * 5 / 8)
+    return population.take(select_indices(population.durations, selection_len, method="roulette"))
 
 
 # REPLACEMENT
 
 
-def deterministic_best_n_replacement(permutations, n=-1):
+def deterministic_best_n_replacement(population, n=-1):
     """
-    Sort the permutations based on duration and return the best n
-    If n is not specified simply get the first half of the list
+    Sort the individuals based on duration and return the best n
+    If n is not specified simply get the first half of the population
 
-    :param permutations: all available permutations
+    :param population: all available individuals
     :param n: number of items to be selected
     """
 
     if n != -1:
         replacement_count = n
     else:
-        replacement_count = int(len(permutations) / 2)
+        replacement_count = int(len(population) / 2)
 
-    return sorted(permutations, key=lambda x: x[2], reverse=False)[:replacement_count]
+    return population.take(np.argsort(population.durations, kind="stable")[:replacement_count])
 
 
 # REPRODUCTION
 
 
-def swap_mutation(permutations, VST, dist_data, M, Q, demand_dict):
+def swap_mutation(
+    population, VST, dist_data, M, Q, demand_dict, fitness_cache=None, decoder=DEFAULT_DECODER, screen=None
+):
     """
     Select two random indices and swap these indices
     If the mutated permutation has a longer duration than the previous permutation, simply revert the swap
     If the mutated permutation has a smaller duration than the previous permutation, keep the mutation
 
-    :param permutations: all available permutations
+    :param population: all available individuals, mutated in place
+    :param screen: SurrogateScreen of the "markers" decoder, a swap whose lower bound is not shorter than the previous
+        duration is reverted without calculating its duration
     """
 
     DIST_DATA = dist_data
     vehicles_start_times = VST
 
-    for index in range(0, len(permutations)):
+    for index in range(0, len(population)):
 
-        single_perm = permutations[index]
+        chromosome = population.get_chromosome(index)
+        duration, sum_duration = population.durations[index], population.sum_durations[index]
 
         count = 0
         while count < 10:  # threshold for the number of SWAP mutation to be applied, for now it is 10
             # select two random positions
             # indices 0 and -1 are not included
-            pos1 = random.randint(1, len(single_perm[0]) - 2)
-            pos2 = random.randint(1, len(single_perm[0]) - 2)
+            pos1 = random.randint(1, len(chromosome) - 2)
+            pos2 = random.randint(1, len(chromosome) - 2)
 
             # if two positions are not equal and none of the positions equal to DEPOT
-            if pos1 != pos2 and single_perm[0][pos1] != DEPOT and single_perm[0][pos2] != DEPOT:
+            if pos1 != pos2 and chromosome[pos1] != DEPOT and chromosome[pos2] != DEPOT:
 
                 # swap the indices
-                temp = single_perm[0][pos1]
-                single_perm[0][pos1] = single_perm[0][pos2]
-                single_perm[0][pos2] = temp
-                # calculate the new duration
-                a, b, route_sum_time, vehicle_routes, vehicle_times = calculate_duration(
-                    permutation=single_perm[0],
-                    VST=vehicles_start_times,
-                    dist_data=DIST_DATA,
-                    M=M,
-                    Q=Q,
-                    demand_dict=demand_dict,
-                )
+                chromosome[pos1], chromosome[pos2] = chromosome[pos2], chromosome[pos1]
+                # calculate the new duration, unless it can not be shorter than the previous one
+                if screen is not None and not screen.passes(chromosome, duration):
+                    a, route_sum_time = INF, INF
+                else:
+                    a, route_sum_time = calculate_fitness(
+                        permutation=chromosome,
+                        VST=vehicles_start_times,
+                        dist_data=DIST_DATA,
+                        M=M,
+                        Q=Q,
+                        demand_dict=demand_dict,
+                        fitness_cache=fitness_cache,
+                        decoder=decoder,
+                    )
                 # if the new duration is shorter than the previous one keep it
-                if a < single_perm[2]:
-                    single_perm[2], single_perm[1] = a, b
-                    single_perm[3], single_perm[4], single_perm[5] = route_sum_time, vehicle_routes, vehicle_times
+                if a < duration:
+                    duration, sum_duration = a, route_sum_time
 
                 # if the new duration is longer than the previous one revert the changes
                 else:
-                    temp = single_perm[0][pos1]
-                    single_perm[0][pos1] = single_perm[0][pos2]
-                    single_perm[0][pos2] = temp
+                    chromosome[pos1], chromosome[pos2] = chromosome[pos2], chromosome[pos1]
             count = count + 1
-    return permutations
+
+        population.set_chromosome(index, chromosome, duration, sum_duration)
+    return population
 
 
-def scramble_mutation(permutations, VST, dist_data, M, Q, demand_dict):
+def scramble_mutation(
+    population, VST, dist_data, M, Q, demand_dict, fitness_cache=None, decoder=DEFAULT_DECODER, lazy=False
+):
     """
     Select two random indices
     Shuffle everything that stays between these two randomly selected indices
 
-    :param permutations: all available permutations
+    :param population: all available individuals, mutated in place
+    :param lazy: leave the fitness of the mutated individuals to be calculated on demand, see evaluate_population
     """
 
     DIST_DATA = dist_data
     vehicles_start_times = VST
 
-    for index in range(0, len(permutations)):
-        # get the current permutation
-        single_perm = permutations[index]
+    for index in range(0, len(population)):
+        # get the current chromosome
+        chromosome = population.get_chromosome(index)
 
         count = 0
         while count < 1:  # threshold for the number of SCRAMBLE mutation to be applied, for now it is 1
             # select two random positions
             # indices 0 and -1 are not included
-            pos1 = random.randint(1, len(single_perm[0]) - 2)
-            pos2 = random.randint(1, len(single_perm[0]) - 2)
+            pos1 = random.randint(1, len(chromosome) - 2)
+            pos2 = random.randint(1, len(chromosome) - 2)
 
             while pos1 == pos2:
-                pos1 = random.randint(1, len(single_perm[0]) - 2)
-                pos2 = random.randint(1, len(single_perm[0]) - 2)
+                pos1 = random.randint(1, len(chromosome) - 2)
+                pos2 = random.randint(1, len(chromosome) - 2)
 
             # save the lower and upper bounds as a pair
             bound = (pos1, pos2) if pos1 < pos2 else (pos2, pos1)
@@ -312,111 +206,203 @@ def scramble_mutation(permutations, VST, dist_data, M, Q, demand_dict):
                 while True:
 
                     # get the part before the selected portion
-                    lower_part = single_perm[0][0 : bound[0]]
+                    lower_part = chromosome[0 : bound[0]]
                     # get the part after the selected portion
-                    upper_part = single_perm[0][bound[1] + 1 :]
+                    upper_part = chromosome[bound[1] + 1 :]
                     # get the portion to be reversed
-                    subpart = single_perm[0][bound[0] : bound[1] + 1]
+                    subpart = chromosome[bound[0] : bound[1] + 1]
                     # scramble the related portion
                     random.shuffle(subpart)
 
-                    old_perm = single_perm[0]
-                    # construct the permutation with the reversed portion
-                    new_perm = lower_part + subpart + upper_part
+                    old_chromosome = chromosome
+                    # construct the chromosome with the scrambled portion
+                    chromosome = lower_part + subpart + upper_part
 
-                    single_perm[0] = new_perm
-
-                    if check_neighbor(single_perm[0], source="scramble"):
+                    if check_neighbor(chromosome, source="scramble"):
                         break
 
                     else:
 
                         while pos1 == pos2:
-                            pos1 = random.randint(1, len(single_perm[0]) - 2)
-                            pos2 = random.randint(1, len(single_perm[0]) - 2)
+                            pos1 = random.randint(1, len(chromosome) - 2)
+                            pos2 = random.randint(1, len(chromosome) - 2)
 
                         # save the lower and upper bounds as a pair
                         bound = (pos1, pos2) if pos1 < pos2 else (pos2, pos1)
-                        single_perm[0] = old_perm
+                        chromosome = old_chromosome
                         max_try = max_try - 1
 
                         if max_try == 0:
                             break
 
                 # calculate new duration and save
-                a, b, route_sum_time, vehicle_routes, vehicle_times = calculate_duration(
-                    single_perm[0], VST=vehicles_start_times, dist_data=DIST_DATA, M=M, Q=Q, demand_dict=demand_dict
-                )
-                # a, b = calculate_duration(single_perm[0])
-                single_perm[2], single_perm[1] = a, b
-                single_perm[3], single_perm[4], single_perm[5] = route_sum_time, vehicle_routes, vehicle_times
-                # single_perm.append(route_sum_time)
-                # single_perm.append(vehicle_routes)
-                # single_perm.append(vehicle_times)
+                if lazy:
+                    population.set_chromosome(index, chromosome, math.nan, math.nan)
+                else:
+                    a, route_sum_time = calculate_fitness(
+                        chromosome,
+                        VST=vehicles_start_times,
+                        dist_data=DIST_DATA,
+                        M=M,
+                        Q=Q,
+                        demand_dict=demand_dict,
+                        fitness_cache=fitness_cache,
+                        decoder=decoder,
+                    )
+                    population.set_chromosome(index, chromosome, a, route_sum_time)
 
             count = count + 1
-    return permutations
+    return population
 
 
-def inversion_mutation(permutations, VST, dist_data, M, Q, demand_dict):
+def inversion_mutation(
+    population, VST, dist_data, M, Q, demand_dict, fitness_cache=None, decoder=DEFAULT_DECODER, lazy=False
+):
     """
     Select two random indices
     Reverse everything that stays between these two randomly selected indices
 
-    :param permutations: all available permutations
+    :param population: all available individuals, mutated in place
+    :param lazy: leave the fitness of the mutated individuals to be calculated on demand, see evaluate_population
     """
 
     DIST_DATA = dist_data
     vehicles_start_times = VST
 
-    for index in range(0, len(permutations)):
-        # get the current permutation
-        single_perm = permutations[index]
+    for index in range(0, len(population)):
+        # get the current chromosome
+        chromosome = population.get_chromosome(index)
 
         count = 0
         while count < 1:  # threshold for the number of inversion mutation to be applied, for now it is 1
             # select two random positions
             # indices 0 and -1 are not included
-            pos1 = random.randint(1, len(single_perm[0]) - 2)
-            pos2 = random.randint(1, len(single_perm[0]) - 2)
+            pos1 = random.randint(1, len(chromosome) - 2)
+            pos2 = random.randint(1, len(chromosome) - 2)
 
             # save the lower and upper bounds as a pair
             bound = (pos1, pos2) if pos1 < pos2 else (pos2, pos1)
 
             if pos1 != pos2:
 
-                # get the part before the selected portion
-                lower_part = single_perm[0][0 : bound[0]]
-                # get the part after the selected portion
-                upper_part = single_perm[0][bound[1] + 1 :]
-                # get the portion to be reversed
-                subpart = single_perm[0][bound[0] : bound[1] + 1]
-                # reverse the related portion
-                list.reverse(subpart)
-                # construct the permutation with the reversed portion
-                single_perm[0] = lower_part + subpart + upper_part
+                # reverse the related portion in place
+                chromosome[bound[0] : bound[1] + 1] = chromosome[bound[0] : bound[1] + 1][::-1]
 
                 # calculate new duration and save
-                a, b, route_sum_time, vehicle_routes, vehicle_times = calculate_duration(
-                    single_perm[0], VST=vehicles_start_times, dist_data=DIST_DATA, M=M, Q=Q, demand_dict=demand_dict
-                )
-                # a, b = calculate_duration(single_perm[0])
-                single_perm[2], single_perm[1] = a, b
-                single_perm[3], single_perm[4], single_perm[5] = route_sum_time, vehicle_routes, vehicle_times
-                # single_perm.append(route_sum_time)
-                # single_perm.append(vehicle_routes)
-                # single_perm.append(vehicle_times)
+                if lazy:
+                    population.set_chromosome(index, chromosome, math.nan, math.nan)
+                else:
+                    a, route_sum_time = calculate_fitness(
+                        chromosome,
+                        VST=vehicles_start_times,
+                        dist_data=DIST_DATA,
+                        M=M,
+                        Q=Q,
+                        demand_dict=demand_dict,
+                        fitness_cache=fitness_cache,
+                        decoder=decoder,
+                    )
+                    population.set_chromosome(index, chromosome, a, route_sum_time)
             count = count + 1
 
-    return permutations
+    return population
+
+
+def crossover_population(
+    population,
+    VST,
+    dist_data,
+    M,
+    Q,
+    demand_dict,
+    fitness_cache=None,
+    crossover_method=DEFAULT_CROSSOVER_METHOD,
+    decoder=DEFAULT_DECODER,
+    lazy=False,
+):
+    """
+    Recombine pairs of parents chosen by tournament selection and add their children to the population
+    Only the chromosomes of the same length, i.e. with the same number of tours, are paired
+    The DEPOT nodes at both ends are kept and the interior of the chromosomes is recombined
+
+    :param population: all available individuals, only the competitors of the tournaments are evaluated if lazy
+    :param crossover_method: one of CROSSOVER_METHODS
+    :param lazy: leave the fitness of the children to be calculated on demand, see evaluate_population
+    """
+    evaluation_kwargs = dict(
+        VST=VST, dist_data=dist_data, M=M, Q=Q, demand_dict=demand_dict, fitness_cache=fitness_cache, decoder=decoder
+    )
+    rng = selection_rng()
+    child_count = int(len(population) * DEFAULT_CROSSOVER_RATE)
+    parents = select_indices(
+        population.durations,
+        2 * child_count,
+        "tournament",
+        rng,
+        evaluate=lambda indices: evaluate_population(population, indices, **evaluation_kwargs).durations[indices],
+    )
+
+    children = []
+    for length in np.unique(population.lengths[parents]):
+        group = parents[population.lengths[parents] == length]
+        pair_count = len(group) // 2
+        if pair_count == 0 or length < 4:
+            continue
+        interiors = crossover(
+            population.chromosomes[group[:pair_count], 1 : length - 1],
+            population.chromosomes[group[pair_count : 2 * pair_count], 1 : length - 1],
+            crossover_method,
+            rng,
+        )
+        for interior in interiors.tolist():
+            chromosome = [DEPOT] + interior + [DEPOT]
+            if lazy:
+                children.append((chromosome, math.nan, math.nan))
+            else:
+                children.append((chromosome, *calculate_fitness(chromosome, **evaluation_kwargs)))
+
+    if len(children) == 0:
+        return population
+    return Population.concatenate(
+        [
+            population,
+            Population.from_lists(
+                permutations=[child[0] for child in children],
+                durations=[child[1] for child in children],
+                sum_durations=[child[2] for child in children],
+            ),
+        ]
+    )
 
 
-def genetic_algorithm(population, N, M, k, q, W, duration, ist, demand_dict):
+def genetic_algorithm(
+    population,
+    N,
+    M,
+    k,
+    q,
+    W,
+    duration,
+    ist,
+    demand_dict,
+    fitness_cache=None,
+    selection_method=DEFAULT_SELECTION_METHOD,
+    crossover_method=DEFAULT_CROSSOVER_METHOD,
+    decoder=DEFAULT_DECODER,
+    screen=None,
+):
     """
     Apply Mutation and Selection & Replacement operations
     based on the random probabilities generated
 
-    :param population: all available permutations
+    :param population: all available individuals
+    :param selection_method: one of SELECTION_METHODS, used instead of the random selection
+    :param crossover_method: one of CROSSOVER_METHODS, children are added to the population after the mutation
+    :param decoder: one of DECODERS, see calculate_duration
+    :param screen: SurrogateScreen of the "markers" decoder, the individuals that can not survive the swap mutation or
+        the replacement are not evaluated, not used if None
+    :return: the new population, the fitness of the mutated individuals is calculated only when they are compared in
+        the selection or survive it
     """
 
     N = N  # number of shops to be considered
@@ -427,6 +413,15 @@ def genetic_algorithm(population, N, M, k, q, W, duration, ist, demand_dict):
     DIST_DATA = duration
     # LOAD = demand_in
     vehicles_start_times = ist
+    evaluation_kwargs = dict(
+        VST=vehicles_start_times,
+        dist_data=DIST_DATA,
+        M=M,
+        Q=Q,
+        demand_dict=demand_dict,
+        fitness_cache=fitness_cache,
+        decoder=decoder,
+    )
 
     new_population = None  # empty variable for the output population
 
@@ -450,43 +445,56 @@ def genetic_algorithm(population, N, M, k, q, W, duration, ist, demand_dict):
     if SWAP_MUTATION_PROB[0] <= rand_phase_1 <= SWAP_MUTATION_PROB[1]:
         # print("REPRODUCTION: applying swap mutation...")
         updated_population = swap_mutation(
-            population, VST=vehicles_start_times, dist_data=DIST_DATA, M=M, Q=Q, demand_dict=demand_dict
+            population,
+            VST=vehicles_start_times,
+            dist_data=DIST_DATA,
+            M=M,
+            Q=Q,
+            demand_dict=demand_dict,
+            fitness_cache=fitness_cache,
+            decoder=decoder,
+            screen=screen,
         )
     elif INVERSION_MUTATION_PROB[0] <= rand_phase_1 <= INVERSION_MUTATION_PROB[1]:
         # print("REPRODUCTION: applying inversion mutation...")
-        updated_population = inversion_mutation(
-            population, VST=vehicles_start_times, dist_data=DIST_DATA, M=M, Q=Q, demand_dict=demand_dict
-        )
+        updated_population = inversion_mutation(population, lazy=True, **evaluation_kwargs)
     elif SCRAMBLE_MUTATION_PROB[0] <= rand_phase_1 <= SCRAMBLE_MUTATION_PROB[1]:
         # print("REPRODUCTION: applying scramble mutation...")
-        updated_population = scramble_mutation(
-            population, VST=vehicles_start_times, dist_data=DIST_DATA, M=M, Q=Q, demand_dict=demand_dict
+        updated_population = scramble_mutation(population, lazy=True, **evaluation_kwargs)
+
+    # PHASE 1.5 CROSSOVER
+    if crossover_method != "none":
+        updated_population = crossover_population(
+            updated_population, crossover_method=crossover_method, lazy=True, **evaluation_kwargs
         )
 
     # PHASE 2 SELECTION & REPLACEMENT
+    # the individuals are evaluated only when they are compared or survive, in a batch for each step
     if len(updated_population) > MIN_ENTRY_COUNT:
         # if the number of permutations available is less than MIN_ENTRY_COUNT do not apply selection & replacement
         if SELECTION_PROB[0] <= rand_phase_2 <= SELECTION_PROB[1]:
             # print("SELECTION & REPLACEMENT: applying selection...")
-            # first calculate the fitness value of all permutations
-            population_with_fitness = calculate_fitness_level(updated_population)
-            # then select permutations based on fitness value
-            new_population = select_based_on_fitness_proportional(population_with_fitness)
-
-            pass
-            # post process the permutations
-            # for elem in new_population:
-            #    if len(elem) > 4:
-            #        del elem[4]
+            # select individuals based on fitness value
+            evaluate_population(updated_population, **evaluation_kwargs)
+            new_population = select_based_on_fitness_proportional(updated_population)
 
         elif REPLACEMENT_PROB[0] <= rand_phase_2 <= REPLACEMENT_PROB[1]:
             # print("SELECTION & REPLACEMENT: applying replacement...")
+            evaluate_best(updated_population, int(len(updated_population) / 2), screen, **evaluation_kwargs)
             new_population = deterministic_best_n_replacement(updated_population)
 
         elif RANDOM_SELECTION_PROB[0] <= rand_phase_2 <= RANDOM_SELECTION_PROB[1]:
             # print("SELECTION & REPLACEMENT: applying random selection...")
-            new_population = random_selection(
-                updated_population, (len(updated_population) * 5 / 8), already_selected=[]
+            # the random selection is replaced by the given selection method, e.g. tournament
+            new_population = updated_population.take(
+                select_indices(
+                    updated_population.durations,
+                    len(updated_population) * 5 / 8,
+                    selection_method,
+                    evaluate=lambda indices: evaluate_population(
+                        updated_population, indices, **evaluation_kwargs
+                    ).durations[indices],
+                )
             )
 
         elif NO_SELECTION_REPLACEMENT_PROB[0] <= rand_phase_2 <= NO_SELECTION_REPLACEMENT_PROB[1]:
@@ -495,7 +503,7 @@ def genetic_algorithm(population, N, M, k, q, W, duration, ist, demand_dict):
     else:
         new_population = updated_population
 
-    return new_population
+    return evaluate_population(new_population, **evaluation_kwargs)
 
 
 #######################################################################################################################
@@ -635,7 +643,13 @@ def calculate_duration_perm(
     )
 
 
-def calculate_duration(permutation, VST, dist_data, M, Q, demand_dict):
+def calculate_duration(permutation, VST, dist_data, M, Q, demand_dict, decoder=DEFAULT_DECODER):
+    """
+    Calculates the routes of a chromosome and their durations
+
+    :param decoder: One of DECODERS, "markers" cuts the chromosome into cycles at the DEPOT nodes and "split" ignores
+        the DEPOT nodes and finds the best cut points of the customer order with the time-dependent durations
+    """
 
     route = []
     for elem in permutation:
@@ -647,13 +661,112 @@ def calculate_duration(permutation, VST, dist_data, M, Q, demand_dict):
     else:
         assert len(VST) == M, f"Size of the vehicles_start_times should be {M}"
 
-    route_max_time, route_sum_time, vehicle_routes, vehicle_times = calculate_duration_perm(
-        q=Q, m=M, perm=route, duration=dist_data, vehicles_start_times=VST, demand_dict=demand_dict
-    )
+    if decoder == "split":
+        route_max_time, route_sum_time, vehicle_routes, vehicle_times = split(
+            duration=dist_data,
+            demands=demand_dict,
+            q=Q,
+            order=[node for node in route if node != DEPOT],
+            vehicles_start_times=VST,
+        )
+    else:
+        route_max_time, route_sum_time, vehicle_routes, vehicle_times = calculate_duration_perm(
+            q=Q, m=M, perm=route, duration=dist_data, vehicles_start_times=VST, demand_dict=demand_dict
+        )
 
     return route_max_time, route, route_sum_time, vehicle_routes, vehicle_times
 
 
+def calculate_fitness(permutation, VST, dist_data, M, Q, demand_dict, fitness_cache=None, decoder=DEFAULT_DECODER):
+    """
+    Calculates the fitness of a chromosome without keeping its decoded routes
+
+    :param fitness_cache: Cache of the previously calculated fitness values, not used if None
+    :param decoder: One of DECODERS, see calculate_duration
+    :return: Total time it takes for the latest driver and sum of the durations of each driver
+    """
+    if fitness_cache is not None:
+        fitness = fitness_cache.get(permutation)
+        if fitness is not None:
+            return fitness
+    route_max_time, _, route_sum_time, _, _ = calculate_duration(
+        permutation=permutation, VST=VST, dist_data=dist_data, M=M, Q=Q, demand_dict=demand_dict, decoder=decoder
+    )
+    if fitness_cache is not None:
+        fitness_cache.put(permutation, (route_max_time, route_sum_time))
+    return route_max_time, route_sum_time
+
+
+def evaluate_population(
+    population,
+    indices=None,
+    VST=None,
+    dist_data=None,
+    M=None,
+    Q=None,
+    demand_dict=None,
+    fitness_cache=None,
+    decoder=DEFAULT_DECODER,
+):
+    """
+    Calculates the fitness of the individuals that are not evaluated yet, as a batch
+    Identical chromosomes of the batch are evaluated once
+
+    :param population: individuals to be evaluated in place, an individual with a NaN duration is not evaluated yet
+    :param indices: indices of the individuals whose fitness is needed, all individuals if None
+    :return: the population
+    """
+    batch = {}
+    for index in population.pending(indices).tolist():
+        chromosome = population.get_chromosome(index)
+        key = tuple(chromosome)
+        if key not in batch:
+            batch[key] = calculate_fitness(
+                chromosome,
+                VST=VST,
+                dist_data=dist_data,
+                M=M,
+                Q=Q,
+                demand_dict=demand_dict,
+                fitness_cache=fitness_cache,
+                decoder=decoder,
+            )
+        population.durations[index], population.sum_durations[index] = batch[key]
+    return population
+
+
+def evaluate_best(population, n, screen=None, **evaluation_kwargs):
+    """
+    Calculates the fitness of the individuals that are not evaluated yet and can be among the n shortest ones
+    The individuals are evaluated in the order of their lower bounds, the ones whose lower bound is longer than the n-th
+    shortest duration found so far can not be selected by deterministic_best_n_replacement and are left unevaluated
+
+    :param population: individuals to be evaluated in place, see evaluate_population
+    :param n: number of the shortest individuals to be found
+    :param screen: SurrogateScreen of the "markers" decoder, all individuals are evaluated if None
+    :return: the population
+    """
+    if screen is None:
+        return evaluate_population(population, **evaluation_kwargs)
+    pending = population.pending().tolist()
+    # max-heap of the n shortest durations found so far, the n-th shortest one is the selection threshold
+    shortest = [-duration for duration in heapq.nsmallest(n, population.durations[~np.isnan(population.durations)])]
+    heapq.heapify(shortest)
+    bounds = [screen.bound(population.get_chromosome(index)) for index in pending]
+    for position, idx in enumerate(np.argsort(bounds, kind="stable").tolist()):
+        if len(shortest) == n and bounds[idx] > -shortest[0]:
+            screen.screened += len(pending) - position
+            break
+        screen.passed += 1
+        evaluate_population(population, [pending[idx]], **evaluation_kwargs)
+        duration = float(population.durations[pending[idx]])
+        if len(shortest) < n:
+            heapq.heappush(shortest, -duration)
+        elif duration < -shortest[0]:
+            heapq.heapreplace(shortest, -duration)
+    return population
+
+
 def check_neighbor(perm, source="def"):
     """
     Randomly generated permutations can not have two DEPOT nodes side by side.
@@ -706,6 +819,95 @@ def intelligent_permutation(customer_list, k, q, rand_perm_count, depot=DEPOT):
     return final_perms
 
 
+def packed_permutation(customer_list, k, q, demand_dict, duration, depot=DEPOT):
+    """
+    Packing permutation method generates a starting sequence whose cycles fit into the capacity with the real demands
+    Each cycle starts at a random customer and is extended by the nearest remaining customer, with the durations of the
+    first hour, while its load fits into a random target between the even share of k cycles and the capacity q
+    A cycle is closed when no remaining customer fits, if this gives more than k cycles the customers are packed again
+    up to the capacity and the smallest cycles are dissolved into the spare capacity of the others, so that more than k
+    cycles are generated only if no cycle can be dissolved, fewer cycles are cut into pieces at random positions
+
+    :param customer_list: customers to be visited
+    :param k: least number of cycles of the sequence, i.e. of k - 1 DEPOT nodes between the customers
+    :param duration: dynamic duration data of NxNx12
+    :return: the sequence with DEPOT nodes at both ends
+    """
+    total_demand = sum(demand_dict[customer] for customer in customer_list)
+    target = random.randint(min(q, -(-total_demand // k)), q)
+
+    def pack(target):
+        customers = list(customer_list)
+        cycles = []
+        while customers:
+            last = customers.pop(random.randrange(len(customers)))
+            cycle, load = [last], demand_dict[last]
+            while True:
+                fitting = [customer for customer in customers if load + demand_dict[customer] <= target]
+                if len(fitting) == 0:
+                    break
+                last = min(fitting, key=lambda customer: duration[last][customer][0])
+                customers.remove(last)
+                cycle.append(last)
+                load += demand_dict[last]
+            cycles.append(cycle)
+        return cycles
+
+    def cycle_load(cycle):
+        return sum(demand_dict[customer] for customer in cycle)
+
+    cycles = pack(target)
+    if len(cycles) > k and target < q:
+        # a target below the capacity may open more cycles than needed
+        cycles = pack(q)
+    # the greedy packing may still leave small cycles, the smallest cycle whose customers fit into the spare capacity
+    # of the other cycles is dissolved, each customer is inserted after its nearest customer with enough spare capacity
+    def dissolve(cycles, idx):
+        others = [list(cycle) for cycle in cycles[:idx] + cycles[idx + 1 :]]
+        spare = [q - cycle_load(cycle) for cycle in others]
+        for customer in sorted(cycles[idx], key=lambda customer: -demand_dict[customer]):
+            options = [
+                (duration[node][customer][0], other_idx, pos)
+                for other_idx, other in enumerate(others)
+                if spare[other_idx] >= demand_dict[customer]
+                for pos, node in enumerate(other)
+            ]
+            if len(options) == 0:
+                return None
+            _, other_idx, pos = min(options)
+            others[other_idx].insert(pos + 1, customer)
+            spare[other_idx] -= demand_dict[customer]
+        return others
+
+    while len(cycles) > k:
+        cycles.sort(key=cycle_load)
+        dissolved = next(
+            (others for others in (dissolve(cycles, idx) for idx in range(len(cycles))) if others is not None), None
+        )
+        if dissolved is None:
+            break
+        cycles = dissolved
+
+    while len(cycles) < k:
+        donors = [cycle for cycle in cycles if len(cycle) > 1]
+        if len(donors) == 0:
+            break
+        donor = random.choice(donors)
+        cut = random.randrange(1, len(donor))
+        cycles.append(donor[cut:])
+        del donor[cut:]
+
+    # the cycles are served in a random order and direction
+    random.shuffle(cycles)
+    perm = [depot]
+    for cycle in cycles:
+        if random.random() < 0.5:
+            cycle.reverse()
+        perm.extend(cycle)
+        perm.append(depot)
+    return perm
+
+
 def ga(
     N,
     M,
@@ -721,11 +923,23 @@ def ga(
     max_k=0,
     k_lower_limit=True,
     permutations=None,
+    fitness_cache=None,
+    selection_method=DEFAULT_SELECTION_METHOD,
+    crossover_method=DEFAULT_CROSSOVER_METHOD,
+    decoder=DEFAULT_DECODER,
+    screen=None,
+    initializer=DEFAULT_INITIALIZER,
+    seed_permutations=None,
 ):
     """
     Main method that controls the mode of the genetic algorithm
     If no input is given than it starts with population generation and runs genetic algorithm
     If 'permutations' list is given then skips population generation and runs genetic algorithm
+
+    :param initializer: one of INITIALIZERS, "random" generates random permutations and replaces half of them by
+        intelligent permutations if too many are infeasible, "packing" generates population_count packed permutations
+    :param seed_permutations: chromosomes added to each new population, e.g. the previous solution of a re-optimization,
+        with the DEPOT nodes at both ends
     """
 
     # main method of the program
@@ -754,15 +968,17 @@ def ga(
         # there can be different number of tours in each permutation
         # the upper limit is K or K_max (K_max option is enabled if k_lower_limit is set to False)
 
-        for _ in range(K - 1):
-            NODES.append(DEPOT)
+        # the split decoder finds the cycles itself, the chromosomes consist of the customers only
+        if decoder != "split":
+            for _ in range(K - 1):
+                NODES.append(DEPOT)
 
         NODES_LIST.append(NODES)
 
         # k_lower_limit is False
         # Thus, k upper limit will be defined by the user
         # If user did not specify the max_k -> simply use N
-        if not k_lower_limit:
+        if not k_lower_limit and decoder != "split":
 
             if max_k == 0 or max_k == -1:
                 max_k = N
@@ -775,81 +991,128 @@ def ga(
 
         random_generated_perm = []
 
-        while len(random_generated_perm) <= RANDOM_PERM_COUNT:
-            for elem in NODES_LIST:
-
-                # random permutation is generated
-                random_perm = random_permutation(elem)
-                random_perm = list(random_perm)
-
-                # two DEPOT objects can not be neighbor to each other
-                # while this is the case, generate a new random permutation
-                # this process can be repeated up to 3 times
-                check_count = 0
-                while not check_neighbor(random_perm) and check_count < 3:
-                    random_perm = random_permutation(elem)
-                    random_perm = list(random_perm)
-                    check_count = check_count + 1
-
-                # DEPOT is added to the beginning and to the end
-                random_perm.insert(0, DEPOT)
-                random_perm.append(DEPOT)
+        # the seeds warm start the population, the split decoder finds the cycles of their customers itself
+        seed_perms = []
+        for seed_perm in seed_permutations or []:
+            if decoder == "split":
+                seed_perm = [DEPOT] + [node for node in seed_perm if node != DEPOT] + [DEPOT]
+            seed_perms.append(list(seed_perm))
+        for seed_perm in seed_perms:
+            total_dist, route_sum_time = calculate_fitness(
+                permutation=seed_perm,
+                dist_data=DIST_DATA,
+                VST=vehicles_start_times,
+                M=M,
+                Q=Q,
+                demand_dict=demand_dict,
+                fitness_cache=fitness_cache,
+                decoder=decoder,
+            )
+            random_generated_perm.append((seed_perm, total_dist, route_sum_time))
+
+        if initializer == "packing":
+            # the cycles fit into the capacity by construction, exactly RANDOM_PERM_COUNT chromosomes are evaluated
+            # the k values of NODES_LIST take turns
+            for perm_idx in range(max(0, RANDOM_PERM_COUNT - len(seed_perms))):
+                elem = NODES_LIST[perm_idx % len(NODES_LIST)]
+                customers = [node for node in elem if node != DEPOT]
+                if decoder == "split":
+                    packed_perm = packed_permutation(customers, 1, Q, demand_dict, DIST_DATA, DEPOT)
+                    packed_perm = [DEPOT] + [node for node in packed_perm if node != DEPOT] + [DEPOT]
+                else:
+                    packed_perm = packed_permutation(
+                        customers, len(elem) - len(customers) + 1, Q, demand_dict, DIST_DATA, DEPOT
+                    )
 
                 # duration is calculated
-                total_dist, route, route_sum_time, vehicle_routes, vehicle_times = calculate_duration(
-                    permutation=random_perm,
+                total_dist, route_sum_time = calculate_fitness(
+                    permutation=packed_perm,
                     dist_data=DIST_DATA,
                     VST=vehicles_start_times,
                     M=M,
                     Q=Q,
                     demand_dict=demand_dict,
+                    fitness_cache=fitness_cache,
+                    decoder=decoder,
                 )
+                random_generated_perm.append((packed_perm, total_dist, route_sum_time))
 
-                # constructed the tour information list
-                random_perm_tuple = [random_perm, route, total_dist, route_sum_time, vehicle_routes, vehicle_times]
-
-                random_generated_perm.append(random_perm_tuple)
-
-        if (
-            not intelligent_perm_generation_performed
-            and len(list(filter(lambda y: y[2] == math.inf, random_generated_perm))) >= len(random_generated_perm) / 12
-        ):
+        else:
+            while len(random_generated_perm) <= RANDOM_PERM_COUNT:
+                for elem in NODES_LIST:
 
-            # Intelligent permutation mode enabled
-            # Remove half of the randomly generated sequences
-            # Add intelligently generated randomized and feasible
-            # starting sequences to the second half of the population set
+                    # random permutation is generated
+                    random_perm = random_permutation(elem)
+                    random_perm = list(random_perm)
 
-            intelligent_perm_generation_performed = True
-            intelligent_perms = intelligent_permutation(
-                customer_list=customer_list, q=q, k=k, rand_perm_count=population_count
-            )
-            random_generated_perm = random_generated_perm[0 : len(random_generated_perm) // 2]
-            for intelligent_perm in intelligent_perms:
-                total_dist, route, route_sum_time, vehicle_routes, vehicle_times = calculate_duration(
-                    permutation=intelligent_perm,
-                    dist_data=DIST_DATA,
-                    VST=vehicles_start_times,
-                    M=M,
-                    Q=Q,
-                    demand_dict=demand_dict,
+                    # two DEPOT objects can not be neighbor to each other
+                    # while this is the case, generate a new random permutation
+                    # this process can be repeated up to 3 times
+                    check_count = 0
+                    while not check_neighbor(random_perm) and check_count < 3:
+                        random_perm = random_permutation(elem)
+                        random_perm = list(random_perm)
+                        check_count = check_count + 1
+
+                    # DEPOT is added to the beginning and to the end
+                    random_perm.insert(0, DEPOT)
+                    random_perm.append(DEPOT)
+
+                    # duration is calculated
+                    total_dist, route_sum_time = calculate_fitness(
+                        permutation=random_perm,
+                        dist_data=DIST_DATA,
+                        VST=vehicles_start_times,
+                        M=M,
+                        Q=Q,
+                        demand_dict=demand_dict,
+                        fitness_cache=fitness_cache,
+                        decoder=decoder,
+                    )
+
+                    # constructed the tour information list, the routes are decoded only for the final winners
+                    random_generated_perm.append((random_perm, total_dist, route_sum_time))
+
+            if (
+                not intelligent_perm_generation_performed
+                and decoder != "split"
+                and len(list(filter(lambda y: y[1] == math.inf, random_generated_perm)))
+                >= len(random_generated_perm) / 12
+            ):
+
+                # Intelligent permutation mode enabled
+                # Remove half of the randomly generated sequences
+                # Add intelligently generated randomized and feasible
+                # starting sequences to the second half of the population set
+
+                intelligent_perm_generation_performed = True
+                intelligent_perms = intelligent_permutation(
+                    customer_list=customer_list, q=q, k=k, rand_perm_count=population_count
                 )
-                intelligent_perm_tuple = [
-                    intelligent_perm,
-                    route,
-                    total_dist,
-                    route_sum_time,
-                    vehicle_routes,
-                    vehicle_times,
-                ]
-                random_generated_perm.append(intelligent_perm_tuple)
-
-        # sort the set based on duration of sequences (i.e. x[2])
-        random_generated_perm = sorted(random_generated_perm, key=lambda x: x[2], reverse=False)
+                random_generated_perm = random_generated_perm[0 : len(random_generated_perm) // 2]
+                for intelligent_perm in intelligent_perms:
+                    total_dist, route_sum_time = calculate_fitness(
+                        permutation=intelligent_perm,
+                        dist_data=DIST_DATA,
+                        VST=vehicles_start_times,
+                        M=M,
+                        Q=Q,
+                        demand_dict=demand_dict,
+                        fitness_cache=fitness_cache,
+                        decoder=decoder,
+                    )
+                    random_generated_perm.append((intelligent_perm, total_dist, route_sum_time))
+
+        # the population is stored as a chromosome matrix, sorted based on duration of sequences
+        population = Population.from_lists(
+            permutations=[elem[0] for elem in random_generated_perm],
+            durations=[elem[1] for elem in random_generated_perm],
+            sum_durations=[elem[2] for elem in random_generated_perm],
+        ).sorted()
 
         # genetic algorithm code is called
         res = genetic_algorithm(
-            population=random_generated_perm,
+            population=population,
             N=N,
             M=M,
             k=K,
@@ -858,10 +1121,15 @@ def ga(
             duration=DIST_DATA,
             ist=vehicles_start_times,
             demand_dict=demand_dict,
+            fitness_cache=fitness_cache,
+            decoder=decoder,
+            selection_method=selection_method,
+            crossover_method=crossover_method,
+            screen=screen,
         )
 
-        # results are sorted based on duration of sequences  (i.e. x[2])
-        res = sorted(res, key=lambda x: x[2], reverse=False)
+        # results are sorted based on duration of sequences
+        res = res.sorted()
 
     else:
         # prior permutations exist, do not generate new data and continue with the given input
@@ -875,10 +1143,15 @@ def ga(
             duration=DIST_DATA,
             ist=vehicles_start_times,
             demand_dict=demand_dict,
+            fitness_cache=fitness_cache,
+            decoder=decoder,
+            selection_method=selection_method,
+            crossover_method=crossover_method,
+            screen=screen,
         )
 
-        # results are sorted based on duration of sequences  (i.e. x[2])
-        res = sorted(res, key=lambda x: x[2], reverse=False)
+        # results are sorted based on duration of sequences
+        res = res.sorted()
 
     return res
 
@@ -898,7 +1171,35 @@ def run(
     k_lower_limit=True,
     population_count=125,
     iteration_count=48,
+    fitness_cache_size=DEFAULT_FITNESS_CACHE_SIZE,
+    migration_epoch=DEFAULT_MIGRATION_EPOCH,
+    migration_size=DEFAULT_MIGRATION_SIZE,
+    selection_method=DEFAULT_SELECTION_METHOD,
+    crossover_method=DEFAULT_CROSSOVER_METHOD,
+    decoder=DEFAULT_DECODER,
+    stall_generations=None,
+    diversity_floor=None,
+    time_limit=None,
+    elite_archive_size=None,
+    surrogate_screening=True,
+    initializer=DEFAULT_INITIALIZER,
+    seed_permutations=None,
 ):
+    """
+    Runs the GA TDVRP in two iteration phases, each phase stops after its iterations or when an optional stopping rule
+    fires, see StoppingRules
+
+    :param stall_generations: Stop a phase after this many generations without an improvement of its best duration
+    :param diversity_floor: Stop a phase when the mean share of the distinct chromosomes of the islands drops below it
+    :param time_limit: Seconds given to both phases, PHASE_1_TIME_SHARE of them to the first phase
+    :param elite_archive_size: Number of distinct best individuals kept across the iterations, the islands of the second
+        phase start from them, population_count if None
+    :param surrogate_screening: Skip the evaluation of the individuals whose lower bound on the static fastest-hour
+        durations shows that they can not survive the swap mutation or the replacement, see SurrogateScreen
+    :param initializer: One of INITIALIZERS, generation method of the new populations, see ga
+    :param seed_permutations: Chromosomes added to the new populations of the islands, e.g. the previous solution of a
+        re-optimization to warm start it, see solution_to_permutation
+    """
 
     N = N  # number of shops to be considered
     K = k  # number of tours to be considered
@@ -909,6 +1210,17 @@ def run(
     vehicles_start_times = ist  # start times of the vehicles
     start_time = datetime.now()  # used for runtime calculation
     ITERATION_COUNT = iteration_count  # GA hyperparameter iteration number
+    assert selection_method in SELECTION_METHODS, f"selection_method should be one of {SELECTION_METHODS}"
+    assert crossover_method in CROSSOVER_METHODS, f"crossover_method should be one of {CROSSOVER_METHODS}"
+    assert decoder in DECODERS, f"decoder should be one of {DECODERS}"
+    assert initializer in INITIALIZERS, f"initializer should be one of {INITIALIZERS}"
+    # fitness values of the evaluated chromosomes, shared by all ga calls of a single core run
+    # each worker process gets its own copy in a multi core run and keeps it across the epochs
+    fitness_cache = FitnessCache(fitness_cache_size)
+    # the split decoder cuts the chromosomes itself, the bounds of the given cuts would not be valid for it
+    screen = None
+    if surrogate_screening and decoder == "markers":
+        screen = SurrogateScreen(DIST_DATA, Q, demand_dict, ist if ist is not None else M * [0])
 
     # should size of the customer list equals to 1
     # no need to perform GA
@@ -917,107 +1229,229 @@ def run(
         one_node.append(DEPOT)
         one_node.insert(0, DEPOT)
         route_max_time, route, route_sum_time, vehicle_routes, vehicle_times = calculate_duration(
-            permutation=one_node, dist_data=DIST_DATA, VST=vehicles_start_times, M=M, Q=Q, demand_dict=demand_dict
+            permutation=one_node,
+            dist_data=DIST_DATA,
+            VST=vehicles_start_times,
+            M=M,
+            Q=Q,
+            demand_dict=demand_dict,
+            decoder=decoder,
         )
 
         return (route_max_time, route_sum_time, vehicle_routes, vehicle_times, str(0))
 
     # set the number of cores to be used
-    if multithreaded:
-        # get the number of available cores
-        num_cores = int(multiprocessing.cpu_count())
-    else:
-        num_cores = 1
-
-    # run num_cores many threads in parallel
-    # at the beginning there exists no input for the ga method, permutations will be equal to None
-    inputs = tqdm(num_cores * [1], disable=True)
-    processed_list = Parallel(n_jobs=num_cores)(
-        delayed(ga)(
+    # the cores are granted by the CPU budget of the process, so that concurrent runs do not oversubscribe the CPU
+    # a single core run takes a core of the budget as well, the cores are released once the island pool is closed,
+    # also when the run fails
+    with CPU_BUDGET.grant(None if multithreaded else 1) as num_cores:
+        ga_kwargs = dict(
             N=N,
             M=M,
             k=K,
             q=Q,
             W=DEPOT,
-            duration=DIST_DATA,
             demand=demand_dict,
             ist=vehicles_start_times,
-            permutations=None,
             customer_list=customer_list,
             demand_dict=demand_dict,
             k_lower_limit=k_lower_limit,
             max_k=max_k,
             population_count=population_count,
+            selection_method=selection_method,
+            crossover_method=crossover_method,
+            decoder=decoder,
+            initializer=initializer,
+            seed_permutations=seed_permutations,
         )
-        for i in inputs
-    )
-
-    iteration_count = 0
-    best = []
+        cache_hits, cache_misses = 0, 0
+        screened, passed = 0, 0
+
+        # a k range is explored by a subpopulation for each k value instead of mixing the k values in each population
+        # the k values share the cores and the population budget of the cores, the dominated k values are pruned
+        k_values = []
+        if not k_lower_limit and decoder != "split":
+            k_values = list(range(int(K), int(N if max_k == 0 or max_k == -1 else max_k) + 1))
+        if len(k_values) > 1:
+            n_islands = max(num_cores, len(k_values))
+            island_ks = [k_values[idx % len(k_values)] for idx in range(n_islands)]
+            subpopulation_count = max(MIN_SUBPOPULATION_COUNT, population_count * num_cores // n_islands)
+        else:
+            island_ks = num_cores * [None]
+        k_bests = {}
 
-    # first iteration phase starts
-    while iteration_count < ITERATION_COUNT:
+        def island_kwargs():
+            return [
+                None if island_k is None else dict(k=island_k, k_lower_limit=True, population_count=subpopulation_count)
+                for island_k in island_ks
+            ]
 
-        inputs = tqdm(processed_list, disable=True)
-        processed_list = Parallel(n_jobs=num_cores)(
-            delayed(ga)(
-                N=N,
-                M=M,
-                k=K,
-                q=Q,
-                W=DEPOT,
-                duration=DIST_DATA,
-                demand=demand_dict,
-                ist=vehicles_start_times,
-                permutations=i,
-                demand_dict=demand_dict,
-                customer_list=customer_list,
-                k_lower_limit=k_lower_limit,
-                max_k=max_k,
-                population_count=population_count,
-            )
-            for i in inputs
-        )
+        # at the beginning there exists no population for the islands, new populations will be generated
+        processed_list = len(island_ks) * [None]
+
+        iteration_count = 0
+        # the best individuals of the iterations are kept in a bounded archive, so that the memory and the populations
+        # sent to the islands do not grow with the iteration count
+        archive = EliteArchive(elite_archive_size if elite_archive_size is not None else population_count)
+
+        # the islands do not start a new iteration after the deadline of the phase
+        run_deadline = time.time() + time_limit if time_limit is not None else None
+        phase_1_deadline = time.time() + PHASE_1_TIME_SHARE * time_limit if time_limit is not None else None
+        phase_1_rules = StoppingRules(stall_generations, diversity_floor, phase_1_deadline)
+
+        # each core evolves an island of its own, the islands exchange their elites after every migration_epoch
+        # iterations
+        # the worker processes live until both iteration phases are completed and receive the duration data only once
+        # the pool is closed, i.e. its processes are joined and its shared memory is unlinked, also when the run fails
+        with IslandPool(num_cores, ga, DIST_DATA, ga_kwargs, fitness_cache, screen) as island_pool:
+            # first iteration phase starts
+            while iteration_count < ITERATION_COUNT and not phase_1_rules.stopped:
+
+                epoch = min(migration_epoch, ITERATION_COUNT - iteration_count)
+                # intermediary new population generation is enabled after every third of the phase
+                results = island_pool.evolve(
+                    processed_list,
+                    iteration_count,
+                    epoch,
+                    regenerate_every=ITERATION_COUNT / 3,
+                    last_iteration=ITERATION_COUNT,
+                    deadline=phase_1_deadline,
+                    island_kwargs=island_kwargs(),
+                )
 
-        for elem in processed_list:
-            # sort the results based on duration of sequences  (i.e. x[2])
-            elem = sorted(elem, key=lambda x: x[2], reverse=False)
+                processed_list = []
+                for island_k, (population, island_winners, (hits, misses), (island_screened, island_passed)) in zip(
+                    island_ks, results
+                ):
+                    processed_list.append(population)
+                    # save the best result of each iteration
+                    for winner in island_winners:
+                        archive.add(winner)
+                    cache_hits, cache_misses = cache_hits + hits, cache_misses + misses
+                    screened, passed = screened + island_screened, passed + island_passed
+                    if island_k is not None:
+                        for winner in island_winners:
+                            k_bests[island_k] = min(
+                                k_bests.get(island_k, (INF, INF)), (winner.durations[0], winner.sum_durations[0])
+                            )
+
+                # the islands may stop before the end of the epoch because of the deadline
+                for epoch_iteration in range(max(len(island_winners) for _, island_winners, _, _ in results)):
+                    phase_1_rules.update(
+                        min(
+                            island_winners[epoch_iteration].durations[0]
+                            for _, island_winners, _, _ in results
+                            if epoch_iteration < len(island_winners)
+                        )
+                    )
+                phase_1_rules.check_diversity(np.mean([population.diversity() for population in processed_list]))
+                phase_1_rules.check_deadline()
+
+                iteration_count = iteration_count + epoch
+
+                # the k values are compared after the first population regeneration, so that each of them had a fair
+                # start
+                if k_bests and iteration_count >= ITERATION_COUNT / 3:
+                    pruned_ks = dominated_groups(k_bests)
+                    if pruned_ks:
+                        print(
+                            f"FIRST ITERATION PHASE: Pruned k values {sorted(pruned_ks)} "
+                            f"after {iteration_count} iterations"
+                        )
+                    best_k = min(k_bests, key=k_bests.get)
+                    for pruned_k in pruned_ks:
+                        del k_bests[pruned_k]
+                    # the islands of the pruned k values are dropped, spare cores explore the best k value with new
+                    # populations
+                    kept = [idx for idx, island_k in enumerate(island_ks) if island_k not in pruned_ks]
+                    spare = min(len(island_ks), num_cores) - len(kept)
+                    processed_list = [processed_list[idx] for idx in kept] + spare * [None]
+                    island_ks = [island_ks[idx] for idx in kept] + spare * [best_k]
+
+                processed_list = migrate(processed_list, migration_size, island_ks if k_bests else None)
+
+            # the winner of the first iteration phase is decoded once the island pool is closed
+            best_chromosome_r1 = archive.population().get_chromosome(0)
+
+            print("------------------------------ FIRST ITERATION PHASE IS COMPLETED ------------------------------")
+
+            iteration_count = 0
+            all_equal_count = 0
+            # the best result of the second iteration phase
+            new_best = EliteArchive(1)
+            phase_2_rules = StoppingRules(stall_generations, diversity_floor, run_deadline)
+
+            def all_equal(iterable):
+                # this method checks if the results of different threads are converging to the same point or not
+                # returns a boolean answer
+                g = groupby(iterable)
+                return next(g, True) and not next(g, False)
+
+            # second iteration phase starts
+            while iteration_count < ITERATION_COUNT / 4 and not phase_2_rules.stopped:
+
+                epoch = min(migration_epoch, math.ceil(ITERATION_COUNT / 4 - iteration_count))
+                # the islands start each epoch from the best sequences achieved so far in both phases
+                results = island_pool.evolve(
+                    num_cores * [archive.population()], iteration_count, epoch, deadline=run_deadline
+                )
+                for _, _, (hits, misses), (island_screened, island_passed) in results:
+                    cache_hits, cache_misses = cache_hits + hits, cache_misses + misses
+                    screened, passed = screened + island_screened, passed + island_passed
 
-            # save the best result of the current iteration
-            best.append(copy.deepcopy(elem[0]))
+                # the islands may stop before the end of the epoch because of the deadline
+                for epoch_iteration in range(min(len(island_winners) for _, island_winners, _, _ in results)):
 
-        iteration_count = iteration_count + 1
+                    current_best_entries = []
+                    winners = []
+                    for _, island_winners, _, _ in results:
 
-        if (iteration_count % (ITERATION_COUNT / 3)) == 0 and iteration_count != ITERATION_COUNT:
+                        winner = island_winners[epoch_iteration]
+                        current_best_entries.append(winner.durations[0])
+                        winners.append(winner)
+                        # save the best results of the second iteration phase in the new_best archive
+                        new_best.add(winner)
+                        archive.add(winner)
 
-            # Intermediary new population generation is enabled
-            processed_list = Parallel(n_jobs=num_cores)(
-                delayed(ga)(
-                    N=N,
-                    M=M,
-                    k=K,
-                    q=Q,
-                    W=DEPOT,
-                    duration=DIST_DATA,
-                    demand=demand_dict,
-                    ist=vehicles_start_times,
-                    permutations=None,
-                    demand_dict=demand_dict,
-                    customer_list=customer_list,
-                    k_lower_limit=k_lower_limit,
-                    max_k=max_k,
-                    population_count=population_count,
-                )
-                for i in inputs
-            )
+                    iteration_count = iteration_count + 1
 
-    # sort the results of the first iteration phase
-    best_result_list = sorted(best, key=lambda x: x[2], reverse=False)
+                    if phase_2_rules.update(min(current_best_entries)):
+                        break
 
-    best_route_max_time_r1 = best_result_list[0][2]
-    best_route_sum_time_r1 = best_result_list[0][3]
-    best_vehicle_routes_r1 = best_result_list[0][4]
-    best_vehicle_times_r1 = best_result_list[0][5]
+                    if all_equal(current_best_entries) and num_cores != 1:
+                        # the program runs in parallel GA TDVRP mode
+                        # all threads returned the same duration value as the best value
+                        if all_equal_count >= (ITERATION_COUNT // 4) // 4:
+                            # if the thread equality happened (ITERATION_COUNT//4)//4 many times
+                            # stop the second iteration phase
+                            # because the program converges to the same point over and over
+                            # no need to lose any time
+                            # compare first iteration results and second iteration results and return the better one
+                            phase_2_rules.stop("converged")
+                            break
+                        else:
+                            # thread equality count increased
+                            all_equal_count = all_equal_count + 1
+
+                phase_2_rules.check_diversity(np.mean([population.diversity() for population, _, _, _ in results]))
+                phase_2_rules.check_deadline()
+
+    # the routes of the first iteration phase are decoded only for the winner
+    (
+        best_route_max_time_r1,
+        _,
+        best_route_sum_time_r1,
+        best_vehicle_routes_r1,
+        best_vehicle_times_r1,
+    ) = calculate_duration(
+        permutation=best_chromosome_r1,
+        dist_data=DIST_DATA,
+        VST=vehicles_start_times,
+        M=M,
+        Q=Q,
+        demand_dict=demand_dict,
+        decoder=decoder,
+    )
 
     if best_vehicle_times_r1 is None:
         print("FIRST ITERATION PHASE: No feasible solution")
@@ -1029,80 +1463,21 @@ def run(
         for vehicle_id, vehicle_time in best_vehicle_times_r1.items():
             print(f"FIRST ITERATION PHASE: Time of vehicle {vehicle_id}: {vehicle_time}")
 
-    print("------------------------------ FIRST ITERATION PHASE IS COMPLETED ------------------------------")
-
-    best = sorted(best, key=lambda x: x[2], reverse=False)
-    iteration_count = 0
-    all_equal_count = 0
-    new_best = []
-
-    def all_equal(iterable):
-        # this method checks if the results of different threads are converging to the same point or not
-        # returns a boolean answer
-        g = groupby(iterable)
-        return next(g, True) and not next(g, False)
-
-    # second iteration phase starts
-    while iteration_count < ITERATION_COUNT / 4:
-
-        inputs = tqdm(processed_list, disable=True)
-        # the GA iterations will work on the best sequences achieved so far
-        processed_list = Parallel(n_jobs=num_cores)(
-            delayed(ga)(
-                N=N,
-                M=M,
-                k=K,
-                q=Q,
-                W=DEPOT,
-                duration=DIST_DATA,
-                demand=demand_dict,
-                ist=vehicles_start_times,
-                permutations=best,
-                demand_dict=demand_dict,
-                customer_list=customer_list,
-                k_lower_limit=k_lower_limit,
-                max_k=max_k,
-                population_count=population_count,
-            )
-            for i in inputs
-        )
-
-        current_best_entries = []
-        for elem in processed_list:
-
-            # sort the results based on duration of sequences  (i.e. x[2])
-            elem = sorted(elem, key=lambda x: x[2], reverse=False)
-
-            current_best_entries.append(elem[0][2])
-            best.append(copy.deepcopy(elem[0]))
-            # save the best results of the second iteration phase in the new_best list
-            new_best.append(copy.deepcopy(elem[0]))
-
-        iteration_count = iteration_count + 1
-
-        if all_equal(current_best_entries) and num_cores != 1:
-            # the program runs in parallel GA TDVRP mode
-            # all threads returned the same duration value as the best value
-            if all_equal_count >= (ITERATION_COUNT // 4) // 4:
-                # if the thread equality happened (ITERATION_COUNT//4)//4 many times
-                # stop the second iteration phase
-                # because the program converges to the same point over and over
-                # no need to lose any time
-                # compare first iteration results and second iteration results and return the better one
-                break
-            else:
-                # thread equality count increased
-                all_equal_count = all_equal_count + 1
-
     print("------------------------------ SECOND ITERATION PHASE IS COMPLETED ------------------------------")
 
     # sort the best results of the second iteration phase
-    best_result_list_2 = sorted(new_best, key=lambda x: x[2], reverse=False)
-
-    best_route_max_time = best_result_list_2[0][2]
-    best_route_sum_time = best_result_list_2[0][3]
-    best_vehicle_routes = best_result_list_2[0][4]
-    best_vehicle_times = best_result_list_2[0][5]
+    best_result_list_2 = new_best.population()
+
+    # the routes are decoded only for the winner
+    best_route_max_time, _, best_route_sum_time, best_vehicle_routes, best_vehicle_times = calculate_duration(
+        permutation=best_result_list_2.get_chromosome(0),
+        dist_data=DIST_DATA,
+        VST=vehicles_start_times,
+        M=M,
+        Q=Q,
+        demand_dict=demand_dict,
+        decoder=decoder,
+    )
 
     if best_route_max_time_r1 > best_route_max_time:
         print("SECOND ITERATION PHASE GENERATED A BETTER RESULT")
@@ -1132,6 +1507,22 @@ def run(
     end_time = datetime.now()
     exec_time = end_time - start_time
     print(f"Genetic Algorithm TDVRP Time: {exec_time}")
+    print(f"Genetic Algorithm TDVRP Cores: {num_cores} of {CPU_BUDGET.total_cores}")
+    cache_lookups = cache_hits + cache_misses
+    cache_hit_rate = cache_hits / cache_lookups if cache_lookups > 0 else 0
+    print(f"Genetic Algorithm TDVRP Fitness Cache: hits {cache_hits}, misses {cache_misses}, hit rate {cache_hit_rate}")
+    if screen is not None:
+        screened_rate = screened / (screened + passed) if screened + passed > 0 else 0
+        print(
+            f"Genetic Algorithm TDVRP Surrogate Screening: screened {screened}, passed {passed}, "
+            f"screened rate {screened_rate}"
+        )
+    if k_bests:
+        print(f"Genetic Algorithm TDVRP k Values: {sorted(k_bests)} of {k_values}")
+    print(
+        f"Genetic Algorithm TDVRP Stopping Rules: first phase {phase_1_rules.summary()}, "
+        f"second phase {phase_2_rules.summary()}"
+    )
 
     print("------------------------------ GA TDVRP IS COMPLETED ------------------------------")
     return (best_route_max_time, best_route_sum_time, best_vehicle_routes, best_vehicle_times, str(exec_time))
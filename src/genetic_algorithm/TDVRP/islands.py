@@ -0,0 +1,258 @@
+import multiprocessing
+import random
+import time
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.genetic_algorithm.fitness_cache import FitnessCache
+from src.genetic_algorithm.TDVRP.population import Population
+from src.utilities.helper.surrogate_helper import SurrogateScreen
+
+INF = float("inf")
+DEFAULT_MIGRATION_EPOCH = 4  # number of GA iterations each island runs between two migrations
+DEFAULT_MIGRATION_SIZE = 2  # number of elites each island sends to the next island of the ring
+DEFAULT_PRUNE_MARGIN = 0.05  # a group is dominated if another group is better by this share of the duration
+
+# Dataset of the islands evolved by the current process, set once per process by init_island
+_island_dataset = {}
+
+
+def init_island(
+    ga: Callable,
+    shm_name: Optional[str],
+    duration_shape: Tuple[int, ...],
+    duration: Optional[List[List[List[float]]]],
+    ga_kwargs: Dict,
+    fitness_cache: FitnessCache,
+    screen: Optional[SurrogateScreen] = None,
+) -> None:
+    """
+    Sets the dataset of the islands evolved by the current process
+
+    :param ga: GA method to be called for each island iteration
+    :param shm_name: Name of the shared memory block holding the duration data, not used if duration is given
+    :param duration_shape: Shape of the duration data in the shared memory block
+    :param duration: Dynamic duration data of NxNx12, read from the shared memory block if None
+    :param ga_kwargs: Arguments of the GA method other than the duration data and the population
+    :param fitness_cache: Cache of the fitness values of the process, kept across epochs
+    :param screen: Surrogate screen of the GA method, not used if None
+    """
+    if duration is None:
+        # copy into nested lists once, element access from the GA loops is much faster than on arrays
+        shm = shared_memory.SharedMemory(name=shm_name)
+        duration = np.ndarray(duration_shape, dtype=float, buffer=shm.buf).tolist()
+        shm.close()
+    _island_dataset.clear()
+    _island_dataset.update(ga=ga, duration=duration, ga_kwargs=ga_kwargs, fitness_cache=fitness_cache, screen=screen)
+
+
+def evolve_island(
+    population: Optional[Population],
+    start_iteration: int,
+    iterations: int,
+    regenerate_every: float,
+    last_iteration: int,
+    seed: Optional[int],
+    deadline: Optional[float] = None,
+    island_kwargs: Optional[Dict] = None,
+) -> Tuple[Population, List[Population], Tuple[int, int], Tuple[int, int]]:
+    """
+    Evolves an island for the given number of GA iterations with the dataset of the current process
+
+    :param population: Population of the island, a new population is generated if None
+    :param start_iteration: Index of the first iteration in the GA phase
+    :param iterations: Number of GA iterations to be run
+    :param regenerate_every: Generate a new population after every regenerate_every iterations, never if zero
+    :param last_iteration: No new population is generated after the last iteration of the GA phase
+    :param seed: Seed of the random number generator of the process, not changed if None
+    :param deadline: No further iteration is started after this time.time() value, the island may return fewer winners
+    :param island_kwargs: Arguments of the GA method that override those of the dataset for this island, e.g. k
+    :return: The island population, the best individual of each iteration, the fitness cache hits and misses and
+        the individuals screened out and passed by the surrogate screen
+    """
+    if seed is not None:
+        random.seed(seed)
+    ga = _island_dataset["ga"]
+    duration = _island_dataset["duration"]
+    ga_kwargs = _island_dataset["ga_kwargs"]
+    if island_kwargs:
+        ga_kwargs = {**ga_kwargs, **island_kwargs}
+    fitness_cache = _island_dataset["fitness_cache"]
+    hits, misses = fitness_cache.hits, fitness_cache.misses
+    screen = _island_dataset["screen"]
+    screened, passed = (screen.screened, screen.passed) if screen is not None else (0, 0)
+
+    if population is None:
+        population = ga(duration=duration, permutations=None, fitness_cache=fitness_cache, screen=screen, **ga_kwargs)
+
+    winners = []
+    for iteration in range(start_iteration, start_iteration + iterations):
+        if deadline is not None and winners and time.time() >= deadline:
+            break
+        population = ga(
+            duration=duration, permutations=population, fitness_cache=fitness_cache, screen=screen, **ga_kwargs
+        )
+        winners.append(population.take([population.best_index()]))
+        if regenerate_every and (iteration + 1) % regenerate_every == 0 and iteration + 1 != last_iteration:
+            population = ga(
+                duration=duration, permutations=None, fitness_cache=fitness_cache, screen=screen, **ga_kwargs
+            )
+
+    screening = (screen.screened - screened, screen.passed - passed) if screen is not None else (0, 0)
+    return population, winners, (fitness_cache.hits - hits, fitness_cache.misses - misses), screening
+
+
+def migrate(
+    populations: List[Population], migration_size: int, groups: Optional[Sequence[Hashable]] = None
+) -> List[Population]:
+    """
+    Sends the elites of each island to the next island of a ring, where they replace the worst individuals
+
+    :param populations: Populations of the islands
+    :param migration_size: Number of elites each island sends
+    :param groups: Group of each island, e.g. its k value, each group has a ring of its own if given
+    :return: Populations of the islands after the migration
+    """
+    if groups is not None:
+        migrated = list(populations)
+        for group in set(groups):
+            # new populations are generated for the islands without a population, they take no part in the migration
+            members = [
+                idx for idx, island_group in enumerate(groups) if island_group == group and populations[idx] is not None
+            ]
+            for idx, population in zip(members, migrate([populations[idx] for idx in members], migration_size)):
+                migrated[idx] = population
+        return migrated
+    if len(populations) < 2 or migration_size <= 0:
+        return populations
+    elites = [population.sorted().take(range(min(migration_size, len(population)))) for population in populations]
+    migrated = []
+    for idx, population in enumerate(populations):
+        immigrants = elites[idx - 1]
+        survivors = population.sorted().take(range(max(0, len(population) - len(immigrants))))
+        migrated.append(Population.concatenate([survivors, immigrants]))
+    return migrated
+
+
+def dominated_groups(
+    bests: Dict[Hashable, Tuple[float, float]], margin: float = DEFAULT_PRUNE_MARGIN
+) -> List[Hashable]:
+    """
+    Finds the groups of islands, e.g. the k values, that are not worth evolving further
+    A group is dominated if the best individual of another group is shorter by more than the margin and its sum of
+    durations is not longer, an infeasible group is dominated by any feasible one
+
+    :param bests: Duration and sum of durations of the best individual found by each group so far
+    :param margin: Share of the duration by which the dominating group should be shorter
+    :return: Dominated groups
+    """
+    dominated = []
+    for group, (duration, sum_duration) in bests.items():
+        for other_group, (other_duration, other_sum_duration) in bests.items():
+            if other_group == group or other_duration == INF:
+                continue
+            if duration == INF or (other_duration * (1 + margin) < duration and other_sum_duration <= sum_duration):
+                dominated.append(group)
+                break
+    return dominated
+
+
+class IslandPool:
+    """
+    Long-lived pool of GA islands
+    The duration data is sent to the worker processes once through shared memory, then only the island populations
+    are exchanged with them, the islands are evolved in the current process if there is a single process
+    There can be more islands than processes, the pool distributes them over its processes
+    """
+
+    def __init__(
+        self,
+        n_processes: int,
+        ga: Callable,
+        duration: List[List[List[float]]],
+        ga_kwargs: Dict,
+        fitness_cache: FitnessCache,
+        screen: Optional[SurrogateScreen] = None,
+    ):
+        """
+        :param n_processes: Number of processes evolving the islands, the current process if one
+        :param ga: GA method to be called for each island iteration
+        :param duration: Dynamic duration data of NxNx12
+        :param ga_kwargs: Arguments of the GA method other than the duration data and the population
+        :param fitness_cache: Cache of the fitness values, each worker process starts with a copy of it
+        :param screen: Surrogate screen of the GA method, each worker process counts its statistics on a copy of it
+        """
+        self.n_processes = n_processes
+        self.pool = None
+        self.shm = None
+        if n_processes == 1:
+            init_island(ga, None, (), duration, ga_kwargs, fitness_cache, screen)
+            return
+        duration_array = np.asarray(duration, dtype=float)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, duration_array.nbytes))
+        np.ndarray(duration_array.shape, dtype=float, buffer=self.shm.buf)[...] = duration_array
+        self.pool = multiprocessing.Pool(
+            n_processes,
+            initializer=init_island,
+            initargs=(ga, self.shm.name, duration_array.shape, None, ga_kwargs, fitness_cache, screen),
+        )
+
+    def evolve(
+        self,
+        populations: List[Optional[Population]],
+        start_iteration: int,
+        iterations: int,
+        regenerate_every: float = 0,
+        last_iteration: int = 0,
+        deadline: Optional[float] = None,
+        island_kwargs: Optional[List[Optional[Dict]]] = None,
+    ) -> List[Tuple[Population, List[Population], Tuple[int, int], Tuple[int, int]]]:
+        """
+        Evolves each island for the given number of GA iterations, see evolve_island
+
+        :param populations: Populations of the islands, new populations are generated for None
+        :param island_kwargs: Arguments of the GA method overridden for each island, see evolve_island
+        :return: Result of evolve_island for each island
+        """
+        island_kwargs = island_kwargs if island_kwargs is not None else len(populations) * [None]
+        if self.pool is None:
+            return [
+                evolve_island(
+                    population, start_iteration, iterations, regenerate_every, last_iteration, None, deadline, kwargs
+                )
+                for population, kwargs in zip(populations, island_kwargs)
+            ]
+        # processes forked from the same state would generate the same islands without a seed of their own
+        tasks = [
+            (
+                population,
+                start_iteration,
+                iterations,
+                regenerate_every,
+                last_iteration,
+                random.getrandbits(32),
+                deadline,
+                kwargs,
+            )
+            for population, kwargs in zip(populations, island_kwargs)
+        ]
+        return self.pool.starmap(evolve_island, tasks)
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+        _island_dataset.clear()
+
+    def __enter__(self) -> "IslandPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
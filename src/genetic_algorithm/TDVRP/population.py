@@ -0,0 +1,137 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+DEPOT = 0
+
+
+class Population:
+    """
+    GA population stored as a 2-D integer chromosome matrix with parallel fitness arrays
+    Chromosomes shorter than the matrix width are padded with the DEPOT and their lengths are kept separately, the
+    decoded routes are not stored and should be calculated only for the individuals to be reported
+    """
+
+    def __init__(self, chromosomes: np.ndarray, lengths: np.ndarray, durations: np.ndarray, sum_durations: np.ndarray):
+        """
+        :param chromosomes: Matrix of PxL where each row is a chromosome [DEPOT, ..., DEPOT] padded with the DEPOT
+        :param lengths: Length of each chromosome
+        :param durations: Total time it takes for the latest driver for each chromosome, INF if infeasible, NaN if the
+            fitness of the chromosome is not calculated yet
+        :param sum_durations: Sum of the durations of each driver for each chromosome, INF if infeasible
+        """
+        self.chromosomes = chromosomes
+        self.lengths = lengths
+        self.durations = durations
+        self.sum_durations = sum_durations
+
+    @classmethod
+    def from_lists(
+        cls, permutations: List[List[int]], durations: List[float], sum_durations: List[float]
+    ) -> "Population":
+        """
+        Builds a population from chromosomes given as lists
+
+        :param permutations: Chromosomes of the individuals
+        :param durations: Total time it takes for the latest driver for each chromosome
+        :param sum_durations: Sum of the durations of each driver for each chromosome
+        :return: Population of the given individuals
+        """
+        width = max((len(permutation) for permutation in permutations), default=0)
+        chromosomes = np.full((len(permutations), width), DEPOT, dtype=np.int16)
+        for idx, permutation in enumerate(permutations):
+            chromosomes[idx, : len(permutation)] = permutation
+        return cls(
+            chromosomes=chromosomes,
+            lengths=np.array([len(permutation) for permutation in permutations], dtype=np.int16),
+            durations=np.array(durations, dtype=float),
+            sum_durations=np.array(sum_durations, dtype=float),
+        )
+
+    @classmethod
+    def concatenate(cls, populations: Sequence["Population"]) -> "Population":
+        """
+        Concatenates the given populations, padding the chromosomes to the widest one
+
+        :param populations: Populations to be concatenated
+        :return: Population of all individuals in the given order
+        """
+        width = max(population.chromosomes.shape[1] for population in populations)
+        chromosomes = np.full((sum(len(population) for population in populations), width), DEPOT, dtype=np.int16)
+        start = 0
+        for population in populations:
+            chromosomes[start : start + len(population), : population.chromosomes.shape[1]] = population.chromosomes
+            start += len(population)
+        return cls(
+            chromosomes=chromosomes,
+            lengths=np.concatenate([population.lengths for population in populations]),
+            durations=np.concatenate([population.durations for population in populations]),
+            sum_durations=np.concatenate([population.sum_durations for population in populations]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.durations)
+
+    def get_chromosome(self, idx: int) -> List[int]:
+        """
+        :param idx: Index of the individual
+        :return: Chromosome of the individual as a list, without the padding
+        """
+        return self.chromosomes[idx, : self.lengths[idx]].tolist()
+
+    def set_chromosome(self, idx: int, chromosome: List[int], duration: float, sum_duration: float) -> None:
+        """
+        Replaces the chromosome of the individual in place, the length of the chromosome should not change
+
+        :param idx: Index of the individual
+        :param chromosome: New chromosome of the individual
+        :param duration: Total time it takes for the latest driver for the new chromosome
+        :param sum_duration: Sum of the durations of each driver for the new chromosome
+        """
+        self.chromosomes[idx, : self.lengths[idx]] = chromosome
+        self.durations[idx] = duration
+        self.sum_durations[idx] = sum_duration
+
+    def take(self, indices: Sequence[int]) -> "Population":
+        """
+        :param indices: Indices of the individuals to be taken, an individual can be taken more than once
+        :return: New population of the given individuals in the given order
+        """
+        indices = np.asarray(indices, dtype=int)
+        return Population(
+            chromosomes=self.chromosomes[indices],
+            lengths=self.lengths[indices],
+            durations=self.durations[indices],
+            sum_durations=self.sum_durations[indices],
+        )
+
+    def pending(self, indices: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        :param indices: Indices of the individuals to be checked, all individuals if None
+        :return: Indices of the individuals whose fitness is not calculated yet, i.e. with NaN durations
+        """
+        indices = np.arange(len(self)) if indices is None else np.unique(np.asarray(indices, dtype=int))
+        return indices[np.isnan(self.durations[indices])]
+
+    def best_index(self) -> int:
+        """
+        :return: Index of the first individual with the shortest duration
+        """
+        return int(np.argmin(self.durations))
+
+    def diversity(self) -> float:
+        """
+        :return: Mean share of the genes of each chromosome that differ from the gene at the same position of the best
+            chromosome, 0 if all chromosomes are the same
+        """
+        if len(self) == 0:
+            return 0
+        differences = self.chromosomes != self.chromosomes[self.best_index()]
+        widths = np.maximum(self.lengths, self.lengths[self.best_index()])
+        return float(np.mean(differences.sum(axis=1) / np.maximum(widths, 1)))
+
+    def sorted(self) -> "Population":
+        """
+        :return: New population sorted by duration, individuals with equal durations keep their order
+        """
+        return self.take(np.argsort(self.durations, kind="stable"))
@@ -11,12 +11,29 @@ import math
 import random
 from typing import List, Optional, Tuple, Dict
 from collections import defaultdict
+import numpy as np
 
 # Imports: Libraries for Parallel Processing
-import multiprocessing
 from joblib import Parallel, delayed
 from tqdm import tqdm
 
+# Imports: Project Files to be Imported
+from src.genetic_algorithm.crossover import (
+    CROSSOVER_METHODS,
+    DEFAULT_CROSSOVER_METHOD,
+    DEFAULT_CROSSOVER_RATE,
+    crossover,
+)
+from src.genetic_algorithm.fitness_cache import DEFAULT_FITNESS_CACHE_SIZE, FitnessCache
+from src.genetic_algorithm.selection import (
+    DEFAULT_SELECTION_METHOD,
+    SELECTION_METHODS,
+    random_indices,
+    select_indices,
+    selection_rng,
+)
+from src.utilities.helper.cpu_helper import CPU_BUDGET
+
 
 # Basic Variable Definitions
 MIN_ENTRY_COUNT = 25  # used for deciding on making or skipping the selection & replacement step
@@ -31,169 +48,28 @@ DEPOT = 0
 # GENETIC ALGORITHM LOGIC
 
 
-def random_selection(permutations, sel_count, already_selected=[]):
+def random_selection(permutations, sel_count, already_selected=None):
     """
-    Randomly selects 'sel_count' many permutations and starts the process with the permutations available in
+    Randomly selects 'sel_count' many distinct permutations and starts the process with the permutations available in
     'already selected' list
 
     :param permutations: all available permutations
     :param sel_count: number of permutations to be selected
-    :param already_selected: previously selected permutations
-    """
-    # select 'sel_count' many permutations in a random fashion
-    selection_indices = []
-    while len(already_selected) < sel_count:
-        rand_index = random.randint(0, len(permutations) - 1)
-        while rand_index in selection_indices:
-            rand_index = random.randint(0, len(permutations) - 1)
-
-        already_selected.append(permutations[rand_index])
-        selection_indices.append(rand_index)
-
-    return already_selected
-
-
-def reverse_insert_probability_list(permutations, probability_list, inf_start_at_index):
-    """
-    Reverses the probability ranges to be matched with each permutation available
-    This allows the permutations with smaller duration to get a bigger portion
-    in the fitness proportional selection
-
-    :param permutations: all available permutations
-    :param probability_list: duration based fitness intervals
-    :param inf_start_at_index: indicates the index at which the infeasible permutations start getting listed in
-                                the 'permutations' list
+    :param already_selected: indices of the previously selected permutations
     """
-
-    # the fitness and total cost are inversely related
-    # permutations with shorter duration will get higher fitness value
-    # divide the probability list into two depending on the inf total duration values
-    probability_list_non_inf_values = probability_list[:inf_start_at_index]
-    probability_list_inf_values = probability_list[inf_start_at_index:]
-
-    # reverse the duration based probability list and assign bigger portions for the permutations with lower duration
-    probability_list_non_inf_values.reverse()
-    current_fitness_level = 0
-    for index in range(0, len(probability_list_non_inf_values)):
-
-        if not len(permutations[index]) >= 7:
-
-            permutations[index].append(
-                [current_fitness_level, current_fitness_level + probability_list_non_inf_values[index]]
-            )
-            current_fitness_level = current_fitness_level + probability_list_non_inf_values[index]
-
-        else:
-            permutations[index][6] = [
-                current_fitness_level,
-                current_fitness_level + probability_list_non_inf_values[index],
-            ]
-            current_fitness_level = current_fitness_level + probability_list_non_inf_values[index]
-
-    # fills in the rest of the probability range values for the remaining permutations in the list
-    count = 0
-    for index in range(len(probability_list_non_inf_values), len(permutations)):
-
-        if not len(permutations[index]) >= 7:
-            permutations[index].append(
-                [current_fitness_level, current_fitness_level + probability_list_inf_values[count]]
-            )
-            current_fitness_level = current_fitness_level + probability_list_inf_values[count]
-
-        else:
-            permutations[index][6] = [current_fitness_level, current_fitness_level + probability_list_inf_values[count]]
-            current_fitness_level = current_fitness_level + probability_list_inf_values[count]
-
-        count = count + 1
-
-    return permutations
-
-
-def calculate_fitness_level(remaining_permutations):
-    """
-     Based on the previously calculated duration information, calculate the fitness level of each permutation
-
-    :param remaining_permutations: all available permutations
-    """
-
-    sorted(remaining_permutations, key=lambda x: x[2], reverse=False)
-    shortest_duration = remaining_permutations[0][2]
-    total_sum = 0
-
-    for elem in remaining_permutations:
-        # if the permutation is not infeasible then add the total duration to the total sum
-        if elem[2] != math.inf:
-            total_sum = total_sum + elem[2]
-        # if the permutation is infeasible then add the shortest duration of the permutation list as the
-        # total duration of the infeasible solution so that the fitness value distribution would be balanced
-        else:
-            total_sum = total_sum + shortest_duration
-
-    probability_list = []
-    inf_starts_at_index = 0
-
-    # the index at which the infeasible solutions start is found and stored for it to be used in the reversion method
-    for index in range(0, len(remaining_permutations)):
-
-        # find the non-reversed fitness level of each permutation
-        if remaining_permutations[index][2] != math.inf:
-            fitness_level = remaining_permutations[index][2] / total_sum
-        else:
-            fitness_level = (shortest_duration) / total_sum
-
-            if inf_starts_at_index == 0:  # if it has been already changed then do not change it again
-                inf_starts_at_index = index
-
-        # store the non-reversed fitness level
-        probability_list.append(fitness_level)
-
-    # find the original/adjusted/reversed fitness levels
-    remaining_permutations = reverse_insert_probability_list(
-        remaining_permutations, probability_list, inf_starts_at_index
-    )
-
-    return remaining_permutations
+    return [permutations[index] for index in random_indices(len(permutations), sel_count, already_selected)]
 
 
 def select_based_on_fitness_proportional(permutations):
     """
-     Select a predefined number of permutations from the given permutations list
+     Select a predefined number of permutations from the given permutations list, the permutations with shorter
+     durations get bigger portions of the roulette wheel
 
     :param permutations: all available permutations
     """
-
-    start = datetime.now()
-    mode = "FITNESS"
     selection_len = int(len(permutations) * 5 / 8)
-    selected = []
-
-    # continue fitness proportional selection until the selection length is reached
-    while len(selected) < selection_len:
-
-        end = datetime.now()
-
-        if (end - start).seconds >= 0.6:
-            # current implementation of the fitness proportional method might take some time
-            # current time limit is 10 seconds
-            # if the threshold is exceeded than selection mode is switched to RANDOM selection
-            mode = "RANDOM"
-            break
-
-        else:  # time limit has not reached, continue fitness proportional selection
-            # generate random number between 0 and 1
-            rand = random.uniform(0, 1)
-
-            # find the permutation which has this value in its own fitness range
-            for index in range(0, len(permutations)):
-                elem = permutations[index]
-                if elem[6][0] <= rand <= elem[6][1] and elem[1]:
-                    selected.append(elem)
-                    break
-
-    if mode == "RANDOM":
-        return random_selection(permutations=permutations, sel_count=selection_len, already_selected=selected)
-
-    return selected
+    durations = [elem[2] for elem in permutations]
+    return [permutations[index] for index in select_indices(durations, selection_len, method="roulette")]
 
 
 def deterministic_best_n_replacement(permutations, n=-1):
@@ -216,7 +92,9 @@ def deterministic_best_n_replacement(permutations, n=-1):
 # REPRODUCTION
 
 
-def swap_mutation(permutations, VST, dist_data, M, Q, load, demand_dict, sn, cancelled_customers, do_load_unload):
+def swap_mutation(
+    permutations, VST, dist_data, M, Q, load, demand_dict, sn, cancelled_customers, do_load_unload, fitness_cache=None
+):
     """
     Select two random indices and swap these indices
     If the mutated permutation has a longer duration than the previous permutation, simply revert the swap
@@ -257,6 +135,7 @@ def swap_mutation(permutations, VST, dist_data, M, Q, load, demand_dict, sn, can
                     sn=sn,
                     cancelled_customers=cancelled_customers,
                     do_load_unload=do_load_unload,
+                    fitness_cache=fitness_cache,
                 )
 
                 # if the new duration is shorter than the previous one keep it
@@ -273,7 +152,9 @@ def swap_mutation(permutations, VST, dist_data, M, Q, load, demand_dict, sn, can
     return permutations
 
 
-def scramble_mutation(permutations, VST, dist_data, M, Q, load, demand_dict, sn, cancelled_customers, do_load_unload):
+def scramble_mutation(
+    permutations, VST, dist_data, M, Q, load, demand_dict, sn, cancelled_customers, do_load_unload, fitness_cache=None
+):
     """
     Select two random indices
     Shuffle everything that stays between these two randomly selected indices
@@ -323,6 +204,7 @@ def scramble_mutation(permutations, VST, dist_data, M, Q, load, demand_dict, sn,
                     sn=sn,
                     cancelled_customers=cancelled_customers,
                     do_load_unload=do_load_unload,
+                    fitness_cache=fitness_cache,
                 )
                 single_perm[2], single_perm[1] = a, b
                 single_perm[3], single_perm[4], single_perm[5] = route_sum_time, vehicle_routes, vehicle_times
@@ -331,7 +213,9 @@ def scramble_mutation(permutations, VST, dist_data, M, Q, load, demand_dict, sn,
     return permutations
 
 
-def inversion_mutation(permutations, VST, dist_data, M, Q, load, demand_dict, sn, cancelled_customers, do_load_unload):
+def inversion_mutation(
+    permutations, VST, dist_data, M, Q, load, demand_dict, sn, cancelled_customers, do_load_unload, fitness_cache=None
+):
     """
     Select two random indices
     Reverse everything that stays between these two randomly selected indices
@@ -382,6 +266,7 @@ def inversion_mutation(permutations, VST, dist_data, M, Q, load, demand_dict, sn
                     sn=sn,
                     cancelled_customers=cancelled_customers,
                     do_load_unload=do_load_unload,
+                    fitness_cache=fitness_cache,
                 )
                 single_perm[2], single_perm[1] = a, b
                 single_perm[3], single_perm[4], single_perm[5] = route_sum_time, vehicle_routes, vehicle_times
@@ -391,14 +276,81 @@ def inversion_mutation(permutations, VST, dist_data, M, Q, load, demand_dict, sn
     return permutations
 
 
+def crossover_population(
+    permutations,
+    VST,
+    dist_data,
+    M,
+    Q,
+    load,
+    demand_dict,
+    sn,
+    cancelled_customers,
+    do_load_unload,
+    fitness_cache=None,
+    crossover_method=DEFAULT_CROSSOVER_METHOD,
+):
+    """
+    Recombine pairs of parents chosen by tournament selection and add their children to the permutations list
+
+    :param permutations: all available permutations
+    :param crossover_method: one of CROSSOVER_METHODS
+    """
+    rng = selection_rng()
+    child_count = int(len(permutations) * DEFAULT_CROSSOVER_RATE)
+    if child_count == 0 or len(permutations[0][0]) < 2:
+        return permutations
+
+    durations = [elem[2] for elem in permutations]
+    parents = select_indices(durations, 2 * child_count, "tournament", rng)
+    chromosomes = np.array([permutations[index][0] for index in parents])
+    children = crossover(chromosomes[:child_count], chromosomes[child_count:], crossover_method, rng)
+
+    new_permutations = list(permutations)
+    for child in children.tolist():
+        total_dist, route, route_sum_time, vehicle_routes, vehicle_times = calculate_duration(
+            permutation=child,
+            VST=VST,
+            dist_data=dist_data,
+            M=M,
+            Q=Q,
+            load=load,
+            demand_dict=demand_dict,
+            sn=sn,
+            cancelled_customers=cancelled_customers,
+            do_load_unload=do_load_unload,
+            fitness_cache=fitness_cache,
+        )
+        new_permutations.append([route, route, total_dist, route_sum_time, vehicle_routes, vehicle_times])
+
+    return new_permutations
+
+
 def genetic_algorithm(
-    population, N, M, k, q, W, duration, demand, ist, demand_dict, sn, cancelled_customers, do_load_unload
+    population,
+    N,
+    M,
+    k,
+    q,
+    W,
+    duration,
+    demand,
+    ist,
+    demand_dict,
+    sn,
+    cancelled_customers,
+    do_load_unload,
+    fitness_cache=None,
+    selection_method=DEFAULT_SELECTION_METHOD,
+    crossover_method=DEFAULT_CROSSOVER_METHOD,
 ):
     """
     Apply Mutation and Selection & Replacement operations
     based on the random probabilities generated
 
     :param population: all available permutations
+    :param selection_method: one of SELECTION_METHODS, used instead of the random selection
+    :param crossover_method: one of CROSSOVER_METHODS, children are added to the permutations after the mutation
     """
 
     Q = q
@@ -439,6 +391,7 @@ def genetic_algorithm(
             sn=sn,
             cancelled_customers=cancelled_customers,
             do_load_unload=do_load_unload,
+            fitness_cache=fitness_cache,
         )
     elif INVERSION_MUTATION_PROB[0] <= rand_phase_1 <= INVERSION_MUTATION_PROB[1]:
         # print("REPRODUCTION: applying inversion mutation...")
@@ -453,6 +406,7 @@ def genetic_algorithm(
             sn=sn,
             cancelled_customers=cancelled_customers,
             do_load_unload=do_load_unload,
+            fitness_cache=fitness_cache,
         )
     elif SCRAMBLE_MUTATION_PROB[0] <= rand_phase_1 <= SCRAMBLE_MUTATION_PROB[1]:
         # print("REPRODUCTION: applying scramble mutation...")
@@ -467,6 +421,24 @@ def genetic_algorithm(
             sn=sn,
             cancelled_customers=cancelled_customers,
             do_load_unload=do_load_unload,
+            fitness_cache=fitness_cache,
+        )
+
+    # PHASE 1.5 CROSSOVER
+    if crossover_method != "none":
+        updated_population = crossover_population(
+            updated_population,
+            VST=vehicles_start_times,
+            dist_data=DIST_DATA,
+            M=M,
+            Q=Q,
+            load=LOAD,
+            demand_dict=demand_dict,
+            sn=sn,
+            cancelled_customers=cancelled_customers,
+            do_load_unload=do_load_unload,
+            fitness_cache=fitness_cache,
+            crossover_method=crossover_method,
         )
 
     # PHASE 2 SELECTION & REPLACEMENT
@@ -474,11 +446,8 @@ def genetic_algorithm(
         # if the number of permutations available is less than MIN_ENTRY_COUNT do not apply selection & replacement
         if SELECTION_PROB[0] <= rand_phase_2 <= SELECTION_PROB[1]:
             # print("SELECTION & REPLACEMENT: applying selection...")
-            # first calculate the fitness value of all permutations
-            population_with_fitness = calculate_fitness_level(updated_population)
-            # then select permutations based on fitness value
-            new_population = select_based_on_fitness_proportional(population_with_fitness)
-            pass
+            # select permutations based on fitness value
+            new_population = select_based_on_fitness_proportional(updated_population)
 
         elif REPLACEMENT_PROB[0] <= rand_phase_2 <= REPLACEMENT_PROB[1]:
             # print("SELECTION & REPLACEMENT: applying replacement...")
@@ -486,9 +455,12 @@ def genetic_algorithm(
 
         elif RANDOM_SELECTION_PROB[0] <= rand_phase_2 <= RANDOM_SELECTION_PROB[1]:
             # print("SELECTION & REPLACEMENT: applying random selection...")
-            new_population = random_selection(
-                updated_population, (len(updated_population) * 5 / 8), already_selected=[]
-            )
+            # the random selection is replaced by the given selection method, e.g. tournament
+            durations = [elem[2] for elem in updated_population]
+            new_population = [
+                updated_population[index]
+                for index in select_indices(durations, len(updated_population) * 5 / 8, selection_method)
+            ]
 
         elif NO_SELECTION_REPLACEMENT_PROB[0] <= rand_phase_2 <= NO_SELECTION_REPLACEMENT_PROB[1]:
             # print("SELECTION & REPLACEMENT: no operation...")
@@ -580,7 +552,19 @@ def calculate_duration_load_unload_tsp(
     return current_time, perm, tour_dict, tour_len
 
 
-def calculate_duration(permutation, VST, dist_data, M, Q, load, demand_dict, sn, cancelled_customers, do_load_unload):
+def calculate_duration(
+    permutation, VST, dist_data, M, Q, load, demand_dict, sn, cancelled_customers, do_load_unload, fitness_cache=None
+):
+    """
+    Calculates the duration of the tour visiting the given permutation of customers
+
+    :param fitness_cache: Cache of the previously calculated durations, not used if None
+    """
+    if fitness_cache is not None:
+        fitness = fitness_cache.get(permutation)
+        if fitness is not None:
+            route_max_time, vehicle_routes, vehicle_times = fitness
+            return route_max_time, permutation, route_max_time, vehicle_routes, vehicle_times
 
     route = []
     for elem in permutation:
@@ -607,6 +591,9 @@ def calculate_duration(permutation, VST, dist_data, M, Q, load, demand_dict, sn,
         demand_dict=demand_dict,
     )
 
+    if fitness_cache is not None:
+        fitness_cache.put(permutation, (route_max_time, vehicle_routes, vehicle_times))
+
     return route_max_time, permutation, route_max_time, vehicle_routes, vehicle_times
 
 
@@ -642,6 +629,9 @@ def ga(
     cancelled_customers=[],
     do_load_unload=True,
     permutations=None,
+    fitness_cache=None,
+    selection_method=DEFAULT_SELECTION_METHOD,
+    crossover_method=DEFAULT_CROSSOVER_METHOD,
 ):
     """
     Main method that controls the mode of the genetic algorithm
@@ -697,6 +687,7 @@ def ga(
                     sn=start_node,
                     cancelled_customers=cancelled_customers,
                     do_load_unload=do_load_unload,
+                    fitness_cache=fitness_cache,
                 )
 
                 # constructed the tour information list
@@ -722,6 +713,9 @@ def ga(
             sn=start_node,
             cancelled_customers=cancelled_customers,
             do_load_unload=do_load_unload,
+            fitness_cache=fitness_cache,
+            selection_method=selection_method,
+            crossover_method=crossover_method,
         )
 
         # results are sorted based on duration of sequences  (i.e. x[2])
@@ -743,6 +737,9 @@ def ga(
             sn=start_node,
             cancelled_customers=cancelled_customers,
             do_load_unload=do_load_unload,
+            fitness_cache=fitness_cache,
+            selection_method=selection_method,
+            crossover_method=crossover_method,
         )
         # results are sorted based on duration of sequences  (i.e. x[2])
         res = sorted(res, key=lambda x: x[2], reverse=False)
@@ -750,6 +747,36 @@ def ga(
     return res
 
 
+def ga_worker(fitness_cache, **ga_kwargs):
+    """
+    Runs the ga method in a worker process on the copy of the fitness cache the worker received
+
+    :param fitness_cache: Copy of the fitness cache of the parent process
+    :return: Result of the ga method and a cache of the entries added and the lookups made by the worker, to be merged
+        into the fitness cache of the parent process
+    """
+    known_keys = set(fitness_cache.entries)
+    hits, misses = fitness_cache.hits, fitness_cache.misses
+    result = ga(fitness_cache=fitness_cache, **ga_kwargs)
+    added = FitnessCache(fitness_cache.max_size)
+    added.entries.update((key, value) for key, value in fitness_cache.entries.items() if key not in known_keys)
+    added.hits, added.misses = fitness_cache.hits - hits, fitness_cache.misses - misses
+    return result, added
+
+
+def merge_worker_caches(results, fitness_cache, num_cores):
+    """
+    :param results: Results of the ga_worker calls
+    :param fitness_cache: Fitness cache of the parent process, the caches of the workers are merged into it
+    :param num_cores: Number of cores of the run, the single core run works on the cache of the parent process itself
+    :return: Results of the ga method
+    """
+    if num_cores > 1:
+        for _, worker_cache in results:
+            fitness_cache.merge(worker_cache)
+    return [result for result, _ in results]
+
+
 def run(
     N,
     M,
@@ -766,6 +793,9 @@ def run(
     do_load_unload=True,
     population_count=125,
     iteration_count=15,
+    fitness_cache_size=DEFAULT_FITNESS_CACHE_SIZE,
+    selection_method=DEFAULT_SELECTION_METHOD,
+    crossover_method=DEFAULT_CROSSOVER_METHOD,
 ):
     N = N  # number of shops to be considered
     K = k  # number of tours to be considered
@@ -775,47 +805,24 @@ def run(
     DIST_DATA = duration  # duration data
     vehicles_start_times = ist
     ITERATION_COUNT = iteration_count
+    assert selection_method in SELECTION_METHODS, f"selection_method should be one of {SELECTION_METHODS}"
+    assert crossover_method in CROSSOVER_METHODS, f"crossover_method should be one of {CROSSOVER_METHODS}"
+    # fitness values of the evaluated chromosomes, shared by all ga calls of a run
+    # in a multi core run each worker gets a copy of it, the entries and the lookups of the workers are merged back
+    # after each iteration, so that the next iteration of every worker starts with them
+    fitness_cache = FitnessCache(fitness_cache_size)
 
     start_time = datetime.now()  # used for runtime calculation
 
     # set the number of cores to be used
-    if multithreaded:
-        # get the number of available cores
-        num_cores = int(multiprocessing.cpu_count())
-    else:
-        num_cores = 1
-
-    # run num_cores many threads in parallel
-    # at the beginning there exists no input for the ga method, permutations will be equal to None
-    inputs = tqdm(num_cores * [1], disable=True)
-    processed_list = Parallel(n_jobs=num_cores)(
-        delayed(ga)(
-            N=N,
-            M=M,
-            k=K,
-            q=Q,
-            W=DEPOT,
-            duration=DIST_DATA,
-            ist=vehicles_start_times,
-            start_node=start_node,
-            customer_list=customer_list,
-            permutations=None,
-            cancelled_customers=cancelled_customers,
-            do_load_unload=do_load_unload,
-            demand_dict=demand_dict,
-            population_count=population_count,
-        )
-        for i in inputs
-    )
-
-    iteration_count = 0
-    best = []
-
-    while iteration_count < ITERATION_COUNT:
-
-        inputs = tqdm(processed_list, disable=True)
+    # the cores are granted by the CPU budget of the process, so that concurrent runs do not oversubscribe the CPU
+    # the cores are released once the iterations are completed, also when the run fails
+    with CPU_BUDGET.grant(None if multithreaded else 1) as num_cores:
+        # run num_cores many threads in parallel
+        # at the beginning there exists no input for the ga method, permutations will be equal to None
+        inputs = tqdm(num_cores * [1], disable=True)
         processed_list = Parallel(n_jobs=num_cores)(
-            delayed(ga)(
+            delayed(ga_worker)(
                 N=N,
                 M=M,
                 k=K,
@@ -825,22 +832,56 @@ def run(
                 ist=vehicles_start_times,
                 start_node=start_node,
                 customer_list=customer_list,
-                permutations=i,
+                permutations=None,
                 cancelled_customers=cancelled_customers,
                 do_load_unload=do_load_unload,
                 demand_dict=demand_dict,
                 population_count=population_count,
+                fitness_cache=fitness_cache,
+                selection_method=selection_method,
+                crossover_method=crossover_method,
             )
             for i in inputs
         )
+        processed_list = merge_worker_caches(processed_list, fitness_cache, num_cores)
+
+        iteration_count = 0
+        best = []
+
+        while iteration_count < ITERATION_COUNT:
+
+            inputs = tqdm(processed_list, disable=True)
+            processed_list = Parallel(n_jobs=num_cores)(
+                delayed(ga_worker)(
+                    N=N,
+                    M=M,
+                    k=K,
+                    q=Q,
+                    W=DEPOT,
+                    duration=DIST_DATA,
+                    ist=vehicles_start_times,
+                    start_node=start_node,
+                    customer_list=customer_list,
+                    permutations=i,
+                    cancelled_customers=cancelled_customers,
+                    do_load_unload=do_load_unload,
+                    demand_dict=demand_dict,
+                    population_count=population_count,
+                    fitness_cache=fitness_cache,
+                    selection_method=selection_method,
+                    crossover_method=crossover_method,
+                )
+                for i in inputs
+            )
+            processed_list = merge_worker_caches(processed_list, fitness_cache, num_cores)
 
-        for elem in processed_list:
+            for elem in processed_list:
 
-            elem = sorted(elem, key=lambda x: x[2], reverse=False)
+                elem = sorted(elem, key=lambda x: x[2], reverse=False)
 
-            best.append(copy.deepcopy(elem[0]))
+                best.append(copy.deepcopy(elem[0]))
 
-        iteration_count = iteration_count + 1
+            iteration_count = iteration_count + 1
 
     # sort the best results
     best_result_list = sorted(best, key=lambda x: x[2], reverse=False)
@@ -858,6 +899,7 @@ def run(
     print("GA TSP: Best routes", best_vehicle_routes)
     print("GA TSP: Best vehicle times", best_vehicle_times)
     print("GA TSP: exec time", exec_time)
+    print("GA TSP: fitness cache", fitness_cache.stats())
     return (best_route_max_time, best_route_sum_time, best_vehicle_routes, best_vehicle_times, str(exec_time))
 
 
@@ -0,0 +1,174 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.genetic_algorithm.selection import selection_rng
+
+CROSSOVER_METHODS = ["none", "ox", "pmx", "erx"]
+DEFAULT_CROSSOVER_METHOD = "none"
+DEFAULT_CROSSOVER_RATE = 0.5  # number of children generated per individual of the population
+
+
+def to_labels(chromosomes: np.ndarray) -> np.ndarray:
+    """
+    Relabels each chromosome as a permutation of 0..L-1, repeated genes (e.g. DEPOT separators of a giant tour) get
+    consecutive labels in the order they appear, so that the order-based operators can be applied to them
+
+    :param chromosomes: Matrix of BxL where each row is a chromosome
+    :return: Matrix of BxL where each row is a permutation of the labels 0..L-1
+    """
+    return np.argsort(np.argsort(chromosomes, axis=1, kind="stable"), axis=1, kind="stable")
+
+
+def cut_points(batch: int, length: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :param batch: Number of parent pairs
+    :param length: Length of the chromosomes
+    :param rng: Random number generator
+    :return: Start (inclusive) and end (exclusive) of a non-empty segment for each parent pair
+    """
+    first = rng.integers(0, length, batch)
+    second = rng.integers(0, length, batch)
+    return np.minimum(first, second), np.maximum(first, second) + 1
+
+
+def order_crossover(
+    parents_a: np.ndarray, parents_b: np.ndarray, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    Order crossover (OX), the child keeps a segment of parent a and gets the remaining labels in the order they are
+    visited by parent b after the second cut point
+
+    :param parents_a: Matrix of BxL where each row is a permutation of the labels 0..L-1
+    :param parents_b: Matrix of BxL where each row is a permutation of the labels 0..L-1
+    :param rng: Random number generator, seeded from the random module if None
+    :return: Matrix of BxL where each row is a child permutation
+    """
+    rng = selection_rng() if rng is None else rng
+    batch, length = parents_a.shape
+    starts, ends = cut_points(batch, length, rng)
+    rows = np.arange(batch)[:, None]
+    columns = np.arange(length)[None, :]
+    in_segment = (columns >= starts[:, None]) & (columns < ends[:, None])
+    positions_a = np.argsort(parents_a, axis=1)
+
+    # labels of parent b starting from the second cut point, those already copied from parent a are moved to the end
+    rotation = (ends[:, None] + columns) % length
+    rotated_b = parents_b[rows, rotation]
+    copied = in_segment[rows, positions_a[rows, rotated_b]]
+    fill = np.take_along_axis(rotated_b, np.argsort(copied, axis=1, kind="stable"), axis=1)
+
+    # the free positions are filled starting from the second cut point, wrapping around
+    free = columns < (length - (ends - starts))[:, None]
+    children = parents_a.copy()
+    children[np.broadcast_to(rows, free.shape)[free], rotation[free]] = fill[free]
+    return children
+
+
+def partially_mapped_crossover(
+    parents_a: np.ndarray, parents_b: np.ndarray, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    Partially mapped crossover (PMX), the child keeps a segment of parent a and the positions of parent b elsewhere,
+    a conflicting label is replaced by following the segment mapping of parent a to parent b
+
+    :param parents_a: Matrix of BxL where each row is a permutation of the labels 0..L-1
+    :param parents_b: Matrix of BxL where each row is a permutation of the labels 0..L-1
+    :param rng: Random number generator, seeded from the random module if None
+    :return: Matrix of BxL where each row is a child permutation
+    """
+    rng = selection_rng() if rng is None else rng
+    batch, length = parents_a.shape
+    starts, ends = cut_points(batch, length, rng)
+    rows = np.arange(batch)[:, None]
+    columns = np.arange(length)[None, :]
+    in_segment = (columns >= starts[:, None]) & (columns < ends[:, None])
+    positions_a = np.argsort(parents_a, axis=1)
+
+    labels = parents_b.copy()
+    # each step resolves one link of the mapping chains of all children at once
+    for _ in range(length):
+        positions = positions_a[rows, labels]
+        conflict = ~in_segment & in_segment[rows, positions]
+        if not conflict.any():
+            break
+        labels = np.where(conflict, parents_b[rows, positions], labels)
+
+    return np.where(in_segment, parents_a, labels)
+
+
+def edge_recombination_crossover(
+    parents_a: np.ndarray, parents_b: np.ndarray, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    Edge recombination crossover (ERX), the child is built mostly from the edges of both parents, the next label is the
+    neighbour of the current one with the fewest remaining neighbours
+    Unlike OX and PMX, the children are built one by one since each step depends on the previous one
+
+    :param parents_a: Matrix of BxL where each row is a permutation of the labels 0..L-1
+    :param parents_b: Matrix of BxL where each row is a permutation of the labels 0..L-1
+    :param rng: Random number generator, seeded from the random module if None
+    :return: Matrix of BxL where each row is a child permutation
+    """
+    rng = selection_rng() if rng is None else rng
+    batch, length = parents_a.shape
+    # neighbours of each label in both parents, the tours are considered cyclic
+    neighbours = np.concatenate(
+        [
+            np.take_along_axis(np.roll(parents, shift, axis=1), np.argsort(parents, axis=1), axis=1)
+            for parents in (parents_a, parents_b)
+            for shift in (1, -1)
+        ],
+        axis=1,
+    ).reshape(batch, 4, length)
+    children = np.empty_like(parents_a)
+    for row in range(batch):
+        edges = [set(neighbours[row, :, label].tolist()) for label in range(length)]
+        for label in range(length):
+            edges[label].discard(label)
+        unvisited = set(range(length))
+        current = int(parents_a[row, 0])
+        for column in range(length):
+            children[row, column] = current
+            unvisited.discard(current)
+            for label in edges[current]:
+                edges[label].discard(current)
+            if not unvisited:
+                break
+            if edges[current]:
+                fewest = min(len(edges[label]) for label in edges[current])
+                candidates = sorted(label for label in edges[current] if len(edges[label]) == fewest)
+            else:
+                candidates = sorted(unvisited)
+            current = candidates[rng.integers(len(candidates))]
+    return children
+
+
+CROSSOVER_OPERATORS = {
+    "ox": order_crossover,
+    "pmx": partially_mapped_crossover,
+    "erx": edge_recombination_crossover,
+}
+
+
+def crossover(
+    parents_a: np.ndarray,
+    parents_b: np.ndarray,
+    method: str = DEFAULT_CROSSOVER_METHOD,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Recombines each pair of parents into a child, the parents of a pair should consist of the same genes
+
+    :param parents_a: Matrix of BxL where each row is a chromosome
+    :param parents_b: Matrix of BxL where each row is a chromosome with the same genes as in parents_a
+    :param method: One of CROSSOVER_METHODS, the child is a copy of parent a for "none"
+    :param rng: Random number generator, seeded from the random module if None
+    :return: Matrix of BxL where each row is a child chromosome
+    """
+    assert method in CROSSOVER_METHODS, f"method should be one of {CROSSOVER_METHODS}"
+    if method == "none" or parents_a.shape[1] < 2:
+        return parents_a.copy()
+    genes = np.sort(parents_a, axis=1)
+    children = CROSSOVER_OPERATORS[method](to_labels(parents_a), to_labels(parents_b), rng)
+    return np.take_along_axis(genes, children, axis=1)
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+DEFAULT_FITNESS_CACHE_SIZE = 2**16
+
+
+class FitnessCache:
+    """
+    Bounded least-recently-used cache of chromosome fitness values, keyed by a hash of the giant tour
+    The cache is picklable, so that a warm cache can be shipped to the workers and merged back
+    """
+
+    def __init__(self, max_size: int = DEFAULT_FITNESS_CACHE_SIZE):
+        """
+        :param max_size: Maximum number of chromosomes to be kept, the least recently used one is dropped first
+        """
+        assert max_size > 0, "max_size should be positive"
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(chromosome: Sequence[int]) -> int:
+        """
+        :param chromosome: Giant tour of the individual
+        :return: Compact hash of the giant tour, deterministic across processes
+        """
+        return hash(tuple(chromosome))
+
+    def get(self, chromosome: Sequence[int]) -> Optional[Any]:
+        """
+        :param chromosome: Giant tour of the individual
+        :return: Cached fitness of the chromosome, None if it is not cached
+        """
+        key = self.key(chromosome)
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, chromosome: Sequence[int], value: Any) -> None:
+        """
+        :param chromosome: Giant tour of the individual
+        :param value: Fitness of the chromosome
+        """
+        key = self.key(chromosome)
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def merge(self, other: "FitnessCache") -> None:
+        """
+        Adds the entries and the counters of another cache, e.g. the one returned from a worker
+
+        :param other: Cache to be merged into this one
+        """
+        for key, value in other.entries.items():
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        self.hits += other.hits
+        self.misses += other.misses
+
+    def stats(self) -> Dict[str, float]:
+        """
+        :return: Number of hits, misses and cached entries, and the hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+            "hit_rate": self.hits / lookups if lookups > 0 else 0,
+        }
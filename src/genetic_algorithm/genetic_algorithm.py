@@ -9,9 +9,12 @@
 
 """
 
+from src.genetic_algorithm.crossover import DEFAULT_CROSSOVER_METHOD
 from src.genetic_algorithm.TSP.genetic_algorithm_tsp import run as genetic_algorithm_tsp
-from src.genetic_algorithm.TDVRP.genetic_algorithm_vrp import run as genetic_algorithm_vrp
+from src.genetic_algorithm.TDVRP.genetic_algorithm_vrp import DEFAULT_INITIALIZER, run as genetic_algorithm_vrp
 from src.utilities.helper import result_2_output
+from src.utilities.helper.lower_bound_helper import get_gap, get_vrp_lower_bound
+from src.utilities.helper.split_helper import DEFAULT_DECODER
 import copy
 
 
@@ -145,6 +148,12 @@ def run_GA(
     do_load_unload,
     max_k=0,
     k_lower_limit=True,
+    crossover_method=DEFAULT_CROSSOVER_METHOD,
+    decoder=DEFAULT_DECODER,
+    stall_generations=None,
+    diversity_floor=None,
+    time_limit=None,
+    initializer=DEFAULT_INITIALIZER,
 ):
 
     print("Genetic Algorithm")
@@ -236,6 +245,12 @@ def run_GA(
                 k_lower_limit=k_lower_limit,
                 population_count=random_perm_count,
                 iteration_count=iteration_count,
+                crossover_method=crossover_method,
+                decoder=decoder,
+                stall_generations=stall_generations,
+                diversity_floor=diversity_floor,
+                time_limit=time_limit,
+                initializer=initializer,
             )
 
         else:
@@ -255,6 +270,12 @@ def run_GA(
                 k_lower_limit=k_lower_limit,
                 population_count=random_perm_count,
                 iteration_count=iteration_count,
+                crossover_method=crossover_method,
+                decoder=decoder,
+                stall_generations=stall_generations,
+                diversity_floor=diversity_floor,
+                time_limit=time_limit,
+                initializer=initializer,
             )
         # TDVRP Output Formatting
         output_dict = result_2_output.vrp_result_2_output(
@@ -265,6 +286,9 @@ def run_GA(
             vrp_result={"vehicles_routes": output[2]},
             capacities=capacities,
         )
+        lower_bound, _ = get_vrp_lower_bound(q, cl, duration, load, ist)
+        output_dict["lowerBound"] = lower_bound
+        output_dict["gap"] = get_gap(output_dict["durationMax"], lower_bound)
 
     elif pm == "TSP":
 
@@ -285,6 +309,7 @@ def run_GA(
                 do_load_unload=do_load_unload,
                 population_count=random_perm_count,
                 iteration_count=iteration_count,
+                crossover_method=crossover_method,
             )
         else:
             output = genetic_algorithm_tsp(
@@ -303,6 +328,7 @@ def run_GA(
                 do_load_unload=do_load_unload,
                 population_count=random_perm_count,
                 iteration_count=iteration_count,
+                crossover_method=crossover_method,
             )
 
         # TDTSP Output Formatting
@@ -349,10 +375,12 @@ def run_GA_local_scenario(
     multithreaded,
     cancelled=[],
     do_load_unload=True,
+    seed_permutations=None,
 ):
     """
     In real life scenario runs, regular method can be used, this method is used to run the scenearios in local
     environment without the additional input output formatting etc.
+    seed_permutations warm start the TDVRP populations, e.g. with the previous solution of the scenario
     """
 
     if mode == "TDVRP":
@@ -409,6 +437,7 @@ def run_GA_local_scenario(
                 k_lower_limit=True,
                 population_count=125,
                 iteration_count=48,
+                seed_permutations=seed_permutations,
             )
         else:
 
@@ -427,6 +456,7 @@ def run_GA_local_scenario(
                 k_lower_limit=True,
                 population_count=125,
                 iteration_count=48,
+                seed_permutations=seed_permutations,
             )
 
     elif pm == "TSP":
@@ -0,0 +1,174 @@
+import random
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+SELECTION_METHODS = ["random", "roulette", "tournament", "rank", "sus"]
+DEFAULT_SELECTION_METHOD = "random"
+DEFAULT_TOURNAMENT_SIZE = 2  # number of individuals competing in each tournament
+DEFAULT_RANK_PRESSURE = 1.5  # expected number of copies of the best individual in linear rank selection, in [1, 2]
+
+
+def selection_rng() -> np.random.Generator:
+    """
+    :return: Generator seeded from the random module, so that the GA runs stay reproducible with random.seed
+    """
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def random_indices(
+    size: int,
+    sel_count: int,
+    already_selected: Optional[Sequence[int]] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Randomly selects distinct individuals until 'sel_count' many individuals are selected in total
+
+    :param size: Number of individuals in the population
+    :param sel_count: Number of individuals to be selected, including the already selected ones
+    :param already_selected: Indices of the previously selected individuals, kept at the beginning of the selection
+    :param rng: Random number generator, seeded from the random module if None
+    :return: Indices of the selected individuals
+    """
+    rng = selection_rng() if rng is None else rng
+    selected = np.asarray([] if already_selected is None else already_selected, dtype=int)
+    available = np.ones(size, dtype=bool)
+    available[selected] = False
+    remaining = np.flatnonzero(available)
+    missing = min(int(np.ceil(sel_count)) - len(selected), len(remaining))
+    if missing <= 0:
+        return selected
+    return np.concatenate([selected, rng.permutation(remaining)[:missing]])
+
+
+def proportional_weights(durations: np.ndarray) -> np.ndarray:
+    """
+    Fitness proportional weights of the individuals, the fitness and the duration are inversely related
+    The shares of the feasible individuals are reversed, so that the shortest duration gets the biggest share
+    An infeasible individual gets the share of the shortest duration at the end of the order
+
+    :param durations: Total duration of each individual, INF if infeasible
+    :return: Selection weight of each individual, summing up to 1
+    """
+    feasible = np.isfinite(durations)
+    if not feasible.any():
+        return np.full(len(durations), 1 / len(durations))
+    adjusted_durations = np.where(feasible, durations, durations[feasible].min())
+    weights = adjusted_durations / adjusted_durations.sum()
+    feasible_indices = np.flatnonzero(feasible)
+    order = feasible_indices[np.argsort(durations[feasible_indices], kind="stable")]
+    weights[order] = weights[order][::-1]
+    return weights
+
+
+def roulette_indices(durations: np.ndarray, sel_count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Fitness proportional selection with replacement, each pick spins the wheel again
+
+    :param durations: Total duration of each individual, INF if infeasible
+    :param sel_count: Number of individuals to be selected
+    :param rng: Random number generator, seeded from the random module if None
+    :return: Indices of the selected individuals
+    """
+    rng = selection_rng() if rng is None else rng
+    upper_levels = np.cumsum(proportional_weights(durations))
+    picks = rng.random(sel_count) * upper_levels[-1]
+    return np.minimum(np.searchsorted(upper_levels, picks, side="right"), len(durations) - 1)
+
+
+def stochastic_universal_indices(
+    weights: np.ndarray, sel_count: int, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    Stochastic universal sampling, a single spin of a wheel with 'sel_count' equally spaced pointers
+    Each individual is selected either floor or ceil of its expected number of copies
+
+    :param weights: Non-negative selection weight of each individual
+    :param sel_count: Number of individuals to be selected
+    :param rng: Random number generator, seeded from the random module if None
+    :return: Indices of the selected individuals
+    """
+    rng = selection_rng() if rng is None else rng
+    upper_levels = np.cumsum(weights)
+    step = upper_levels[-1] / sel_count
+    pointers = (rng.random() + np.arange(sel_count)) * step
+    return np.minimum(np.searchsorted(upper_levels, pointers, side="right"), len(weights) - 1)
+
+
+def tournament_indices(
+    durations: np.ndarray,
+    sel_count: int,
+    tournament_size: int = DEFAULT_TOURNAMENT_SIZE,
+    rng: Optional[np.random.Generator] = None,
+    evaluate: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Tournament selection, the shortest duration among 'tournament_size' random individuals wins each tournament
+
+    :param durations: Total duration of each individual, INF if infeasible
+    :param sel_count: Number of individuals to be selected
+    :param tournament_size: Number of individuals competing in each tournament
+    :param rng: Random number generator, seeded from the random module if None
+    :param evaluate: Returns the durations of the given individuals, only the competitors are evaluated if given
+    :return: Indices of the selected individuals
+    """
+    rng = selection_rng() if rng is None else rng
+    competitors = rng.integers(0, len(durations), size=(sel_count, tournament_size))
+    winners = np.argmin(durations[competitors] if evaluate is None else evaluate(competitors), axis=1)
+    return competitors[np.arange(sel_count), winners]
+
+
+def rank_weights(durations: np.ndarray, pressure: float = DEFAULT_RANK_PRESSURE) -> np.ndarray:
+    """
+    Linear rank weights, only the order of the durations matters and not their scale
+
+    :param durations: Total duration of each individual, INF if infeasible
+    :param pressure: Expected number of copies of the best individual, in [1, 2]
+    :return: Selection weight of each individual, summing up to 1
+    """
+    assert 1 <= pressure <= 2, "pressure should be in [1, 2]"
+    size = len(durations)
+    if size == 1:
+        return np.ones(1)
+    ranks = np.empty(size)
+    # the worst individual gets the rank 0 and the best one gets the rank size-1
+    ranks[np.argsort(durations, kind="stable")[::-1]] = np.arange(size)
+    return ((2 - pressure) + 2 * (pressure - 1) * ranks / (size - 1)) / size
+
+
+def select_indices(
+    durations: np.ndarray,
+    sel_count: int,
+    method: str = DEFAULT_SELECTION_METHOD,
+    rng: Optional[np.random.Generator] = None,
+    evaluate: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Selects individuals based on their durations
+
+    :param durations: Total duration of each individual, INF if infeasible, NaN if not evaluated yet
+    :param sel_count: Number of individuals to be selected
+    :param method: One of SELECTION_METHODS
+    :param rng: Random number generator, seeded from the random module if None
+    :param evaluate: Returns the durations of the given individuals, needed if some durations are NaN
+        Only the durations the method looks at are requested, none for "random" and the competitors for "tournament"
+    :return: Indices of the selected individuals
+    """
+    durations = np.asarray(durations, dtype=float)
+    sel_count = int(np.ceil(sel_count))
+    if sel_count <= 0 or len(durations) == 0:
+        return np.empty(0, dtype=int)
+    if method == "random":
+        return random_indices(len(durations), sel_count, rng=rng)
+    elif method == "tournament":
+        return tournament_indices(durations, sel_count, rng=rng, evaluate=evaluate)
+    if evaluate is not None:
+        durations = evaluate(np.arange(len(durations)))
+    if method == "roulette":
+        return roulette_indices(durations, sel_count, rng)
+    elif method == "rank":
+        return stochastic_universal_indices(rank_weights(durations), sel_count, rng)
+    elif method == "sus":
+        return stochastic_universal_indices(proportional_weights(durations), sel_count, rng)
+    raise ValueError(f"Unknown selection method {method}, should be one of {SELECTION_METHODS}")
@@ -0,0 +1,86 @@
+import math
+import time
+from typing import Optional
+
+STOP_RULES = ["iterations", "converged", "stall", "diversity", "time_limit"]
+PHASE_1_TIME_SHARE = 0.8  # share of the time limit given to the first GA phase, the second one is 4 times shorter
+
+
+class StoppingRules:
+    """
+    Stopping rules of a GA phase, the first rule that fires is kept in 'fired'
+    A phase that runs all of its iterations is stopped by the "iterations" rule, each optional rule is disabled if None
+    """
+
+    def __init__(
+        self,
+        stall_generations: Optional[int] = None,
+        diversity_floor: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ):
+        """
+        :param stall_generations: Stop after this many generations without an improvement of the global best
+        :param diversity_floor: Stop when the diversity of the populations drops below this value, see
+            Population.diversity
+        :param deadline: Stop at this time.time() value
+        """
+        assert stall_generations is None or stall_generations > 0, "stall_generations should be positive"
+        assert diversity_floor is None or 0 <= diversity_floor <= 1, "diversity_floor should be in [0, 1]"
+        self.stall_generations = stall_generations
+        self.diversity_floor = diversity_floor
+        self.deadline = deadline
+        self.best_duration = math.inf
+        self.stalled = 0
+        self.generations = 0
+        self.fired = None
+
+    @property
+    def stopped(self) -> bool:
+        return self.fired is not None
+
+    def stop(self, rule: str) -> bool:
+        """
+        :param rule: One of STOP_RULES, ignored if another rule already fired
+        :return: True
+        """
+        assert rule in STOP_RULES, f"rule should be one of {STOP_RULES}"
+        if self.fired is None:
+            self.fired = rule
+        return True
+
+    def update(self, best_duration: float) -> bool:
+        """
+        Counts a generation of the phase
+
+        :param best_duration: Shortest duration found by the islands in the generation
+        :return: True if the phase should stop
+        """
+        self.generations += 1
+        if best_duration < self.best_duration:
+            self.best_duration = best_duration
+            self.stalled = 0
+        else:
+            self.stalled += 1
+        if self.stall_generations is not None and self.stalled >= self.stall_generations:
+            return self.stop("stall")
+        return self.stopped
+
+    def check_diversity(self, diversity: float) -> bool:
+        """
+        :param diversity: Diversity of the populations of the islands
+        :return: True if the phase should stop
+        """
+        if self.diversity_floor is not None and diversity < self.diversity_floor:
+            return self.stop("diversity")
+        return self.stopped
+
+    def check_deadline(self) -> bool:
+        """
+        :return: True if the phase should stop
+        """
+        if self.deadline is not None and time.time() >= self.deadline:
+            return self.stop("time_limit")
+        return self.stopped
+
+    def summary(self) -> str:
+        return f"{self.fired or 'iterations'} after {self.generations} generations"
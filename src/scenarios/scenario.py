@@ -13,8 +13,10 @@ from src.vrp.ant_colony.aco_hybrid import solve as solve_vrp_aco
 from src.vrp.brute_force.brute_force import solve as solve_vrp_bf
 from src.tsp.ant_colony.aco_hybrid import solve as solve_tsp_aco
 from src.tsp.brute_force.brute_force import solve as solve_tsp_bf
+from src.tsp.dynamic_programming.restricted_dp import solve as solve_tsp_dp
 from src.tsp.simulated_annealing.simulated_annealing import solve as solve_tsp_sa
 from src.utilities.helper.locations_helper import convert_locations, get_demands_from_locations
+from src.utilities.helper.vrp_helper import remaining_solution, solution_to_permutation
 
 DEPOT = 0  # depot
 SELF_CYCLE = [DEPOT, DEPOT]
@@ -90,6 +92,18 @@ def run_tsp_algo(
             ignore_long_trip=False,
         )
         tsp_sol = tsp_sol[1]
+    elif algo == "dp":
+        tsp_sol = solve_tsp_dp(
+            current_time=vehicle_start_time,
+            current_location=vehicle_start_node,
+            customers=customers,
+            duration=duration,
+            load=load,
+            do_loading_unloading=do_loading_unloading,
+            cancelled_customers=cancelled_customers,
+            beam_width=tsp_algo_params["beam_width"],
+        )
+        tsp_sol = tsp_sol[1]
     elif algo == "aco":
         tsp_sol = solve_tsp_aco(
             duration=duration,
@@ -249,6 +263,7 @@ def run_vrp_algo(
     demands: Optional[List[int]],
     vehicles_start_times: List[float],
     vrp_algo_params: Dict,
+    warm_start: Optional[Dict[int, List[List[int]]]] = None,
 ) -> Union[Dict, List[List[List[int]]]]:
     """
     Runs VRP algo on the given customers
@@ -260,9 +275,13 @@ def run_vrp_algo(
     :param demands: Demands of the customers
     :param vehicles_start_times: Start times in terms of seconds for the vehicles
     :param vrp_algo_params: Params to run VRP algo, it should include "algo" as a key
+    :param warm_start: Cycles of a previous solution for each vehicle to start from, e.g. the remaining cycles of the
+        previous VRP of the scenario, it seeds the GA population and the ACO pheromone, the brute force ignores it
     :return: List of location ids to visit where first and last element of each 1D inner list (cycle) is DEPOT
     """
     algo = vrp_algo_params["algo"]
+    if warm_start is not None:
+        warm_start = remaining_solution(warm_start, customers)
     vrp_sol = None
     if algo == "bf":
         vrp_sol = solve_vrp_bf(
@@ -277,6 +296,9 @@ def run_vrp_algo(
         )
         vrp_sol = vrp_sol[2]
     elif algo == "aco":
+        warm_start_routes = None
+        if warm_start is not None:
+            warm_start_routes = [cycle for vehicle_id in sorted(warm_start) for cycle in warm_start[vehicle_id]]
         vrp_sol = solve_vrp_aco(
             k=k,
             q=q,
@@ -289,6 +311,7 @@ def run_vrp_algo(
             ignore_long_trip=False,
             objective_func_type="min_max_time",
             is_print_allowed=False,
+            warm_start_routes=warm_start_routes,
         )
         vrp_sol = vrp_sol[0][2]
     elif algo == "sa":
@@ -309,6 +332,11 @@ def run_vrp_algo(
             mode="TDVRP",
             start_node=None,
             multithreaded=True if vrp_algo_params["multithreaded"] == "Y" else False,
+            seed_permutations=(
+                None
+                if warm_start is None
+                else [solution_to_permutation(warm_start, customers, vehicles_start_times, demands, q, k)]
+            ),
         )
         vrp_sol = vrp_sol[2]
         # run_ga(locations, durations=duration, capacities=[q]*m, initial_start_times=vehicles_start_times, ignored_customers=[], completed_customers=[], multithreaded=True, random_perm_count=0, iteration_count=0, mode="TDVRP", start_node=None, customers=customers)
@@ -328,6 +356,7 @@ def solve_scenario(
     demands: Optional[List[int]],
     vrp_algo_params_path: str = "../../data/scenarios/vrp/config_vrp_aco_1.json",
     tsp_algo_params_path: str = "../../data/scenarios/tsp/config_tsp_bf_1.json",
+    warm_start: bool = True,
 ) -> Tuple[defaultdict, List[float], float, float]:
     """
     Runs the given scenario and simulate the entire day with a couple of VRPs and TSP optimizations for each VRP
@@ -342,6 +371,7 @@ def solve_scenario(
     :param demands: Demands of the customers
     :param vrp_algo_params_path: Path to the file of params to run VRP algo, it should include "algo" as a key
     :param tsp_algo_params_path: Path to the file of params to run TSP algo, it should include "algo" as a key
+    :param warm_start: Flag to start each VRP from the remaining cycles of the previous VRP instead of from scratch
     :return: List of location ids to visit where first and last element of each 1D inner list (cycle) is DEPOT and list
         of vehicle finish times in terms of seconds
     """
@@ -351,10 +381,11 @@ def solve_scenario(
         tsp_algo_params = json.loads(j.read())
 
     assert "algo" in vrp_algo_params and vrp_algo_params["algo"] in ["bf", "aco", "sa", "ga"], "Invalid vrp json"
-    assert "algo" in tsp_algo_params and tsp_algo_params["algo"] in ["bf", "aco", "sa", "ga"], "Invalid tsp json"
+    assert "algo" in tsp_algo_params and tsp_algo_params["algo"] in ["bf", "dp", "aco", "sa", "ga"], "Invalid tsp json"
 
     vehicles_times = [0 for _ in range(m)]
     vehicles_routes = defaultdict(list)
+    vrp_sol = None
 
     while len(customers) > 0:
         min_vehicle_start_times = min(vehicles_times)
@@ -372,6 +403,8 @@ def solve_scenario(
             demands=demands,
             vehicles_start_times=vehicles_times,
             vrp_algo_params=vrp_algo_params,
+            # only the customers of the dispatched cycles are removed from the previous solution
+            warm_start=vrp_sol if warm_start else None,
         )
         print(f"vehicles_routes: {vehicles_routes}")
         print(f"vehicles_times: {vehicles_times}")
@@ -0,0 +1,32 @@
+import numpy as np
+
+from src.genetic_algorithm.crossover import CROSSOVER_METHODS, crossover, order_crossover, partially_mapped_crossover
+
+
+def test_children_keep_the_genes(batch: int = 50, customer_count: int = 12, depot_count: int = 3):
+    rng = np.random.default_rng(0)
+    genes = list(range(1, customer_count + 1)) + [0] * depot_count
+    parents_a = np.array([rng.permutation(genes) for _ in range(batch)])
+    parents_b = np.array([rng.permutation(genes) for _ in range(batch)])
+    for method in CROSSOVER_METHODS:
+        children = crossover(parents_a, parents_b, method, rng)
+        assert children.shape == parents_a.shape
+        for child in children.tolist():
+            assert sorted(child) == sorted(genes)
+
+
+def test_segment_of_the_first_parent_is_kept(length: int = 9):
+    parents_a = np.arange(length)[None, :]
+    parents_b = np.arange(length)[::-1][None, :]
+    for operator in (order_crossover, partially_mapped_crossover):
+        child = operator(parents_a, parents_b, np.random.default_rng(3))[0].tolist()
+        assert sorted(child) == list(range(length))
+        # at least one gene keeps the position of parent a, the remaining ones follow parent b
+        kept = [position for position in range(length) if child[position] == position]
+        assert len(kept) > 0
+    # identical parents produce the same tour in either direction
+    forward = list(range(length))
+    backward = [0] + forward[:0:-1]
+    for seed in range(5):
+        child = crossover(parents_a, parents_a, "erx", np.random.default_rng(seed))[0].tolist()
+        assert child in (forward, backward)
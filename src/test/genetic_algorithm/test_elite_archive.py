@@ -0,0 +1,25 @@
+from src.genetic_algorithm.TDVRP.elite_archive import EliteArchive
+from src.genetic_algorithm.TDVRP.population import Population
+
+
+def test_archive_keeps_the_best_distinct(capacity: int = 3):
+    archive = EliteArchive(capacity)
+    for duration in [50, 40, 30, 40, 20, 60, 10]:
+        archive.add(Population.from_lists([[0, duration, 0]], [duration], [duration * 2]))
+    assert len(archive) == capacity
+    population = archive.population()
+    assert population.durations.tolist() == [10, 20, 30]
+    assert [population.get_chromosome(idx) for idx in range(capacity)] == [[0, 10, 0], [0, 20, 0], [0, 30, 0]]
+
+
+def test_archive_repeats_the_copies(capacity: int = 4):
+    archive = EliteArchive(capacity)
+    best = Population.from_lists([[0, 1, 2, 0]], [10], [20])
+    for _ in range(3):
+        archive.add(best)
+    archive.add(Population.from_lists([[0, 2, 1, 0], [0, 1, 0, 2, 0]], [11, 12], [21, 22]))
+    # the chromosome is stored once, but the population keeps the weight of the copies up to the capacity
+    assert len(archive) == 3
+    assert archive.population().durations.tolist() == [10, 10, 10, 11]
+    archive.add(Population.from_lists([[0, 2, 0, 1, 0]], [9], [19]))
+    assert archive.population().durations.tolist() == [9, 10, 10, 10]
@@ -0,0 +1,64 @@
+import ast
+import pickle
+import random
+
+from src.genetic_algorithm.fitness_cache import FitnessCache
+from src.genetic_algorithm.TDVRP.genetic_algorithm_vrp import calculate_fitness
+from src.genetic_algorithm.TSP import genetic_algorithm_tsp
+from src.utilities.helper.cpu_helper import CpuBudget
+from src.utilities.helper.data_helper import get_based_and_load_data
+
+
+def test_fitness_cache_bound_and_counters(max_size: int = 3):
+    fitness_cache = FitnessCache(max_size)
+    for idx in range(5):
+        fitness_cache.put([0, idx, 0], idx)
+    assert fitness_cache.get([0, 0, 0]) is None
+    assert fitness_cache.get([0, 4, 0]) == 4
+    assert fitness_cache.stats()["entries"] == max_size
+    copied_cache = pickle.loads(pickle.dumps(fitness_cache))
+    copied_cache.put([0, 5, 0], 5)
+    fitness_cache.merge(copied_cache)
+    assert fitness_cache.get([0, 5, 0]) == 5
+    assert fitness_cache.get([0, 2, 0]) is None
+
+
+def test_cached_fitness(n: int = 10, m: int = 2, q: int = 5):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    demand_dict = {node: demand for node, demand in enumerate(load)}
+    fitness_cache = FitnessCache()
+    random.seed(0)
+    for _ in range(20):
+        chromosome = list(range(1, n + 1)) + [0]
+        random.shuffle(chromosome)
+        chromosome = [0] + chromosome + [0]
+        fitness = calculate_fitness(chromosome, [0] * m, duration, m, q, demand_dict)
+        assert calculate_fitness(chromosome, [0] * m, duration, m, q, demand_dict, fitness_cache) == fitness
+        assert calculate_fitness(chromosome, [0] * m, duration, m, q, demand_dict, fitness_cache) == fitness
+    assert fitness_cache.hits == 20 and fitness_cache.misses == 20
+
+
+def test_tsp_worker_caches_merged(monkeypatch, capsys, n: int = 8):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    demand_dict = {node: demand for node, demand in enumerate(load)}
+    monkeypatch.setattr(genetic_algorithm_tsp, "CPU_BUDGET", CpuBudget(2))
+    random.seed(0)
+    genetic_algorithm_tsp.run(
+        N=n,
+        M=1,
+        k=0,
+        q=n * n,
+        W=0,
+        duration=duration,
+        ist=[0],
+        multithreaded=True,
+        demand_dict=demand_dict,
+        start_node=0,
+        customer_list=list(range(1, n + 1)),
+        population_count=30,
+        iteration_count=3,
+    )
+    # the lookups of both workers are counted and their entries are kept for the next iterations
+    stats_line = [line for line in capsys.readouterr().out.splitlines() if line.startswith("GA TSP: fitness cache")][0]
+    stats = ast.literal_eval(stats_line[len("GA TSP: fitness cache ") :])
+    assert stats["misses"] > 0 and stats["hits"] > 0 and stats["entries"] > 0
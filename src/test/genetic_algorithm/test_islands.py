@@ -0,0 +1,96 @@
+import random
+import time
+
+from src.genetic_algorithm.fitness_cache import FitnessCache
+from src.genetic_algorithm.TDVRP.genetic_algorithm_vrp import ga
+from src.genetic_algorithm.TDVRP.islands import IslandPool, dominated_groups, migrate
+from src.genetic_algorithm.TDVRP.population import Population
+from src.utilities.helper.data_helper import get_based_and_load_data
+
+
+def test_ring_migration(migration_size: int = 2):
+    populations = [
+        Population.from_lists(
+            [[0, island, idx, 0] for idx in range(5)], [island * 10 + idx for idx in range(5)], [0] * 5
+        )
+        for island in range(3)
+    ]
+    migrated = migrate(populations, migration_size)
+    for island, population in enumerate(migrated):
+        assert len(population) == 5
+        sender = (island - 1) % 3
+        assert sorted(population.durations.tolist()[-migration_size:]) == [sender * 10, sender * 10 + 1]
+        assert island * 10 + 4 not in population.durations.tolist()
+
+
+def test_grouped_migration(migration_size: int = 1):
+    populations = [
+        Population.from_lists([[0] + [island] * (2 + island % 2) + [0]] * 3, [island, island + 1, island + 2], [0] * 3)
+        for island in range(4)
+    ]
+    migrated = migrate(populations, migration_size, groups=[0, 1, 0, 1])
+    # the islands of a group exchange their elites, the chromosome lengths of a group stay the same
+    assert sorted(migrated[0].durations.tolist()) == [0, 1, 2]
+    assert sorted(migrated[2].durations.tolist()) == [0, 2, 3]
+    assert sorted(migrated[1].durations.tolist()) == [1, 2, 3]
+    assert all(len(set(population.lengths.tolist())) == 1 for population in migrated)
+
+
+def test_dominated_groups():
+    inf = float("inf")
+    bests = {4: (100, 250), 5: (104, 240), 6: (120, 260), 7: (inf, inf)}
+    assert sorted(dominated_groups(bests, margin=0.05)) == [6, 7]
+    assert dominated_groups({4: (inf, inf), 5: (inf, inf)}) == []
+
+
+def island_ga_kwargs(n: int, demand_dict: dict) -> dict:
+    return dict(
+        N=n,
+        M=2,
+        k=3,
+        q=5,
+        W=0,
+        demand=demand_dict,
+        ist=[0, 0],
+        customer_list=list(range(1, n + 1)),
+        demand_dict=demand_dict,
+        population_count=20,
+    )
+
+
+def test_island_pool(n: int = 8, n_islands: int = 2, iterations: int = 3):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    demand_dict = {node: demand for node, demand in enumerate(load)}
+    ga_kwargs = island_ga_kwargs(n, demand_dict)
+    random.seed(0)
+    with IslandPool(n_islands, ga, duration, ga_kwargs, FitnessCache()) as island_pool:
+        results = island_pool.evolve(n_islands * [None], 0, iterations)
+        populations = migrate([population for population, _, _, _ in results], 2)
+        results = island_pool.evolve(populations, iterations, iterations)
+    assert len(results) == n_islands
+    for population, winners, (hits, misses), _ in results:
+        assert len(winners) == iterations
+        assert all(len(winner) == 1 for winner in winners)
+        assert winners[-1].durations[0] == population.durations.min()
+        assert hits + misses > 0
+
+
+def test_island_deadline(n: int = 8, iterations: int = 5):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    demand_dict = {node: demand for node, demand in enumerate(load)}
+    random.seed(0)
+    with IslandPool(1, ga, duration, island_ga_kwargs(n, demand_dict), FitnessCache()) as island_pool:
+        results = island_pool.evolve([None], 0, iterations, deadline=time.time())
+    # an island always runs its first iteration, so that it has a winner to report
+    assert [len(winners) for _, winners, _, _ in results] == [1]
+
+
+def test_island_kwargs(n: int = 8):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    demand_dict = {node: demand for node, demand in enumerate(load)}
+    random.seed(0)
+    with IslandPool(1, ga, duration, island_ga_kwargs(n, demand_dict), FitnessCache()) as island_pool:
+        results = island_pool.evolve([None, None], 0, 1, island_kwargs=[None, dict(k=5, population_count=30)])
+    # the random chromosomes of k cycles have k - 1 DEPOT nodes between the customers
+    assert results[0][0].lengths.max() == n + 2 + 2
+    assert results[1][0].lengths.max() == n + 2 + 4
@@ -0,0 +1,91 @@
+import math
+import random
+
+from src.genetic_algorithm.fitness_cache import FitnessCache
+from src.genetic_algorithm.TDVRP.genetic_algorithm_vrp import (
+    calculate_fitness,
+    deterministic_best_n_replacement,
+    evaluate_best,
+    evaluate_population,
+    packed_permutation,
+)
+from src.genetic_algorithm.TDVRP.population import Population
+from src.utilities.helper.data_helper import get_based_and_load_data
+from src.utilities.helper.surrogate_helper import SurrogateScreen
+
+
+def test_pending_individuals():
+    population = Population.from_lists([[0, 1, 2, 0], [0, 2, 1, 0], [0, 1, 2, 0]], [10, math.nan, 12], [0] * 3)
+    assert population.pending().tolist() == [1]
+    assert population.pending([0, 2, 2]).tolist() == []
+
+
+def test_lazy_evaluation_batch(n: int = 6):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    demand_dict = {node: demand for node, demand in enumerate(load)}
+    kwargs = dict(VST=[0, 0], dist_data=duration, M=2, Q=6, demand_dict=demand_dict)
+    chromosomes = [[0, 1, 2, 3, 0, 4, 5, 6, 0], [0, 6, 5, 4, 0, 3, 2, 1, 0], [0, 1, 2, 3, 0, 4, 5, 6, 0]]
+    population = Population.from_lists(chromosomes, [math.nan] * 3, [math.nan] * 3)
+    fitness_cache = FitnessCache()
+    evaluate_population(population, [0, 2], fitness_cache=fitness_cache, **kwargs)
+    # identical chromosomes of a batch are evaluated once, the others are left for later
+    assert fitness_cache.hits + fitness_cache.misses == 1
+    assert population.pending().tolist() == [1]
+    evaluate_population(population, fitness_cache=fitness_cache, **kwargs)
+    for idx, chromosome in enumerate(chromosomes):
+        assert (population.durations[idx], population.sum_durations[idx]) == calculate_fitness(chromosome, **kwargs)
+
+
+def test_screened_replacement(n: int = 8, population_count: int = 40):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    demand_dict = {node: demand for node, demand in enumerate(load)}
+    kwargs = dict(VST=[0, 0], dist_data=duration, M=2, Q=8, demand_dict=demand_dict)
+    random.seed(0)
+    chromosomes = []
+    for _ in range(population_count):
+        interior = list(range(1, n + 1)) + [0, 0]
+        random.shuffle(interior)
+        chromosomes.append([0] + interior + [0])
+    population = Population.from_lists(chromosomes, [math.nan] * population_count, [math.nan] * population_count)
+    expected = deterministic_best_n_replacement(evaluate_population(population.take(range(population_count)), **kwargs))
+    screen = SurrogateScreen(duration, 8, demand_dict, [0, 0])
+    evaluate_best(population, population_count // 2, screen, **kwargs)
+    # the individuals left unevaluated can not be among the best half
+    assert screen.screened == len(population.pending()) and screen.passed + screen.screened == population_count
+    survivors = deterministic_best_n_replacement(population)
+    assert survivors.durations.tolist() == expected.durations.tolist()
+    assert survivors.chromosomes.tolist() == expected.chromosomes.tolist()
+
+
+def test_packed_permutation(n: int = 12, q: int = 7):
+    duration, _ = get_based_and_load_data(None, n + 1, 5)
+    random.seed(0)
+    demand_dict = {node: random.randint(1, 4) if node != 0 else 0 for node in range(n + 1)}
+    customers = list(range(1, n + 1))
+    for k in [1, 3, 6, 9]:
+        for _ in range(10):
+            perm = packed_permutation(customers, k, q, demand_dict, duration)
+            assert perm[0] == perm[-1] == 0 and sorted(node for node in perm if node != 0) == customers
+            cycles, cycle = [], []
+            for node in perm[1:]:
+                if node == 0:
+                    cycles.append(cycle)
+                    cycle = []
+                else:
+                    cycle.append(node)
+            # the cycles are not empty, fit into the capacity and there are at least k of them
+            assert len(cycles) >= k and all(cycle for cycle in cycles)
+            assert all(sum(demand_dict[node] for node in cycle) <= q for cycle in cycles)
+            assert calculate_fitness(perm, [0, 0], duration, 2, q, demand_dict)[0] < math.inf
+
+
+def test_packed_permutation_cycle_count(n: int = 20, q: int = 6):
+    duration, _ = get_based_and_load_data(None, n + 1, 5)
+    customers = list(range(1, n + 1))
+    for seed in range(30):
+        random.seed(seed)
+        demand_dict = {node: random.randint(1, 3) if node != 0 else 0 for node in range(n + 1)}
+        for k in [8, 10]:
+            # k cycles with some spare capacity can carry the demands, so the packing does not open more of them
+            if sum(demand_dict.values()) <= k * q - 2:
+                assert packed_permutation(customers, k, q, demand_dict, duration).count(0) - 1 == k
@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+
+from src.genetic_algorithm.selection import (
+    SELECTION_METHODS,
+    proportional_weights,
+    random_indices,
+    rank_weights,
+    select_indices,
+    stochastic_universal_indices,
+)
+
+
+def test_random_indices_without_shared_state(size: int = 20, sel_count: int = 12):
+    first = random_indices(size, sel_count)
+    second = random_indices(size, sel_count)
+    assert len(first) == len(second) == sel_count
+    assert len(set(first.tolist())) == sel_count
+    kept = random_indices(size, sel_count, already_selected=[3, 3, 5])
+    assert kept[:3].tolist() == [3, 3, 5]
+    assert len(kept) == sel_count and 3 not in kept[3:] and 5 not in kept[3:]
+
+
+def test_selection_methods(size: int = 40, sel_count: int = 25):
+    durations = np.linspace(100, 500, size)
+    durations[-5:] = math.inf
+    for method in SELECTION_METHODS:
+        selected = select_indices(durations, sel_count, method)
+        assert len(selected) == sel_count
+        assert selected.min() >= 0 and selected.max() < size
+    # the shortest duration gets the biggest share, all the weights sum up to 1
+    for weights in (proportional_weights(durations), rank_weights(durations)):
+        assert math.isclose(weights.sum(), 1)
+        assert np.argmax(weights) == 0
+
+
+def test_stochastic_universal_sampling_spread(sel_count: int = 10):
+    weights = np.array([0.5, 0.25, 0.15, 0.1])
+    counts = np.bincount(stochastic_universal_indices(weights, sel_count), minlength=len(weights))
+    expected = weights * sel_count
+    assert np.all(counts >= np.floor(expected)) and np.all(counts <= np.ceil(expected))
+
+
+def test_lazy_evaluation(size: int = 30, sel_count: int = 10):
+    durations = np.random.default_rng(2).random(size)
+    for method in SELECTION_METHODS:
+        requested = set()
+
+        def evaluate(indices):
+            requested.update(np.ravel(indices).tolist())
+            return durations[indices]
+
+        expected = select_indices(durations, sel_count, method, np.random.default_rng(5))
+        selected = select_indices(np.full(size, np.nan), sel_count, method, np.random.default_rng(5), evaluate)
+        assert selected.tolist() == expected.tolist()
+        if method == "random":
+            assert len(requested) == 0
+        elif method == "tournament":
+            assert requested.issuperset(selected.tolist()) and len(requested) <= 2 * sel_count
+        else:
+            assert len(requested) == size
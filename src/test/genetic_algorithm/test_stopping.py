@@ -0,0 +1,31 @@
+import time
+
+from src.genetic_algorithm.stopping import StoppingRules
+from src.genetic_algorithm.TDVRP.population import Population
+
+
+def test_stall_rule(stall_generations: int = 3):
+    rules = StoppingRules(stall_generations=stall_generations)
+    assert not rules.update(10)
+    assert not rules.update(9)
+    for _ in range(stall_generations - 1):
+        assert not rules.update(9)
+    assert rules.update(9.5)
+    assert rules.fired == "stall"
+    assert rules.summary() == f"stall after {stall_generations + 2} generations"
+
+
+def test_first_rule_is_kept():
+    rules = StoppingRules(diversity_floor=0.5, deadline=time.time() - 1)
+    assert not rules.check_diversity(0.6)
+    assert rules.check_deadline()
+    assert rules.check_diversity(0.1)
+    assert rules.fired == "time_limit"
+    assert StoppingRules().summary() == "iterations after 0 generations"
+
+
+def test_population_diversity():
+    same = Population.from_lists([[0, 1, 2, 3, 0]] * 4, [1] * 4, [1] * 4)
+    assert same.diversity() == 0
+    mixed = Population.from_lists([[0, 1, 2, 3, 0], [0, 3, 2, 1, 0]], [1, 2], [1, 2])
+    assert mixed.diversity() == 0.2
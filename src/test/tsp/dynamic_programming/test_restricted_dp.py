@@ -0,0 +1,26 @@
+from src.tsp.brute_force.brute_force import solve as solve_bf
+from src.tsp.dynamic_programming.restricted_dp import solve
+from src.utilities.helper.data_helper import get_based_and_load_data
+from src.utilities.helper.tsp_helper import route_solution_to_arrivals
+
+EPS = 1e-6
+
+
+def test_exact_dp_matches_brute_force(n: int = 8, current_time: float = 3600):
+    duration, load = get_based_and_load_data(None, n, 5)
+    customers = [i for i in range(1, n)]
+    bf_time, _ = solve_bf(current_time, 0, customers, duration, load, False, True, [1])
+    dp_time, dp_route = solve(current_time, 0, customers, duration, load, True, [1], beam_width=None)
+    assert abs(bf_time - dp_time) < EPS
+    _, route_time = route_solution_to_arrivals(current_time, dp_route, duration, load, True, [1])
+    assert abs(route_time - dp_time) < EPS
+
+
+def test_beam_route(n: int = 20, current_location: int = 5, beam_width: int = 10):
+    duration, load = get_based_and_load_data(None, n, 5)
+    customers = [i for i in range(1, n) if i != current_location]
+    dp_time, dp_route = solve(0, current_location, customers, duration, load, True, [], beam_width=beam_width)
+    assert dp_route[0] == current_location and dp_route[-1] == 0
+    assert sorted(dp_route[1:-1]) == customers
+    _, route_time = route_solution_to_arrivals(0, dp_route, duration, load, True, [])
+    assert abs(route_time - dp_time) < EPS
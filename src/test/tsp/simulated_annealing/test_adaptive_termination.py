@@ -0,0 +1,131 @@
+from typing import List, Tuple
+
+import pytest
+
+from src.tsp.simulated_annealing import simulated_annealing as sa
+from src.utilities.helper.data_helper import get_based_and_load_data
+from src.utilities.helper.tsp_helper import route_solution_to_arrivals
+
+TOUR = [4, 1, 2, 3, 0]
+TOUR_DURATION = 1000.0
+INIT_TEMPERATURE = 100.0
+
+
+def get_fake_iterations(
+    steps: List[dict], n_uphill: int, n_uphill_accepted: int, improvement: float
+):  # Records each step of the annealing instead of running it, with a fixed acceptance and improvement per step
+    def fake_iterations(**kwargs) -> Tuple[float, List[int], float, List[int], int, int]:
+        steps.append(kwargs)
+        best_tour_duration = kwargs["best_tour_duration"] - improvement
+        best_tour = kwargs["tour"][:1] + kwargs["tour"][1:-1][::-1] + kwargs["tour"][-1:]
+        return kwargs["tour_duration"], kwargs["tour"], best_tour_duration, best_tour, n_uphill, n_uphill_accepted
+
+    return fake_iterations
+
+
+def run_adaptive(**kwargs) -> Tuple[float, List[int]]:
+    params = dict(
+        duration=[],
+        load=[],
+        do_loading_unloading=False,
+        cancelled_customers=[],
+        tour=TOUR,
+        tour_duration=TOUR_DURATION,
+        init_temperature=INIT_TEMPERATURE,
+        threshold=10,
+        n_iterations=100,
+        cooling=0.9,
+        termination="adaptive",
+        neighborhood="2-opt",
+        start_time=0,
+    )
+    params.update(kwargs)
+    return sa.simulated_annealing(**params)
+
+
+@pytest.mark.parametrize("n_uphill_accepted", [0, 50, 100])
+def test_adaptive_acceptance(monkeypatch, n_uphill_accepted: int, target_acceptance: float = 0.5):
+    steps = []
+    monkeypatch.setattr(
+        sa, "simulated_annealing_iterations", get_fake_iterations(steps, 100, n_uphill_accepted, improvement=1)
+    )
+    run_adaptive(target_acceptance=target_acceptance, max_evaluations=2000)
+    temperatures = [step["temperature"] for step in steps]
+    assert len(temperatures) == 20 and temperatures[0] == INIT_TEMPERATURE
+    target = target_acceptance
+    for temperature, next_temperature in zip(temperatures, temperatures[1:]):
+        target *= 0.9
+        # The temperature rises while fewer uphill moves are accepted than targeted and falls otherwise
+        if n_uphill_accepted / 100 < target:
+            assert next_temperature > temperature
+        else:
+            assert next_temperature < temperature
+        assert next_temperature == pytest.approx(
+            temperature * sa.math.exp(sa.ADAPTIVE_GAIN * (target - n_uphill_accepted / 100))
+        )
+
+
+def test_adaptive_reheat(monkeypatch, threshold: int = 10, reheat_after: int = 3):
+    steps = []
+    monkeypatch.setattr(sa, "simulated_annealing_iterations", get_fake_iterations(steps, 100, 100, improvement=0))
+    best_tour_duration, best_tour = run_adaptive(threshold=threshold, reheat_after=reheat_after)
+    assert best_tour_duration == TOUR_DURATION
+    # Stops when the best tour does not improve for threshold steps
+    assert len(steps) == threshold
+    for step_idx, step in enumerate(steps):
+        if step_idx > 0 and step_idx % reheat_after == 0:
+            # Restarts from the best tour with a temperature reheated from the initial one
+            n_reheats = step_idx // reheat_after
+            assert step["temperature"] == INIT_TEMPERATURE * sa.REHEAT_RATIO**n_reheats
+            assert step["tour"] == step["best_tour"]
+        elif step_idx > 0:
+            assert step["temperature"] < steps[step_idx - 1]["temperature"]
+
+
+def test_adaptive_reheat_after_improvement(monkeypatch, reheat_after: int = 3):
+    steps = []
+    monkeypatch.setattr(sa, "simulated_annealing_iterations", get_fake_iterations(steps, 100, 100, improvement=1))
+    run_adaptive(threshold=1, reheat_after=reheat_after, max_evaluations=1000)
+    # The best tour improves in each step, so the search is never reheated
+    temperatures = [step["temperature"] for step in steps]
+    assert len(temperatures) == 10
+    assert all(b < a for a, b in zip(temperatures, temperatures[1:]))
+
+
+def test_adaptive_max_evaluations(monkeypatch, max_evaluations: int = 250):
+    steps = []
+    monkeypatch.setattr(sa, "simulated_annealing_iterations", get_fake_iterations(steps, 100, 50, improvement=1))
+    run_adaptive(max_evaluations=max_evaluations)
+    assert [step["n_iterations"] for step in steps] == [100, 100, 50]
+
+
+def test_adaptive_time_limit(monkeypatch):
+    steps = []
+    monkeypatch.setattr(sa, "simulated_annealing_iterations", get_fake_iterations(steps, 100, 50, improvement=1))
+    run_adaptive(time_limit=0)
+    assert len(steps) == 1
+
+
+def test_adaptive_limits_run(n: int = 15, start_node: int = 4, start_time: float = 3000, max_evaluations: int = 500):
+    duration, load = get_based_and_load_data(None, n, 5)
+    customers = [i for i in range(1, n) if i != start_node]
+    for limits in [dict(max_evaluations=max_evaluations), dict(time_limit=0.1)]:
+        route_time, route = sa.solve(
+            start_time=start_time,
+            start_node=start_node,
+            customers=customers,
+            duration=duration,
+            load=load,
+            do_loading_unloading=True,
+            cancelled_customers=[],
+            threshold=10**9,
+            n_iterations=100,
+            alpha=0.1,
+            cooling=0.9,
+            init="random",
+            termination="adaptive",
+            neighborhood="2-opt",
+            **limits,
+        )
+        assert route[0] == start_node and route[-1] == 0 and sorted(route[1:-1]) == customers
+        assert route_solution_to_arrivals(start_time, route, duration, load, True, [])[1] == route_time
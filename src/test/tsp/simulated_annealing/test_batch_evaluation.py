@@ -0,0 +1,76 @@
+import numpy as np
+
+from src.tsp.simulated_annealing.simulated_annealing_helper import (
+    NEIGHBORHOODS,
+    evaluate_batch_tours,
+    evaluate_tour_from,
+    get_batch_2opt_tours,
+    get_batch_3opt_tours,
+    get_batch_exchange_tours,
+    get_batch_or_opt_tours,
+    get_random_batch_neighbors,
+    get_random_neighbor,
+    update_tour_with_2opt,
+    update_tour_with_3opt,
+    update_tour_with_exchange,
+    update_tour_with_or_opt,
+)
+from src.utilities.helper.data_helper import get_based_and_load_data
+from src.utilities.helper.tsp_helper import get_service_time, route_departure_times, route_solution_to_arrivals
+
+
+def test_batch_evaluation(n: int = 20, start_node: int = 4, start_time: float = 3000, batch_size: int = 50):
+    duration, load = get_based_and_load_data(None, n, 5)
+    cancelled_customers = [2]
+    tour = [start_node] + [i for i in range(1, n) if i not in [start_node, 2]] + [0]
+    cancelled_load = load[2]
+    service_times = np.array([get_service_time(node, load, cancelled_load) for node in range(n)])
+    departures = np.array(route_departure_times(start_time, tour, duration, load, True, cancelled_customers))
+    rng = np.random.default_rng(0)
+    i = rng.integers(0, len(tour) - 3, batch_size)
+    j = rng.integers(i + 2, len(tour) - 1)
+    for get_batch_tours, update_tour in [
+        (get_batch_2opt_tours, update_tour_with_2opt),
+        (get_batch_exchange_tours, update_tour_with_exchange),
+    ]:
+        i_move = np.maximum(i, 1) if update_tour is update_tour_with_exchange else i
+        new_tours, first_changed = get_batch_tours(np.array(tour), i_move, j)
+        times = evaluate_batch_tours(new_tours, first_changed, departures, np.array(duration), service_times)
+        for k in range(batch_size):
+            new_tour = update_tour(tour, i_move[k], j[k])
+            assert new_tours[k].tolist() == new_tour
+            _, route_time = route_solution_to_arrivals(start_time, new_tour, duration, load, True, cancelled_customers)
+            assert times[k] == route_time
+
+
+def test_random_neighbors(n: int = 20, start_node: int = 4, start_time: float = 3000, batch_size: int = 50):
+    duration, load = get_based_and_load_data(None, n, 5)
+    tour = [start_node] + [i for i in range(1, n) if i != start_node] + [0]
+    departures = route_departure_times(start_time, tour, duration, load, True, [])
+    service_times = [get_service_time(node, load, 0) for node in range(n)]
+    for neighborhood in NEIGHBORHOODS:
+        for _ in range(batch_size):
+            new_tour, first_changed = get_random_neighbor(tour, neighborhood)
+            assert sorted(new_tour) == sorted(tour) and new_tour[0] == start_node and new_tour[-1] == 0
+            assert new_tour[:first_changed] == tour[:first_changed]
+            _, route_time = route_solution_to_arrivals(start_time, new_tour, duration, load, True, [])
+            assert evaluate_tour_from(new_tour, first_changed, departures, duration, service_times) == route_time
+        new_tours, first_changed = get_random_batch_neighbors(np.array(tour), neighborhood, batch_size)
+        for new_tour, first_changed_position in zip(new_tours.tolist(), first_changed):
+            assert sorted(new_tour) == sorted(tour) and new_tour[0] == start_node and new_tour[-1] == 0
+            assert new_tour[:first_changed_position] == tour[:first_changed_position]
+
+
+def test_batch_or_opt_and_3opt(n: int = 9):
+    tour = list(range(n))[::-1]
+    for i in range(1, n - 1):
+        for j in range(i, n - 1):
+            for k in list(range(i - 1)) + list(range(j + 1, n - 1)):
+                for reverse in [False, True]:
+                    new_tours, _ = get_batch_or_opt_tours(
+                        np.array(tour), np.array([i]), np.array([j]), np.array([k]), np.array([reverse])
+                    )
+                    assert new_tours[0].tolist() == update_tour_with_or_opt(tour, i, j, k, reverse)
+            for k in range(j + 1, n - 1):
+                new_tours, _ = get_batch_3opt_tours(np.array(tour), np.array([i]), np.array([j]), np.array([k]))
+                assert new_tours[0].tolist() == update_tour_with_3opt(tour, i, j, k)
@@ -0,0 +1,43 @@
+from src.utilities.helper.cpu_helper import CpuBudget, get_available_cpu_count, get_cgroup_cpu_limit
+
+
+def test_cgroup_cpu_limit(tmp_path):
+    assert get_cgroup_cpu_limit(str(tmp_path)) is None
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert get_cgroup_cpu_limit(str(tmp_path)) is None
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("250000\n")
+    assert get_cgroup_cpu_limit(str(tmp_path)) == 2.5
+    # cgroup v2 takes precedence
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert get_cgroup_cpu_limit(str(tmp_path)) is None
+    (tmp_path / "cpu.max").write_text("50000 100000\n")
+    assert get_cgroup_cpu_limit(str(tmp_path)) == 0.5
+    assert get_available_cpu_count(str(tmp_path)) == 1
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert get_available_cpu_count(str(tmp_path)) == 1
+
+
+def test_cpu_budget():
+    cpu_budget = CpuBudget(4)
+    with cpu_budget.grant() as cores:
+        assert cores == 4 and cpu_budget.free_cores() == 0
+        # a concurrent run still gets a core of its own
+        with cpu_budget.grant() as concurrent_cores:
+            assert concurrent_cores == 1
+    assert cpu_budget.free_cores() == 4
+    assert cpu_budget.acquire(3) == 3
+    assert cpu_budget.acquire() == 1
+    cpu_budget.release(3)
+    assert cpu_budget.acquire(5) == 3
+
+
+def test_cpu_budget_released_on_failure():
+    cpu_budget = CpuBudget(3)
+    try:
+        with cpu_budget.grant():
+            raise AssertionError("failing run")
+    except AssertionError:
+        pass
+    assert cpu_budget.free_cores() == 3
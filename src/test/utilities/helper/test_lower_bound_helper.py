@@ -0,0 +1,70 @@
+import itertools
+import random
+
+from src.tsp.brute_force.brute_force import calculate_duration, solve
+from src.utilities.helper.data_helper import get_based_and_load_data
+from src.utilities.helper.lower_bound_helper import (
+    get_assignment_bound,
+    get_gap,
+    get_min_duration_matrix,
+    get_perm_lower_bound,
+    get_tsp_lower_bound,
+)
+from src.vrp.brute_force import brute_force as vrp_brute_force
+
+EPS = 1e-6
+INF = float("inf")
+
+
+def test_assignment_bound():
+    cost = [[4, 1, 3], [2, 0, 5], [3, 2, 2]]
+    assert get_assignment_bound(cost) == 5
+    cost = [[INF, 1], [1, INF]]
+    assert get_assignment_bound(cost) == 2
+
+
+def test_tsp_lower_bound_and_pruning(n: int = 8, current_time: float = 3600):
+    duration, load = get_based_and_load_data(None, n, 5)
+    for current_location in [0, 3]:
+        customers = [i for i in range(1, n) if i != current_location]
+        best_route_time, best_route = INF, None
+        for perm in itertools.permutations(customers):
+            route_time, route = calculate_duration(
+                current_time, current_location, list(perm), duration, load, False, True, []
+            )
+            if route_time < best_route_time:
+                best_route_time, best_route = route_time, route
+        lower_bound = get_tsp_lower_bound(current_time, current_location, customers, duration, load, True, [])
+        assert lower_bound <= best_route_time + EPS
+        route_time, route = solve(current_time, current_location, customers, duration, load, False, True, [])
+        assert route == best_route and abs(route_time - best_route_time) < EPS
+        route_time, _ = solve(current_time, current_location, customers, duration, load, False, True, [], gap=0.5)
+        assert get_gap(route_time, lower_bound) <= 0.5 or abs(route_time - best_route_time) < EPS
+
+
+def test_perm_lower_bound_and_screening(n: int = 6, q: int = 5):
+    duration, load = get_based_and_load_data(None, n, 5)
+    min_duration = get_min_duration_matrix(duration)
+    vehicles_start_times = [0, 1800]
+    random.seed(0)
+    for _ in range(200):
+        perm = list(range(1, n)) + [0, 0]
+        random.shuffle(perm)
+        route_max_time, route_sum_time, _, _ = vrp_brute_force.calculate_duration_perm(
+            q, False, perm, duration, load, vehicles_start_times
+        )
+        max_bound, sum_bound = get_perm_lower_bound(perm, q, min_duration, load, vehicles_start_times)
+        assert max_bound <= route_max_time + EPS and sum_bound <= route_sum_time + EPS
+    for objective_func_type in ["min_max_time", "min_sum_time"]:
+        kwargs = dict(
+            k=3,
+            q=q,
+            ignore_long_trip=False,
+            duration=duration,
+            load=load,
+            customers=list(range(1, n)),
+            vehicles_start_times=vehicles_start_times,
+            objective_func_type=objective_func_type,
+        )
+        result = vrp_brute_force.solve(surrogate_screening=True, **kwargs)
+        assert result == vrp_brute_force.solve(surrogate_screening=False, **kwargs)
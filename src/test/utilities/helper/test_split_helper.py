@@ -0,0 +1,61 @@
+import random
+
+from src.genetic_algorithm.TDVRP.genetic_algorithm_vrp import helper
+from src.utilities.helper.data_helper import get_based_and_load_data
+from src.utilities.helper.split_helper import INF, split, split_single_vehicle
+
+N = 7
+
+
+def best_cut_points(duration, demand_dict, q, order, vehicles_start_times):
+    best = (INF, INF)
+    for mask in range(1 << (len(order) - 1)):
+        cycles = []
+        cycle = [order[0]]
+        for idx in range(1, len(order)):
+            if mask >> (idx - 1) & 1:
+                cycles.append([0] + cycle + [0])
+                cycle = []
+            cycle.append(order[idx])
+        cycles.append([0] + cycle + [0])
+        route_max_time, route_sum_time, _, _ = helper(
+            q=q,
+            m=len(vehicles_start_times),
+            ignore_long_trip=False,
+            cycles=cycles,
+            duration=duration,
+            vehicles_start_times=vehicles_start_times,
+            demand_dict=demand_dict,
+        )
+        best = min(best, (route_max_time, route_sum_time))
+    return best
+
+
+def test_split_finds_the_best_cut_points():
+    duration, load = get_based_and_load_data(None, N + 1, 5)
+    demand_dict = {node: demand for node, demand in enumerate(load)}
+    random.seed(0)
+    for _ in range(10):
+        order = random.sample(range(1, N + 1), N)
+        q = random.choice([5, 8, 12])
+        vehicles_start_times = [0, 0, 0][: random.choice([1, 2, 3])]
+        expected = best_cut_points(duration, demand_dict, q, order, vehicles_start_times)
+        route_max_time, route_sum_time, vehicle_routes, _ = split(
+            duration, demand_dict, q, order, vehicles_start_times, max_labels=10**6
+        )
+        assert (route_max_time, route_sum_time) == expected
+        cycles = [cycle for vehicle_id in sorted(vehicle_routes) for cycle in vehicle_routes[vehicle_id]]
+        assert sorted(node for cycle in cycles for node in cycle if node != 0) == sorted(order)
+        assert all(sum(demand_dict[node] for node in cycle) <= q for cycle in cycles)
+
+        end_time, cycles = split_single_vehicle(duration, demand_dict, q, order)
+        assert end_time == best_cut_points(duration, demand_dict, q, order, [0])[0]
+        assert [node for cycle in cycles for node in cycle if node != 0] == order
+
+
+def test_split_infeasible_customer():
+    duration, load = get_based_and_load_data(None, N + 1, 5)
+    demand_dict = {node: demand for node, demand in enumerate(load)}
+    q = max(load) - 1
+    assert split(duration, demand_dict, q, list(range(1, N + 1)), [0, 0]) == (INF, INF, None, None)
+    assert split_single_vehicle(duration, demand_dict, q, list(range(1, N + 1))) == (INF, [])
@@ -1,4 +1,4 @@
-from src.utilities.helper.vrp_helper import complete_solution_to_arrivals
+from src.utilities.helper.vrp_helper import complete_solution_to_arrivals, remaining_solution, solution_to_permutation
 
 N_TIME_ZONES = 12  # hours = time slices
 N = 9
@@ -19,3 +19,20 @@ def test_solution_to_arrivals():
         duration.append(duration_src)
     arrivals = complete_solution_to_arrivals(vehicles_start_times, solution, duration)
     assert arrivals == expected_arrivals
+
+
+def test_warm_start_permutation():
+    solution = {0: [[0, 1, 2, 0], [0, 3, 4, 0]], 1: [[0, 5, 6, 0]], 2: [[0, 7, 0], [0, 8, 0]]}
+    # the first cycles of the vehicles 0 and 2 are dispatched and the customer 6 is cancelled
+    customers = [3, 4, 5, 8, 9]
+    assert remaining_solution(solution, customers) == {0: [[0, 3, 4, 0]], 1: [[0, 5, 0]], 2: [[0, 8, 0]]}
+    # the cycles are ordered by the start times of the vehicles, the missing customer is visited in an extra cycle
+    load = [0] + 12 * [1]
+    perm = solution_to_permutation(solution, customers, [30, 10, 20], load, 5)
+    assert perm == [0, 5, 0, 8, 0, 3, 4, 0, 9, 0]
+    # the longest cycles are cut until there are k cycles
+    assert solution_to_permutation(solution, [3, 4, 5], [30, 10, 20], load, 5, k=3) == [0, 5, 0, 3, 0, 4, 0]
+    # the missing customers are split into cycles that fit into the capacity
+    load = [0, 1, 1, 2, 2, 1, 1, 1, 1, 3, 2, 2, 1]
+    perm = solution_to_permutation(solution, [3, 4, 9, 10, 11, 12], [30, 10, 20], load, 5)
+    assert perm == [0, 3, 4, 0, 9, 10, 0, 11, 12, 0]
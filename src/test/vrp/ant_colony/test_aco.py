@@ -1,7 +1,7 @@
 from typing import List
 
 from collections import defaultdict
-from src.vrp.ant_colony.aco_hybrid import solve
+from src.vrp.ant_colony.aco_hybrid import run_request, solve
 from src.utilities.helper.data_helper import get_based_and_load_data, get_mapbox_and_load_data
 
 EPS = 1e-6
@@ -111,3 +111,17 @@ def test_aco_long_trip_vehicles_start_times(n=26, m=3, k=5, q=5, per_km_time=1):
         vehicles_start_times=vehicles_start_times,
     )
     assert not results
+
+
+def test_aco_request_gap(n=11, q=5):
+    duration, load = get_based_and_load_data(None, n, 5)
+    result = run_request(
+        q=q,
+        duration=duration,
+        load=load,
+        available_customers=list(range(1, n)),
+        vehicles_start_times=[0, 100],
+        n_hyperparams=5,
+    )
+    assert result["lower_bound"] <= result["route_max_time"]
+    assert result["gap"] == (result["route_max_time"] - result["lower_bound"]) / result["route_max_time"]
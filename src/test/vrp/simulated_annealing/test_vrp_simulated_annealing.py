@@ -0,0 +1,122 @@
+import io
+import random
+
+import numpy as np
+
+from src.utilities.helper.data_helper import get_based_and_load_data
+from src.vrp.sa.progress_tracer import ProgressTracer
+from src.vrp.sa.simulated_annealing import (
+    OPERATORS,
+    RandomStream,
+    ReplicaPool,
+    anneal,
+    apply_move,
+    generate_random_initial_solution,
+    longest_plans,
+    plan_cost,
+    solution_cost_max,
+    solution_plan_costs,
+    solve,
+    undo_move,
+)
+
+
+def test_moves_in_place(n: int = 12, vehicle_count: int = 3, vehicle_capacity: int = 6):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    np.random.seed(0)
+    random.seed(0)
+    solution = generate_random_initial_solution(n, vehicle_count, 3)
+    stream = RandomStream()
+    for _ in range(200):
+        plan_costs = solution_plan_costs(duration, load, vehicle_capacity, solution)
+        longest = longest_plans(plan_costs)
+        accepted_move = None
+        for operator in OPERATORS:
+            before = [plan.copy() for plan in solution]
+            proposal = operator(duration, load, vehicle_capacity, solution, plan_costs, longest, stream)
+            assert solution == before
+            if proposal is None:
+                continue
+            new_cost, move, _, _ = proposal
+            apply_move(solution, move)
+            assert new_cost == solution_cost_max(duration, load, vehicle_capacity, solution)
+            undo_move(solution, move)
+            assert solution == before
+            accepted_move = move
+        if accepted_move is not None:
+            apply_move(solution, accepted_move)
+
+
+def test_parallel_tempering(n: int = 10):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    locations = [{"lat": idx, "lng": 0, "demand": demand} for idx, demand in enumerate(load)]
+    np.random.seed(0)
+    random.seed(0)
+    result = solve(duration, locations, n, 2, 10, 3, 1000, 0.99, 20, 500, 2, [3], replicas=3, exchange_interval=100)
+    visited = [node["lat"] for vehicle in result["vehicles"] for node in vehicle["tours"] if node["lat"] != 0]
+    assert result["durationMax"] < 999999
+    assert result["lowerBound"] <= result["durationMax"] and 0 <= result["gap"] < 1
+    assert sorted(visited) == [idx for idx in range(1, n + 1) if idx != 3]
+
+
+def test_adaptive_operator_selection(n: int = 12, vehicle_capacity: int = 6):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    np.random.seed(0)
+    random.seed(0)
+    initial_solution = generate_random_initial_solution(n, 3, 3)
+    result = anneal(
+        np.array(duration), load, vehicle_capacity, initial_solution, 1000, 0.99, 20, 600, operator_selection="adaptive"
+    )
+    assert result["sol_max"] == int(solution_cost_max(duration, load, vehicle_capacity, result["plans"]))
+    operator_stats = result["operator_stats"]
+    assert sum(stats["selected"] for stats in operator_stats.values()) == 600
+    assert all(stats["evaluations"] <= 2 * stats["selected"] for stats in operator_stats.values())
+    assert sum(stats["improvements"] for stats in operator_stats.values()) > 0
+
+
+def test_progress_tracer(n: int = 12, vehicle_capacity: int = 6):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    np.random.seed(0)
+    random.seed(0)
+    initial_solution = generate_random_initial_solution(n, 3, 3)
+    streamed = []
+    file = io.StringIO()
+    tracer = ProgressTracer(capacity=4, stride=50, callback=lambda *sample: streamed.append(sample), file=file)
+    result = anneal(np.array(duration), load, vehicle_capacity, initial_solution, 1000, 0.99, 20, 400, tracer=tracer)
+    trace = result["trace"]
+    assert [sample[0] for sample in streamed] == list(range(0, 401, 50))
+    assert trace["iterations"] == [250, 300, 350, 400]
+    assert int(trace["bests"][-1]) == result["sol_max"]
+    assert len(file.getvalue().splitlines()) == len(streamed)
+
+
+def test_split_decoder(n: int = 10, vehicle_capacity: int = 6):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    locations = [{"lat": idx, "lng": 0, "demand": demand} for idx, demand in enumerate(load)]
+    np.random.seed(0)
+    random.seed(0)
+    for plan in generate_random_initial_solution(n, 2, 3):
+        # the best warehouse visits of the customer order are never worse than the ones of the plan
+        assert plan_cost(duration, load, vehicle_capacity, plan, "split") <= plan_cost(
+            duration, load, vehicle_capacity, plan
+        )
+    result = solve(duration, locations, n, 2, vehicle_capacity, 3, 1000, 0.99, 20, 300, 1, [3], decoder="split")
+    visited = [node["lat"] for vehicle in result["vehicles"] for node in vehicle["tours"] if node["lat"] != 0]
+    assert result["durationMax"] < 999999
+    assert sorted(visited) == [idx for idx in range(1, n + 1) if idx != 3]
+
+
+def test_replica_pool(n: int = 10, vehicle_capacity: int = 6):
+    duration, load = get_based_and_load_data(None, n + 1, 5)
+    np.random.seed(0)
+    random.seed(0)
+    states = [generate_random_initial_solution(n, 2, 3) for _ in range(3)]
+    results = []
+    for n_processes in [1, 2]:
+        np.random.seed(1)
+        # the worker processes read the duration matrix from shared memory and keep it across the exchange rounds
+        with ReplicaPool(n_processes, np.array(duration), load, vehicle_capacity) as replica_pool:
+            first_round = replica_pool.anneal(states, [100, 10, 1], 50)
+            second_round = replica_pool.anneal([result["current_plans"] for result in first_round], [100, 10, 1], 50)
+        results.append([result["current_plans"] for result in second_round])
+    assert results[0] == results[1]
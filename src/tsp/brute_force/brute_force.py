@@ -1,4 +1,3 @@
-import itertools
 from datetime import datetime
 from typing import Dict, List, Literal, Optional, Tuple
 from src.utilities.helper.data_helper import (
@@ -6,6 +5,8 @@ from src.utilities.helper.data_helper import (
     get_google_and_load_data,
     get_mapbox_and_load_data,
 )
+from src.utilities.helper.lower_bound_helper import get_gap, get_min_arrival_costs, get_tsp_lower_bound
+from src.utilities.helper.tsp_helper import get_service_time, get_start_service_time
 
 INF = float("inf")
 N_TIME_ZONES = 12  # hours = time slices
@@ -23,6 +24,8 @@ UNLOADING_DEPOT_TIME_PER_UNIT = 10
 UNLOADING_CUSTOMER_TIME_INIT = 60
 UNLOADING_CUSTOMER_TIME_PER_UNIT = 10
 
+BOUND_TOLERANCE = 1e-6
+
 
 def calculate_duration(
     current_time: float,
@@ -92,9 +95,14 @@ def solve(
     ignore_long_trip: bool,
     do_loading_unloading: bool,
     cancelled_customers: List[int],
+    gap: float = 0,
+    lower_bound: Optional[float] = None,
 ) -> Tuple[float, Optional[List[int]]]:
     """
-    Calculates total time it takes to visit the locations and the route for the optimal solution
+    Calculates total time it takes to visit the locations and the route for the optimal solution. The orders of
+        customers are enumerated with a depth-first search in the same order as itertools.permutations and a partial
+        order is pruned if its time plus a lower bound on the time needed to visit the remaining customers can not
+        improve the incumbent. The search stops early once the incumbent is within the given gap of the lower bound.
 
     :param current_time: Current time
     :param current_location: Current (starting) location
@@ -104,25 +112,72 @@ def solve(
     :param ignore_long_trip: Flag to ignore long trips
     :param do_loading_unloading: ...
     :param cancelled_customers: ...
+    :param gap: Accepted relative gap between the returned and the optimal route time, 0 to find the optimal solution
+    :param lower_bound: Lower bound on the route time of the instance, calculated if not given
     :return: Total time it takes to visit the locations and the route for the optimal solution
     """
     assert current_location < len(duration), "Current location should be in the fetched duration data"
+    assert 0 <= gap < 1, "Gap should be in [0, 1)"
     start_time = datetime.now()
-    best_route_time, best_route = INF, None
-    for perm in itertools.permutations(customers):
-        route_time, route = calculate_duration(
+    if lower_bound is None:
+        lower_bound = get_tsp_lower_bound(
             current_time=current_time,
             current_location=current_location,
-            perm=list(perm),
+            customers=customers,
             duration=duration,
             load=load,
-            ignore_long_trip=ignore_long_trip,
             do_loading_unloading=do_loading_unloading,
             cancelled_customers=cancelled_customers,
         )
-        if route_time < best_route_time:
-            best_route = route
-            best_route_time = route_time
+
+    cancelled_load = sum(load[customer] for customer in cancelled_customers)
+    route_load = load[current_location] + load[DEPOT] + sum(load[customer] for customer in customers)
+    min_costs = get_min_arrival_costs([current_location] + customers + [DEPOT], duration, load, cancelled_load)
+    current_time += get_start_service_time(current_location, route_load, load, do_loading_unloading)
+
+    n_customers = len(customers)
+    perm = []
+    visited = [False for _ in range(n_customers)]
+    best = [INF, None]
+
+    def search(node_time: float, last_node: int, remaining_bound: float) -> bool:
+        # Returns True if the incumbent is within the gap and the search should stop
+        if len(perm) == n_customers:
+            hour = int(node_time / TIME_UNITS)
+            if not ignore_long_trip:
+                hour = min(hour, N_TIME_ZONES - 1)
+            if hour >= N_TIME_ZONES:
+                return False
+            route_time = node_time + duration[last_node][DEPOT][hour] + get_service_time(DEPOT, load, cancelled_load)
+            if ignore_long_trip and route_time >= N_TIME_ZONES * TIME_UNITS:
+                return False
+            if route_time < best[0]:
+                best[0], best[1] = route_time, [current_location] + perm + [DEPOT]
+                return get_gap(route_time, lower_bound) <= gap
+            return False
+        # Small tolerance so that the floating point sums of the bound never prune an improving order
+        if node_time + remaining_bound - BOUND_TOLERANCE >= best[0] * (1 - gap):
+            return False
+        hour = int(node_time / TIME_UNITS)
+        if not ignore_long_trip:
+            hour = min(hour, N_TIME_ZONES - 1)
+        if hour >= N_TIME_ZONES:
+            return False
+        for idx, customer in enumerate(customers):
+            if visited[idx]:
+                continue
+            next_time = node_time + duration[last_node][customer][hour] + get_service_time(customer, load, 0)
+            visited[idx] = True
+            perm.append(customer)
+            stop = search(next_time, customer, remaining_bound - min_costs[customer])
+            perm.pop()
+            visited[idx] = False
+            if stop:
+                return True
+        return False
+
+    search(current_time, current_location, sum(min_costs[node] for node in customers + [DEPOT]))
+    best_route_time, best_route = best
     end_time = datetime.now()
     print(f"Time: {end_time-start_time}")
     if best_route is None:
@@ -130,6 +185,7 @@ def solve(
     else:
         print(f"Best route time: {best_route_time}")
         print(f"Best route: {best_route}")
+        print(f"Lower bound: {lower_bound}, gap: {get_gap(best_route_time, lower_bound)}")
     return best_route_time, best_route
 
 
@@ -141,7 +197,17 @@ def run_request(
     load: List[int],
     do_loading_unloading: bool,
     cancelled_customers: List[int],
+    gap: float = 0,
 ):
+    lower_bound = get_tsp_lower_bound(
+        current_time=current_time,
+        current_location=current_location,
+        customers=customers,
+        duration=duration,
+        load=load,
+        do_loading_unloading=do_loading_unloading,
+        cancelled_customers=cancelled_customers,
+    )
     route_time, route = solve(
         duration=duration,
         load=load,
@@ -151,8 +217,15 @@ def run_request(
         do_loading_unloading=do_loading_unloading,
         cancelled_customers=cancelled_customers,
         ignore_long_trip=False,
+        gap=gap,
+        lower_bound=lower_bound,
     )
-    result_dict = {"route_time": route_time, "route": route}
+    result_dict = {
+        "route_time": route_time,
+        "route": route,
+        "lower_bound": lower_bound,
+        "gap": get_gap(route_time, lower_bound),
+    }
     return result_dict
 
 
@@ -168,6 +241,7 @@ def run(
     do_loading_unloading: bool = True,
     cancelled_customers: List[int] = [],
     duration_data_type: Literal["mapbox", "google", "based"] = "mapbox",
+    gap: float = 0,
 ) -> Dict:
     """
     Calculates total time it takes to visit the locations and the route for the optimal solution
@@ -183,6 +257,7 @@ def run(
     :param duration_data_type: Type of the duration data to be used
     :param do_loading_unloading: Spend time to do loading/unloading at the current_location
     :param cancelled_customers: Customers where regarding orders are cancelled
+    :param gap: Accepted relative gap between the returned and the optimal route time
     :return: Total time it takes to visit the locations and the route for the optimal solution
     """
     assert current_location < n, "Current location should be in the fetched duration data"
@@ -204,6 +279,7 @@ def run(
         ignore_long_trip=ignore_long_trip,
         do_loading_unloading=do_loading_unloading,
         cancelled_customers=cancelled_customers,
+        gap=gap,
     )
     result_dict = {"route_time": result[0], "route": result[1]}
     print(f"result_dict = {result_dict}")
@@ -0,0 +1,207 @@
+import heapq
+from datetime import datetime
+from typing import Dict, List, Literal, Optional, Tuple
+
+from src.utilities.helper.data_helper import (
+    get_based_and_load_data,
+    get_google_and_load_data,
+    get_mapbox_and_load_data,
+)
+from src.utilities.helper.lower_bound_helper import get_gap, get_min_arrival_costs, get_tsp_lower_bound
+from src.utilities.helper.tsp_helper import (
+    get_service_time,
+    get_start_service_time,
+    get_travel_time,
+)
+
+INF = float("inf")
+N_TIME_ZONES = 12  # hours = time slices
+DEPOT = 0
+DEFAULT_BEAM_WIDTH = 100
+
+INPUT_FOLDER_PATH = "../../../data/google_api/dynamic/float"
+INPUT_FILE_NAME_PREFIX = "dynamic_duration_float"
+INPUT_FILES_TIME = [f"{INPUT_FOLDER_PATH}/{INPUT_FILE_NAME_PREFIX}_{hour}.txt" for hour in range(N_TIME_ZONES)]
+
+
+def solve(
+    current_time: float,
+    current_location: int,
+    customers: List[int],
+    duration: List[List[List[float]]],
+    load: List[int],
+    do_loading_unloading: bool,
+    cancelled_customers: List[int],
+    beam_width: Optional[int] = DEFAULT_BEAM_WIDTH,
+) -> Tuple[float, Optional[List[int]]]:
+    """
+    Solves TSP with a restricted dynamic programming where only the best beam_width partial routes are kept per layer.
+        Partial routes with the same set of visited customers and the same last customer are merged by keeping the
+        earliest one. The remaining ones are ranked by their current time plus a lower bound on the time needed to
+        visit the unvisited customers and return to the depot.
+
+    :param current_time: Current time
+    :param current_location: Current (starting) location
+    :param customers: Customers to be visited
+    :param duration: Dynamic duration data of NxNx12
+    :param load: Loads of locations
+    :param do_loading_unloading: Spend time to do loading/unloading at the current_location
+    :param cancelled_customers: Customers where regarding orders are cancelled
+    :param beam_width: Number of partial routes to keep per layer, None keeps all of them (exact Held-Karp)
+    :return: Total time it takes to visit the locations and the route for the best solution found
+    """
+    assert current_location < len(duration), "Current location should be in the fetched duration data"
+    assert beam_width is None or beam_width > 0, "Beam width should be positive"
+    n_customers = len(customers)
+    cancelled_load = sum(load[customer] for customer in cancelled_customers)
+    route_load = load[current_location] + load[DEPOT] + sum(load[customer] for customer in customers)
+
+    # Time after the (self) arc and the service at the start node, as in route_solution_to_arrivals
+    start_time = current_time + get_travel_time(current_time, current_location, current_location, duration)
+    start_time += get_start_service_time(current_location, route_load, load, do_loading_unloading)
+
+    min_costs = get_min_arrival_costs([current_location] + customers + [DEPOT], duration, load, cancelled_load)
+    customers_min_costs = [min_costs[customer] for customer in customers]
+    full_bound = sum(customers_min_costs)
+
+    # A state is (time, visited customers bitmask, index of the last customer or -1, remaining bound, parent state)
+    layer = [(start_time, 0, -1, full_bound, None)]
+    for _ in range(n_customers):
+        candidates = {}
+        for state in layer:
+            state_time, mask, last_idx, bound, _ = state
+            last_node = current_location if last_idx == -1 else customers[last_idx]
+            for idx in range(n_customers):
+                if mask & (1 << idx):
+                    continue
+                customer = customers[idx]
+                new_time = state_time + get_travel_time(state_time, last_node, customer, duration)
+                new_time += get_service_time(customer, load, cancelled_load)
+                key = (mask | (1 << idx), idx)
+                if key not in candidates or new_time < candidates[key][0]:
+                    candidates[key] = (new_time, key[0], idx, bound - customers_min_costs[idx], state)
+        if beam_width is None or len(candidates) <= beam_width:
+            layer = list(candidates.values())
+        else:
+            layer = heapq.nsmallest(beam_width, candidates.values(), key=lambda x: x[0] + x[3])
+
+    best_route_time, best_state = INF, None
+    for state in layer:
+        state_time, _, last_idx, _, _ = state
+        last_node = current_location if last_idx == -1 else customers[last_idx]
+        route_time = state_time + get_travel_time(state_time, last_node, DEPOT, duration)
+        route_time += get_service_time(DEPOT, load, cancelled_load)
+        if route_time < best_route_time:
+            best_route_time, best_state = route_time, state
+
+    if best_state is None:
+        return INF, None
+    order = []
+    while best_state is not None and best_state[2] != -1:
+        order.append(customers[best_state[2]])
+        best_state = best_state[4]
+    order.reverse()
+    route = [current_location] + order + [DEPOT]
+    return best_route_time, route
+
+
+def run_request(
+    current_time: float,
+    current_location: int,
+    customers: List[int],
+    duration: List[List[List[float]]],
+    load: List[int],
+    do_loading_unloading: bool,
+    cancelled_customers: List[int],
+    beam_width: Optional[int] = DEFAULT_BEAM_WIDTH,
+):
+    route_time, route = solve(
+        current_time=current_time,
+        current_location=current_location,
+        customers=customers,
+        duration=duration,
+        load=load,
+        do_loading_unloading=do_loading_unloading,
+        cancelled_customers=cancelled_customers,
+        beam_width=beam_width,
+    )
+    lower_bound = get_tsp_lower_bound(
+        current_time=current_time,
+        current_location=current_location,
+        customers=customers,
+        duration=duration,
+        load=load,
+        do_loading_unloading=do_loading_unloading,
+        cancelled_customers=cancelled_customers,
+    )
+    result_dict = {
+        "route_time": route_time,
+        "route": route,
+        "lower_bound": lower_bound,
+        "gap": get_gap(route_time, lower_bound),
+    }
+    return result_dict
+
+
+def run(
+    n: int = 8,
+    current_time: float = 0,
+    current_location: int = DEPOT,
+    beam_width: Optional[int] = DEFAULT_BEAM_WIDTH,
+    supabase_url: Optional[str] = None,
+    supabase_key: Optional[str] = None,
+    supabase_url_key_file: Optional[str] = "../../../data/supabase/supabase_url_key.txt",
+    per_km_time: float = 5,
+    do_loading_unloading: bool = True,
+    cancelled_customers: List[int] = [],
+    duration_data_type: Literal["mapbox", "google", "based"] = "mapbox",
+) -> Dict:
+    """
+    Gets input data and solves TSP with the restricted dynamic programming
+
+    :param n: Number of locations
+    :param current_time: Current time
+    :param current_location: Current (starting) location
+    :param beam_width: Number of partial routes to keep per layer, None keeps all of them
+    :param supabase_url: Project URL
+    :param supabase_key: Project key
+    :param supabase_url_key_file: Path of the file including supabase_url and supabase_key
+    :param per_km_time: Multiplier to calculate duration from distance in km
+    :param do_loading_unloading: Spend time to do loading/unloading at the current_location
+    :param cancelled_customers: Customers where regarding orders are cancelled
+    :param duration_data_type: Type of the duration data to be used
+    :return: Total time it takes to visit the locations and the route for the best solution found
+    """
+    assert current_location < n, "Current location should be in the fetched duration data"
+    duration_data_type = duration_data_type.lower()
+    assert duration_data_type in ["mapbox", "google", "based"], "Duration data type is not valid"
+    start_time = datetime.now()
+    if duration_data_type == "mapbox":
+        duration, _ = get_mapbox_and_load_data(supabase_url, supabase_key, supabase_url_key_file, n)
+    elif duration_data_type == "google":
+        duration, _ = get_google_and_load_data(INPUT_FILES_TIME, None, n)
+    else:
+        duration, _ = get_based_and_load_data(None, n, per_km_time)
+    customers = [i for i in range(1, n) if i != current_location]
+    load = [int(i > 0) for i in range(n)]
+    route_time, route = solve(
+        current_time=current_time,
+        current_location=current_location,
+        customers=customers,
+        duration=duration,
+        load=load,
+        do_loading_unloading=do_loading_unloading,
+        cancelled_customers=cancelled_customers,
+        beam_width=beam_width,
+    )
+    end_time = datetime.now()
+    print(f"Time: {end_time-start_time}")
+    print(f"Best route time: {route_time}")
+    print(f"Best route: {route}")
+    result_dict = {"route_time": route_time, "route": route}
+    print(f"result_dict = {result_dict}")
+    return result_dict
+
+
+if __name__ == "__main__":
+    run()
@@ -3,9 +3,15 @@ import random
 from datetime import datetime
 from typing import Dict, List, Literal, Optional, Tuple, Union
 
+import numpy as np
+
 from src.tsp.simulated_annealing.simulated_annealing_helper import (
-    update_tour_with_2opt,
-    update_tour_with_exchange,
+    NEIGHBORHOODS,
+    evaluate_batch_tours,
+    evaluate_tour_from,
+    get_random_batch_neighbors,
+    get_random_neighbor,
+    update_departures_from,
     compute_nearest_neighbor_tour,
     compute_successive_insertion_tour,
     compute_random_tour,
@@ -15,10 +21,16 @@ from src.utilities.helper.data_helper import (
     get_google_and_load_data,
     get_mapbox_and_load_data,
 )
-from src.utilities.helper.tsp_helper import route_solution_to_arrivals
+from src.utilities.helper.lower_bound_helper import get_gap, get_tsp_lower_bound
+from src.utilities.helper.tsp_helper import get_service_time, route_departure_times, route_solution_to_arrivals
 
 DEPOT = 0
 N_TIME_ZONES = 12
+INF = float("inf")
+
+DEFAULT_TARGET_ACCEPTANCE = 0.5  # initial target rate of accepted uphill moves for the adaptive schedule
+ADAPTIVE_GAIN = 2  # sensitivity of the temperature to the difference between target and measured acceptance
+REHEAT_RATIO = 0.5  # each reheat restarts from this ratio of the previous reheat temperature
 INPUT_FOLDER_PATH = "../../../data/google_api/dynamic/float"
 INPUT_FILE_NAME_PREFIX = "dynamic_duration_float"
 INPUT_FILES_TIME = [f"{INPUT_FOLDER_PATH}/{INPUT_FILE_NAME_PREFIX}_{hour}.txt" for hour in range(N_TIME_ZONES)]
@@ -31,42 +43,86 @@ def simulated_annealing_iterations(
     cancelled_customers: List[int],
     tour: List[int],
     n_iterations: int,
-    neighborhood: Literal["2-opt", "exchange"],
+    neighborhood: Literal["2-opt", "exchange", "or-opt", "3-opt"],
     temperature: float,
     tour_duration: float,
     best_tour: List[int],
     best_tour_duration: float,
     start_time: float,
-) -> Tuple[float, List[int], float, List[int]]:
+) -> Tuple[float, List[int], float, List[int], int, int]:
     neighborhood = neighborhood.lower()
-    assert neighborhood in ["2-opt", "exchange"], "Neighborhood method is not valid"
-    n_tour_nodes = len(tour)
+    assert neighborhood in NEIGHBORHOODS, "Neighborhood method is not valid"
+    n_uphill, n_uphill_accepted = 0, 0
+    cancelled_load = sum(load[customer] for customer in cancelled_customers)
+    service_times = [get_service_time(node, load, cancelled_load) for node in range(len(load))]
+    departures = route_departure_times(start_time, tour, duration, load, do_loading_unloading, cancelled_customers)
     for _ in range(n_iterations):
-        if neighborhood == "2-opt":
-            i = random.randrange(n_tour_nodes - 3)
-            j = random.randrange(i + 2, n_tour_nodes - 1)
-            new_tour = update_tour_with_2opt(tour=tour, i=i, j=j)
-        elif neighborhood == "exchange":
-            i = random.randrange(1, n_tour_nodes - 2)
-            j = random.randrange(i + 1, n_tour_nodes - 1)
-            new_tour = update_tour_with_exchange(tour=tour, i=i, j=j)
-        else:
-            raise ValueError(f"Method {neighborhood} is not allowed. Options: '2-opt', 'exchange'")
-        _, new_tour_duration = route_solution_to_arrivals(
-            vehicle_start_time=start_time,
-            route=new_tour,
-            duration=duration,
-            load=load,
-            do_loading_unloading=do_loading_unloading,
-            cancelled_customers=cancelled_customers,
-        )
+        # Only the part of the new tour after its first changed position is simulated
+        new_tour, first_changed = get_random_neighbor(tour=tour, neighborhood=neighborhood)
+        new_tour_duration = evaluate_tour_from(new_tour, first_changed, departures, duration, service_times)
         delta = tour_duration - new_tour_duration
+        n_uphill += delta <= 0
         if delta > 0 or (random.random() < math.exp(delta / temperature)):
+            n_uphill_accepted += delta <= 0
             tour, tour_duration = new_tour, new_tour_duration
+            departures = update_departures_from(tour, first_changed, departures, duration, service_times)
         if tour_duration < best_tour_duration:
             best_tour_duration = tour_duration
             best_tour = tour
-    return tour_duration, tour, best_tour_duration, best_tour
+    return tour_duration, tour, best_tour_duration, best_tour, n_uphill, n_uphill_accepted
+
+
+def simulated_annealing_batch_iterations(
+    duration: List[List[List[float]]],
+    duration_array: np.ndarray,
+    service_times: np.ndarray,
+    load: List[int],
+    do_loading_unloading: bool,
+    cancelled_customers: List[int],
+    tour: List[int],
+    n_iterations: int,
+    neighborhood: Literal["2-opt", "exchange", "or-opt", "3-opt"],
+    temperature: float,
+    tour_duration: float,
+    best_tour: List[int],
+    best_tour_duration: float,
+    start_time: float,
+    batch_size: int,
+) -> Tuple[float, List[int], float, List[int], int, int]:
+    """
+    Runs simulated_annealing_iterations with batch_size moves drawn at once and evaluated together from the cached
+        departure times of the current tour. The Metropolis rule is applied to each move of the batch against the
+        current tour and the best accepted move is applied, so each batch counts as batch_size iterations.
+    """
+    neighborhood = neighborhood.lower()
+    assert neighborhood in NEIGHBORHOODS, "Neighborhood method is not valid"
+    tour_array = np.array(tour)
+    departures = np.array(
+        route_departure_times(start_time, tour, duration, load, do_loading_unloading, cancelled_customers)
+    )
+    n_uphill, n_uphill_accepted = 0, 0
+    iteration = 0
+    while iteration < n_iterations:
+        size = min(batch_size, n_iterations - iteration)
+        new_tours, first_changed = get_random_batch_neighbors(tour=tour_array, neighborhood=neighborhood, size=size)
+        new_tour_durations = evaluate_batch_tours(new_tours, first_changed, departures, duration_array, service_times)
+        iteration += size
+        deltas = tour_duration - new_tour_durations
+        accepted = (deltas > 0) | (np.random.random(size) < np.exp(np.minimum(deltas, 0) / temperature))
+        n_uphill += int(np.count_nonzero(deltas <= 0))
+        n_uphill_accepted += int(np.count_nonzero(accepted & (deltas <= 0)))
+        if not accepted.any():
+            continue
+        k = np.argmin(np.where(accepted, new_tour_durations, INF))
+        tour_array, tour_duration = new_tours[k], float(new_tour_durations[k])
+        tour = tour_array.tolist()
+        departures = np.array(
+            route_departure_times(start_time, tour, duration, load, do_loading_unloading, cancelled_customers)
+        )
+        if tour_duration < best_tour_duration:
+            best_tour_duration = tour_duration
+            best_tour = tour
+    return tour_duration, tour_array.tolist(), best_tour_duration, best_tour, n_uphill, n_uphill_accepted
 
 
 def simulated_annealing(
@@ -80,30 +136,104 @@ def simulated_annealing(
     threshold: Union[int, float],
     n_iterations: int,
     cooling: float,
-    termination: Literal["max_steps", "min_temp"],
-    neighborhood: Literal["2-opt", "exchange"],
+    termination: Literal["max_steps", "min_temp", "adaptive"],
+    neighborhood: Literal["2-opt", "exchange", "or-opt", "3-opt"],
     start_time: float,
+    gap: float = 0,
+    lower_bound: Optional[float] = None,
+    batch_size: Optional[int] = None,
+    target_acceptance: float = DEFAULT_TARGET_ACCEPTANCE,
+    reheat_after: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    max_evaluations: Optional[int] = None,
 ) -> Tuple[float, List[int]]:
+    """
+    Runs simulated annealing in steps of n_iterations moves until the termination criterion is met
+        - max_steps: Geometric cooling, stops after threshold steps
+        - min_temp: Geometric cooling, stops when the temperature drops below threshold
+        - adaptive: The target rate of accepted uphill moves starts at target_acceptance and decays by cooling in
+            each step, and the temperature follows the measured rate towards the target. If the best tour does not
+            improve for reheat_after steps, the search is restarted from the best tour with a reheated temperature.
+            Stops when the best tour does not improve for threshold steps.
+        Each of them also stops when time_limit seconds pass or max_evaluations moves are evaluated, if given.
+    """
     termination = termination.lower()
-    assert termination in ["max_steps", "min_temp"], "Termination method is not valid"
+    assert termination in ["max_steps", "min_temp", "adaptive"], "Termination method is not valid"
+    assert batch_size is None or batch_size > 0, "Batch size should be positive"
+    assert 0 < target_acceptance < 1, "Target acceptance should be in (0, 1)"
+    if reheat_after is None:
+        reheat_after = max(1, int(threshold) // 2)
+    clock_start = datetime.now()
     best_tour, best_tour_duration = tour, tour_duration
     temperature = init_temperature
-    step = 0
+    target = target_acceptance
+    step, n_evaluations, n_reheats = 0, 0, 0
+    steps_without_improvement, steps_since_reheat = 0, 0
+    if batch_size is not None and batch_size > 1:
+        duration_array = np.array(duration, dtype=float)
+        cancelled_load = sum(load[customer] for customer in cancelled_customers)
+        service_times = np.array([get_service_time(node, load, cancelled_load) for node in range(len(load))])
     while True:
-        tour_duration, tour, best_tour_duration, best_tour = simulated_annealing_iterations(
-            duration=duration,
-            load=load,
-            do_loading_unloading=do_loading_unloading,
-            cancelled_customers=cancelled_customers,
-            tour=tour,
-            n_iterations=n_iterations,
-            neighborhood=neighborhood,
-            temperature=temperature,
-            tour_duration=tour_duration,
-            best_tour=best_tour,
-            best_tour_duration=best_tour_duration,
-            start_time=start_time,
+        step_iterations = (
+            n_iterations if max_evaluations is None else min(n_iterations, max_evaluations - n_evaluations)
         )
+        last_best_tour_duration = best_tour_duration
+        if batch_size is not None and batch_size > 1:
+            (
+                tour_duration,
+                tour,
+                best_tour_duration,
+                best_tour,
+                n_uphill,
+                n_uphill_accepted,
+            ) = simulated_annealing_batch_iterations(
+                duration=duration,
+                duration_array=duration_array,
+                service_times=service_times,
+                load=load,
+                do_loading_unloading=do_loading_unloading,
+                cancelled_customers=cancelled_customers,
+                tour=tour,
+                n_iterations=step_iterations,
+                neighborhood=neighborhood,
+                temperature=temperature,
+                tour_duration=tour_duration,
+                best_tour=best_tour,
+                best_tour_duration=best_tour_duration,
+                start_time=start_time,
+                batch_size=batch_size,
+            )
+        else:
+            (
+                tour_duration,
+                tour,
+                best_tour_duration,
+                best_tour,
+                n_uphill,
+                n_uphill_accepted,
+            ) = simulated_annealing_iterations(
+                duration=duration,
+                load=load,
+                do_loading_unloading=do_loading_unloading,
+                cancelled_customers=cancelled_customers,
+                tour=tour,
+                n_iterations=step_iterations,
+                neighborhood=neighborhood,
+                temperature=temperature,
+                tour_duration=tour_duration,
+                best_tour=best_tour,
+                best_tour_duration=best_tour_duration,
+                start_time=start_time,
+            )
+        n_evaluations += step_iterations
+        if best_tour_duration < last_best_tour_duration:
+            steps_without_improvement, steps_since_reheat = 0, 0
+        else:
+            steps_without_improvement += 1
+            steps_since_reheat += 1
+        # Stop early if the best tour is proven to be within the requested gap
+        if lower_bound is not None and get_gap(best_tour_duration, lower_bound) <= gap:
+            break
         if termination == "max_steps":
             step += 1
             if step == threshold:
@@ -112,8 +242,25 @@ def simulated_annealing(
             temperature *= cooling
             if temperature < threshold:
                 break
+        elif termination == "adaptive":
+            if steps_without_improvement >= threshold:
+                break
+            if steps_since_reheat >= reheat_after:
+                n_reheats += 1
+                temperature = init_temperature * REHEAT_RATIO**n_reheats
+                target = target_acceptance
+                tour, tour_duration = best_tour, best_tour_duration
+                steps_since_reheat = 0
+            else:
+                acceptance = n_uphill_accepted / n_uphill if n_uphill > 0 else 0
+                target *= cooling
+                temperature *= math.exp(ADAPTIVE_GAIN * (target - acceptance))
         else:
-            raise ValueError(f"Method {termination} is not allowed. Options: 'max_steps', 'min_temp'")
+            raise ValueError(f"Method {termination} is not allowed. Options: 'max_steps', 'min_temp', 'adaptive'")
+        if max_evaluations is not None and n_evaluations >= max_evaluations:
+            break
+        if time_limit is not None and (datetime.now() - clock_start).total_seconds() >= time_limit:
+            break
     return best_tour_duration, best_tour
 
 
@@ -130,8 +277,15 @@ def solve(
     alpha: float,
     cooling: float,
     init: Literal["nearest_neighbor", "successive_insertion", "random"],
-    termination: Literal["max_steps", "min_temp"],
-    neighborhood: Literal["2-opt", "exchange"],
+    termination: Literal["max_steps", "min_temp", "adaptive"],
+    neighborhood: Literal["2-opt", "exchange", "or-opt", "3-opt"],
+    gap: float = 0,
+    lower_bound: Optional[float] = None,
+    batch_size: Optional[int] = None,
+    target_acceptance: float = DEFAULT_TARGET_ACCEPTANCE,
+    reheat_after: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    max_evaluations: Optional[int] = None,
 ) -> Tuple[float, Optional[List[int]]]:
     init = init.lower()
     assert init in ["nearest_neighbor", "successive_insertion", "random"], "Init method is not valid"
@@ -168,6 +322,16 @@ def solve(
         cancelled_customers=cancelled_customers,
     )
     init_temperature = tour_duration * alpha
+    if gap > 0 and lower_bound is None:
+        lower_bound = get_tsp_lower_bound(
+            current_time=start_time,
+            current_location=start_node,
+            customers=customers,
+            duration=duration,
+            load=load,
+            do_loading_unloading=do_loading_unloading,
+            cancelled_customers=cancelled_customers,
+        )
     best_tour_duration, best_tour = simulated_annealing(
         duration=duration,
         load=load,
@@ -182,6 +346,13 @@ def solve(
         termination=termination,
         neighborhood=neighborhood,
         start_time=start_time,
+        gap=gap,
+        lower_bound=lower_bound,
+        batch_size=batch_size,
+        target_acceptance=target_acceptance,
+        reheat_after=reheat_after,
+        time_limit=time_limit,
+        max_evaluations=max_evaluations,
     )
     return best_tour_duration, best_tour
 
@@ -199,9 +370,24 @@ def run_request(
     alpha: float = 0.1,
     cooling: float = 0.9,
     init: Literal["nearest_neighbor", "successive_insertion", "random"] = "nearest_neighbor",
-    termination: Literal["max_steps", "min_temp"] = "max_steps",
-    neighborhood: Literal["2-opt", "exchange"] = "2-opt",
+    termination: Literal["max_steps", "min_temp", "adaptive"] = "max_steps",
+    neighborhood: Literal["2-opt", "exchange", "or-opt", "3-opt"] = "2-opt",
+    gap: float = 0,
+    batch_size: Optional[int] = None,
+    target_acceptance: float = DEFAULT_TARGET_ACCEPTANCE,
+    reheat_after: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    max_evaluations: Optional[int] = None,
 ):
+    lower_bound = get_tsp_lower_bound(
+        current_time=current_time,
+        current_location=current_location,
+        customers=customers,
+        duration=duration,
+        load=load,
+        do_loading_unloading=do_loading_unloading,
+        cancelled_customers=cancelled_customers,
+    )
     route_time, route = solve(
         start_time=current_time,
         start_node=current_location,
@@ -217,8 +403,20 @@ def run_request(
         init=init,
         termination=termination,
         neighborhood=neighborhood,
+        gap=gap,
+        lower_bound=lower_bound,
+        batch_size=batch_size,
+        target_acceptance=target_acceptance,
+        reheat_after=reheat_after,
+        time_limit=time_limit,
+        max_evaluations=max_evaluations,
     )
-    result_dict = {"route_time": route_time, "route": route}
+    result_dict = {
+        "route_time": route_time,
+        "route": route,
+        "lower_bound": lower_bound,
+        "gap": get_gap(route_time, lower_bound),
+    }
     return result_dict
 
 
@@ -231,8 +429,8 @@ def run(
     alpha: float = 0.1,
     cooling: float = 0.9,
     init: Literal["nearest_neighbor", "successive_insertion", "random"] = "nearest_neighbor",
-    termination: Literal["max_steps", "min_temp"] = "max_steps",
-    neighborhood: Literal["2-opt", "exchange"] = "2-opt",
+    termination: Literal["max_steps", "min_temp", "adaptive"] = "max_steps",
+    neighborhood: Literal["2-opt", "exchange", "or-opt", "3-opt"] = "2-opt",
     supabase_url: Optional[str] = None,
     supabase_key: Optional[str] = None,
     supabase_url_key_file: Optional[str] = "../../../data/supabase/supabase_url_key.txt",
@@ -1,12 +1,18 @@
 from typing import List, Tuple
 import random
 
-from src.utilities.helper.tsp_helper import route_solution_to_arrivals
+import numpy as np
+
+from src.utilities.helper.tsp_helper import get_service_time, get_travel_time, route_departure_times
 
 DEPOT = 0
 TIME_UNITS = 3600  # hour = 60*60 seconds
+TIME_ZONES = 12  # number of hours
 INF = float("inf")
 
+NEIGHBORHOODS = ["2-opt", "exchange", "or-opt", "3-opt"]
+OR_OPT_MAX_SEGMENT = 3  # max number of customers moved by an or-opt move
+
 
 def update_tour_with_2opt(tour: List[int], i: int, j: int) -> List[int]:
     tour_new = tour[: i + 1] + tour[j:i:-1] + tour[j + 1 :]
@@ -19,6 +25,274 @@ def update_tour_with_exchange(tour: List[int], i: int, j: int) -> List[int]:
     return tour_new
 
 
+def update_tour_with_or_opt(tour: List[int], i: int, j: int, k: int, reverse: bool) -> List[int]:
+    segment = tour[j : i - 1 : -1] if reverse else tour[i : j + 1]
+    if k < i:
+        tour_new = tour[: k + 1] + segment + tour[k + 1 : i] + tour[j + 1 :]
+    else:
+        tour_new = tour[:i] + tour[j + 1 : k + 1] + segment + tour[k + 1 :]
+    return tour_new
+
+
+def update_tour_with_3opt(tour: List[int], i: int, j: int, k: int) -> List[int]:
+    tour_new = tour[:i] + tour[j + 1 : k + 1] + tour[i : j + 1] + tour[k + 1 :]
+    return tour_new
+
+
+def get_random_neighbor(tour: List[int], neighborhood: str) -> Tuple[List[int], int]:
+    """
+    Applies a random move of the given neighborhood to the tour. The first and the last nodes of the tour are fixed.
+        - 2-opt: Reverses the segment tour[i+1..j]
+        - exchange: Swaps tour[i] and tour[j]
+        - or-opt: Moves the segment tour[i..j] of at most OR_OPT_MAX_SEGMENT customers after tour[k], optionally
+            reversed
+        - 3-opt: Swaps the adjacent segments tour[i..j] and tour[j+1..k] without reversing them
+
+    :param tour: Current tour
+    :param neighborhood: Type of the move
+    :return: New tour and the first position where it differs from the current tour
+    """
+    n_tour_nodes = len(tour)
+    if neighborhood == "2-opt":
+        i = random.randrange(n_tour_nodes - 3)
+        j = random.randrange(i + 2, n_tour_nodes - 1)
+        return update_tour_with_2opt(tour=tour, i=i, j=j), i + 1
+    elif neighborhood == "exchange":
+        i = random.randrange(1, n_tour_nodes - 2)
+        j = random.randrange(i + 1, n_tour_nodes - 1)
+        return update_tour_with_exchange(tour=tour, i=i, j=j), i
+    elif neighborhood == "or-opt":
+        segment_length = random.randint(1, min(OR_OPT_MAX_SEGMENT, n_tour_nodes - 3))
+        i = random.randrange(1, n_tour_nodes - segment_length)
+        j = i + segment_length - 1
+        # Insertion after tour[i-1] or tour[j] would not change the tour
+        r = random.randrange((i - 1) + (n_tour_nodes - 2 - j))
+        k = r if r < i - 1 else r - (i - 1) + j + 1
+        reverse = segment_length > 1 and random.random() < 0.5
+        return update_tour_with_or_opt(tour=tour, i=i, j=j, k=k, reverse=reverse), min(i, k + 1)
+    elif neighborhood == "3-opt":
+        i = random.randrange(1, n_tour_nodes - 2)
+        k = random.randrange(i + 1, n_tour_nodes - 1)
+        j = random.randrange(i, k)
+        return update_tour_with_3opt(tour=tour, i=i, j=j, k=k), i
+    else:
+        raise ValueError(f"Method {neighborhood} is not allowed. Options: {NEIGHBORHOODS}")
+
+
+def evaluate_tour_from(
+    tour: List[int],
+    first_changed: int,
+    departures: List[float],
+    duration: List[List[List[float]]],
+    service_times: List[float],
+) -> float:
+    """
+    Calculates the total time of a tour which shares a prefix with the current tour by simulating it from the cached
+        departure time of the current tour before the first changed position
+
+    :param tour: New tour
+    :param first_changed: First position where the new tour differs from the current tour, at least 1
+    :param departures: Departure times from each node of the current tour, see route_departure_times
+    :param duration: Dynamic duration data of NxNx12
+    :param service_times: Service time of each location when it is not the first node of the tour
+    :return: Total time of the new tour
+    """
+    current_time = departures[first_changed - 1]
+    last_node = tour[first_changed - 1]
+    for node in tour[first_changed:]:
+        hour = int(current_time / TIME_UNITS)
+        if hour >= TIME_ZONES:
+            hour = TIME_ZONES - 1
+        current_time += duration[last_node][node][hour]
+        current_time += service_times[node]
+        last_node = node
+    return current_time
+
+
+def update_departures_from(
+    tour: List[int],
+    first_changed: int,
+    departures: List[float],
+    duration: List[List[List[float]]],
+    service_times: List[float],
+) -> List[float]:
+    """
+    Calculates the departure times of a tour which shares a prefix with the current tour, see evaluate_tour_from
+
+    :param tour: New tour
+    :param first_changed: First position where the new tour differs from the current tour, at least 1
+    :param departures: Departure times from each node of the current tour, see route_departure_times
+    :param duration: Dynamic duration data of NxNx12
+    :param service_times: Service time of each location when it is not the first node of the tour
+    :return: Departure times from each node of the new tour
+    """
+    new_departures = departures[:first_changed]
+    current_time = new_departures[-1]
+    last_node = tour[first_changed - 1]
+    for node in tour[first_changed:]:
+        hour = int(current_time / TIME_UNITS)
+        if hour >= TIME_ZONES:
+            hour = TIME_ZONES - 1
+        current_time += duration[last_node][node][hour]
+        current_time += service_times[node]
+        new_departures.append(current_time)
+        last_node = node
+    return new_departures
+
+
+def get_batch_2opt_tours(tour: np.ndarray, i: np.ndarray, j: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Applies a batch of 2-opt moves to the same tour, see update_tour_with_2opt
+
+    :param tour: Tour as an array of nodes
+    :param i: Position before each reversed segment
+    :param j: Last position of each reversed segment
+    :return: Matrix of the new tours and the first changed position of each tour
+    """
+    positions = np.arange(len(tour))[None, :]
+    i, j = i[:, None], j[:, None]
+    source = np.where((positions > i) & (positions <= j), i + 1 + j - positions, positions)
+    return tour[source], i[:, 0] + 1
+
+
+def get_batch_exchange_tours(tour: np.ndarray, i: np.ndarray, j: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Applies a batch of exchange moves to the same tour, see update_tour_with_exchange
+
+    :param tour: Tour as an array of nodes
+    :param i: First exchanged position
+    :param j: Second exchanged position
+    :return: Matrix of the new tours and the first changed position of each tour
+    """
+    positions = np.arange(len(tour))[None, :]
+    source = np.where(positions == i[:, None], j[:, None], np.where(positions == j[:, None], i[:, None], positions))
+    return tour[source], i
+
+
+def get_batch_or_opt_tours(
+    tour: np.ndarray, i: np.ndarray, j: np.ndarray, k: np.ndarray, reverse: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Applies a batch of or-opt moves to the same tour, see update_tour_with_or_opt
+
+    :param tour: Tour as an array of nodes
+    :param i: First position of each moved segment
+    :param j: Last position of each moved segment
+    :param k: Position after which each segment is inserted
+    :param reverse: Flags to reverse the moved segments
+    :return: Matrix of the new tours and the first changed position of each tour
+    """
+    positions = np.arange(len(tour))[None, :]
+    i, j, k, reverse = i[:, None], j[:, None], k[:, None], reverse[:, None]
+    segment_length = j - i + 1
+    # Position of the moved segment in the new tour and the shift of the nodes jumped over by the segment
+    segment_start = np.where(k < i, k + 1, k - segment_length + 1)
+    in_segment = (positions >= segment_start) & (positions < segment_start + segment_length)
+    offset = positions - segment_start
+    segment_source = np.where(reverse, j - offset, i + offset)
+    backward = (k < i) & (positions > k + segment_length) & (positions <= j)
+    forward = (k > j) & (positions >= i) & (positions < segment_start)
+    source = np.where(
+        in_segment,
+        segment_source,
+        np.where(backward, positions - segment_length, np.where(forward, positions + segment_length, positions)),
+    )
+    return tour[source], np.minimum(i, k + 1)[:, 0]
+
+
+def get_batch_3opt_tours(
+    tour: np.ndarray, i: np.ndarray, j: np.ndarray, k: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Applies a batch of 3-opt moves to the same tour, see update_tour_with_3opt
+
+    :param tour: Tour as an array of nodes
+    :param i: First position of each first segment
+    :param j: Last position of each first segment
+    :param k: Last position of each second segment
+    :return: Matrix of the new tours and the first changed position of each tour
+    """
+    positions = np.arange(len(tour))[None, :]
+    i, j, k = i[:, None], j[:, None], k[:, None]
+    second_length = k - j
+    source = np.where(
+        (positions >= i) & (positions < i + second_length),
+        positions + (j - i + 1),
+        np.where((positions >= i + second_length) & (positions <= k), positions - second_length, positions),
+    )
+    return tour[source], i[:, 0]
+
+
+def get_random_batch_neighbors(tour: np.ndarray, neighborhood: str, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Applies size random moves of the given neighborhood to the same tour, see get_random_neighbor
+
+    :param tour: Current tour as an array of nodes
+    :param neighborhood: Type of the moves
+    :param size: Number of moves
+    :return: Matrix of the new tours and the first changed position of each tour
+    """
+    n_tour_nodes = len(tour)
+    if neighborhood == "2-opt":
+        i = np.random.randint(0, n_tour_nodes - 3, size)
+        j = np.random.randint(i + 2, n_tour_nodes - 1)
+        return get_batch_2opt_tours(tour=tour, i=i, j=j)
+    elif neighborhood == "exchange":
+        i = np.random.randint(1, n_tour_nodes - 2, size)
+        j = np.random.randint(i + 1, n_tour_nodes - 1)
+        return get_batch_exchange_tours(tour=tour, i=i, j=j)
+    elif neighborhood == "or-opt":
+        segment_length = np.random.randint(1, min(OR_OPT_MAX_SEGMENT, n_tour_nodes - 3) + 1, size)
+        i = np.random.randint(1, n_tour_nodes - segment_length)
+        j = i + segment_length - 1
+        r = np.random.randint(0, (i - 1) + (n_tour_nodes - 2 - j))
+        k = np.where(r < i - 1, r, r - (i - 1) + j + 1)
+        reverse = (segment_length > 1) & (np.random.random(size) < 0.5)
+        return get_batch_or_opt_tours(tour=tour, i=i, j=j, k=k, reverse=reverse)
+    elif neighborhood == "3-opt":
+        i = np.random.randint(1, n_tour_nodes - 2, size)
+        k = np.random.randint(i + 1, n_tour_nodes - 1)
+        j = np.random.randint(i, k)
+        return get_batch_3opt_tours(tour=tour, i=i, j=j, k=k)
+    else:
+        raise ValueError(f"Method {neighborhood} is not allowed. Options: {NEIGHBORHOODS}")
+
+
+def evaluate_batch_tours(
+    tours: np.ndarray,
+    first_changed: np.ndarray,
+    departures: np.ndarray,
+    duration: np.ndarray,
+    service_times: np.ndarray,
+) -> np.ndarray:
+    """
+    Calculates the total time of a batch of tours which share a prefix with the current tour. All the tours are
+        simulated together from the cached departure time of the current tour before the earliest changed position.
+        Since the tours are equal to the current tour before their own first changed position, the same arithmetic
+        reproduces the cached departure times there.
+
+    :param tours: Matrix of tours of the same length, one per row
+    :param first_changed: First position where each tour differs from the current tour, at least 1
+    :param departures: Departure times from each node of the current tour, see route_departure_times
+    :param duration: Dynamic duration data of NxNx12 as an array
+    :param service_times: Service time of each location when it is not the first node of the tour
+    :return: Total time of each tour
+    """
+    n_tours, n_tour_nodes = tours.shape
+    n_nodes = duration.shape[0]
+    flat_duration = duration.reshape(-1)
+    first_position = int(first_changed.min())
+    tours_by_position = np.ascontiguousarray(tours[:, first_position - 1 :].T)
+    times = np.full(n_tours, departures[first_position - 1])
+    last_nodes = tours_by_position[0]
+    for nodes in tours_by_position[1:]:
+        hours = np.minimum((times / TIME_UNITS).astype(np.intp), TIME_ZONES - 1)
+        times = times + flat_duration.take((last_nodes * n_nodes + nodes) * TIME_ZONES + hours)
+        times = times + service_times.take(nodes)
+        last_nodes = nodes
+    return times
+
+
 def compute_nearest_neighbor_tour(
     customers: List[int],
     start_node: int,
@@ -28,25 +302,56 @@ def compute_nearest_neighbor_tour(
     do_loading_unloading: bool,
     cancelled_customers: List[int],
 ) -> List[int]:
+    """
+    Builds a tour by appending the customer which can be served the earliest after the current tour. The tour is extended
+        from its cached departure time instead of simulating it from the start for each candidate. Only if the tour
+        starts with loading at the depot, the loading time depends on the load of the candidate, so the tour is
+        simulated once per distinct candidate load.
+
+    :param customers: Customers to be visited
+    :param start_node: Starting location of the tour
+    :param start_time: Start time of the tour
+    :param duration: Dynamic duration data of NxNx12
+    :param load: Loads of locations
+    :param do_loading_unloading: Spend time to do loading/unloading at the start_node
+    :param cancelled_customers: Customers where regarding orders are cancelled
+    :return: Tour starting at start_node and ending at the depot
+    """
+    cancelled_load = 0
+    for customer in cancelled_customers:
+        cancelled_load += load[customer]
+    load_dependent_start = do_loading_unloading and start_node == DEPOT
     tour = [start_node]
+    tour_load = load[start_node]
+    tour_time = route_departure_times(start_time, tour, duration, load, do_loading_unloading, cancelled_customers)[-1]
+    visited = set(tour)
     for _ in range(len(customers)):
         best_customer = None
         t_min = INF
+        tour_times = {}
         for customer in customers:
-            if customer not in tour:
-                tour_new = tour.copy() + [customer]
-                _, t_new = route_solution_to_arrivals(
-                    vehicle_start_time=start_time,
-                    route=tour_new,
-                    duration=duration,
-                    load=load,
-                    do_loading_unloading=do_loading_unloading,
-                    cancelled_customers=cancelled_customers,
-                )
+            if customer not in visited:
+                if load_dependent_start:
+                    if load[customer] not in tour_times:
+                        tour_times[load[customer]] = route_departure_times(
+                            vehicle_start_time=start_time,
+                            route=tour,
+                            duration=duration,
+                            load=load,
+                            do_loading_unloading=do_loading_unloading,
+                            cancelled_customers=cancelled_customers,
+                            route_load=tour_load + load[customer],
+                        )[-1]
+                    tour_time = tour_times[load[customer]]
+                t_new = tour_time + get_travel_time(tour_time, tour[-1], customer, duration)
+                t_new += get_service_time(customer, load, cancelled_load)
                 if t_new < t_min:
                     best_customer = customer
                     t_min = t_new
         tour.append(best_customer)
+        tour_load += load[best_customer]
+        tour_time = t_min
+        visited.add(best_customer)
     tour.append(DEPOT)
     return tour
 
@@ -60,20 +365,50 @@ def compute_successive_insertion_tour(
     do_loading_unloading: bool,
     cancelled_customers: List[int],
 ) -> List[int]:
+    """
+    Builds a tour by inserting the customers one by one at the position which minimizes the tour time. The departure
+        times of the current tour are cached, so only the suffix after the insertion point is simulated for each
+        position, and the simulation stops as soon as it can not improve the best position.
+
+    :param customers: Customers to be visited
+    :param start_node: Starting location of the tour
+    :param start_time: Start time of the tour
+    :param duration: Dynamic duration data of NxNx12
+    :param load: Loads of locations
+    :param do_loading_unloading: Spend time to do loading/unloading at the start_node
+    :param cancelled_customers: Customers where regarding orders are cancelled
+    :return: Tour starting at start_node and ending at the depot
+    """
+    cancelled_load = 0
+    for customer in cancelled_customers:
+        cancelled_load += load[customer]
     tour = [start_node, DEPOT]
+    tour_load = load[start_node] + load[DEPOT]
     for node in customers:
         best_index = None
         t_min = INF
+        tour_load += load[node]
+        # The loading time at the depot depends on the total load, which is the same for each insertion position
+        departures = route_departure_times(
+            vehicle_start_time=start_time,
+            route=tour,
+            duration=duration,
+            load=load,
+            do_loading_unloading=do_loading_unloading,
+            cancelled_customers=cancelled_customers,
+            route_load=tour_load,
+        )
         for i in range(1, len(tour)):
-            tour_new = tour[:i] + [node] + tour[i:]
-            _, t_new = route_solution_to_arrivals(
-                vehicle_start_time=start_time,
-                route=tour_new,
-                duration=duration,
-                load=load,
-                do_loading_unloading=do_loading_unloading,
-                cancelled_customers=cancelled_customers,
-            )
+            t_new = departures[i - 1] + get_travel_time(departures[i - 1], tour[i - 1], node, duration)
+            t_new += get_service_time(node, load, cancelled_load)
+            last_node = node
+            for next_node in tour[i:]:
+                # Service and travel times are non-negative, so the tour can not get faster anymore
+                if t_new >= t_min:
+                    break
+                t_new += get_travel_time(t_new, last_node, next_node, duration)
+                t_new += get_service_time(next_node, load, cancelled_load)
+                last_node = next_node
             if t_new < t_min:
                 best_index = i
                 t_min = t_new
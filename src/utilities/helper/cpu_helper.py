@@ -0,0 +1,117 @@
+import math
+import multiprocessing
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def get_cgroup_cpu_limit(cgroup_root: str = CGROUP_ROOT) -> Optional[float]:
+    """
+    Gets the CPU quota of the container, in cores, from the cgroup v2 cpu.max file or the cgroup v1 CFS files
+
+    :param cgroup_root: Mount point of the cgroup file system
+    :return: Number of cores the quota allows, None if there is no quota or it can not be read
+    """
+    try:
+        with open(os.path.join(cgroup_root, "cpu.max")) as file:
+            quota, period = file.read().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_quota_us")) as file:
+            quota = int(file.read())
+        with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_period_us")) as file:
+            period = int(file.read())
+        if quota <= 0 or period <= 0:
+            return None
+        return quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def get_available_cpu_count(cgroup_root: str = CGROUP_ROOT) -> int:
+    """
+    Gets the number of cores the process can use, i.e. the cores it is allowed to run on limited by the CPU quota of
+        the container, unlike multiprocessing.cpu_count which counts all the cores of the machine
+
+    :param cgroup_root: Mount point of the cgroup file system
+    :return: Number of available cores, at least one
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cores = len(os.sched_getaffinity(0))
+    else:
+        cores = multiprocessing.cpu_count()
+    cpu_limit = get_cgroup_cpu_limit(cgroup_root)
+    if cpu_limit is not None:
+        # a fractional quota is rounded down, a process on the extra core would be throttled
+        cores = min(cores, math.floor(cpu_limit))
+    return max(1, cores)
+
+
+class CpuBudget:
+    """
+    Pool of the cores shared by the solver runs of the process, e.g. the concurrent requests of the API
+    Each run is granted a core budget from the cores that are not granted to other runs, at least one core so that
+    it can always run in the current process, so that concurrent runs do not oversubscribe the CPU
+    """
+
+    def __init__(self, total_cores: Optional[int] = None):
+        """
+        :param total_cores: Number of cores of the pool, the available cores of the process if None
+        """
+        self.total_cores = total_cores if total_cores is not None else get_available_cpu_count()
+        assert self.total_cores > 0, "total_cores should be positive"
+        self.granted_cores = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, requested_cores: Optional[int] = None) -> int:
+        """
+        Grants cores to a run, they should be released by the run when it completes
+
+        :param requested_cores: Number of cores the run can use, all the cores of the pool if None
+        :return: Number of cores granted to the run, between one and requested_cores
+        """
+        assert requested_cores is None or requested_cores > 0, "requested_cores should be positive"
+        with self.lock:
+            free_cores = self.total_cores - self.granted_cores
+            cores = max(1, min(requested_cores or self.total_cores, free_cores))
+            self.granted_cores += cores
+            return cores
+
+    def release(self, cores: int) -> None:
+        """
+        :param cores: Number of cores granted to the run by acquire
+        """
+        with self.lock:
+            self.granted_cores -= cores
+
+    @contextmanager
+    def grant(self, requested_cores: Optional[int] = None) -> Iterator[int]:
+        """
+        Grants cores to the run inside the context, see acquire
+
+        :param requested_cores: Number of cores the run can use, all the cores of the pool if None
+        :return: Number of cores granted to the run
+        """
+        cores = self.acquire(requested_cores)
+        try:
+            yield cores
+        finally:
+            self.release(cores)
+
+    def free_cores(self) -> int:
+        """
+        :return: Number of cores that are not granted to any run
+        """
+        with self.lock:
+            return max(0, self.total_cores - self.granted_cores)
+
+
+# Core budget of the solver runs of this process
+CPU_BUDGET = CpuBudget()
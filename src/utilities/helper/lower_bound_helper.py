@@ -0,0 +1,324 @@
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from src.utilities.helper.tsp_helper import (
+    DEPOT,
+    LOADING_TIME_INIT,
+    LOADING_TIME_PER_UNIT,
+    UNLOADING_CUSTOMER_TIME_INIT,
+    UNLOADING_CUSTOMER_TIME_PER_UNIT,
+    get_service_time,
+    get_start_service_time,
+)
+
+INF = float("inf")
+
+
+def get_min_duration_matrix(duration: List[List[List[float]]]) -> List[List[float]]:
+    """
+    Gets the duration between each pair of locations for the fastest hour of the day. Since a route can not be faster
+        than with its fastest hours, any bound computed on this matrix is valid for the dynamic duration data.
+
+    :param duration: Dynamic duration data of NxNx12
+    :return: Static duration data of NxN
+    """
+    return [[min(duration_src_dest) for duration_src_dest in duration_src] for duration_src in duration]
+
+
+def get_min_arrival_costs(
+    nodes: List[int],
+    duration: List[List[List[float]]],
+    load: List[int],
+    cancelled_load: int,
+) -> Dict[int, float]:
+    """
+    Calculates, for each node, a lower bound on the time needed to arrive at and serve it: the cheapest incoming arc
+        among the given nodes over all hours plus the service time of the node
+
+    :param nodes: Nodes of the instance, i.e. the start node, the customers and the depot
+    :param duration: Dynamic duration data of NxNx12
+    :param load: Loads of locations
+    :param cancelled_load: Total load of the cancelled customers to be unloaded at the depot
+    :return: Lower bound on the time spent to arrive at and serve each node
+    """
+    min_costs = {}
+    for v in nodes:
+        min_in = INF
+        for u in nodes:
+            if u != v:
+                min_in = min(min_in, min(duration[u][v]))
+        min_costs[v] = (0 if min_in == INF else min_in) + get_service_time(v, load, cancelled_load)
+    return min_costs
+
+
+def get_assignment_bound(cost: List[List[float]]) -> float:
+    """
+    Solves the assignment problem on the given square cost matrix with the Hungarian method in O(n^3). Forbidden
+        assignments should have the cost INF.
+
+    :param cost: Cost of assigning row i to column j
+    :return: Minimum total cost of a perfect assignment, INF if there is none
+    """
+    n = len(cost)
+    if n == 0:
+        return 0
+    # Forbidden assignments get a large but finite cost so that the potentials stay finite
+    big = 1 + sum(max((c for c in row if c != INF), default=0) for row in cost)
+    u, v = [0.0] * (n + 1), [0.0] * (n + 1)
+    p, way = [0] * (n + 1), [0] * (n + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        min_v = [INF] * (n + 1)
+        used = [False] * (n + 1)
+        while True:
+            used[j0] = True
+            i0, delta, j1 = p[j0], INF, 0
+            row = cost[i0 - 1]
+            for j in range(1, n + 1):
+                if not used[j]:
+                    c = row[j - 1] if row[j - 1] != INF else big
+                    cur = c - u[i0] - v[j]
+                    if cur < min_v[j]:
+                        min_v[j], way[j] = cur, j0
+                    if min_v[j] < delta:
+                        delta, j1 = min_v[j], j
+            for j in range(n + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_v[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    total = 0
+    for j in range(1, n + 1):
+        c = cost[p[j] - 1][j - 1]
+        if c == INF:
+            return INF
+        total += c
+    return total
+
+
+def get_spanning_tree_bound(min_duration: List[List[float]], nodes: List[int]) -> float:
+    """
+    Gets the weight of the minimum spanning tree of the given nodes where the weight of an edge is the duration of its
+        faster direction. A route visiting all the nodes contains a spanning tree, so it can not be shorter.
+
+    :param min_duration: Static duration data of NxN
+    :param nodes: Nodes to span
+    :return: Weight of the minimum spanning tree
+    """
+    if len(nodes) < 2:
+        return 0
+    in_tree = [False] * len(nodes)
+    dist = [INF] * len(nodes)
+    dist[0] = 0
+    total = 0
+    for _ in range(len(nodes)):
+        idx = min((i for i in range(len(nodes)) if not in_tree[i]), key=lambda i: dist[i])
+        in_tree[idx] = True
+        total += dist[idx]
+        u = nodes[idx]
+        for i, v in enumerate(nodes):
+            if not in_tree[i]:
+                dist[i] = min(dist[i], min_duration[u][v], min_duration[v][u])
+    return total
+
+
+def get_tsp_travel_bound(min_duration: List[List[float]], start_node: int, customers: List[int]) -> float:
+    """
+    Gets a lower bound on the travel time of a route starting at start_node, visiting the customers and ending at the
+        depot, as the maximum of the assignment relaxation and the spanning tree (1-tree for closed tours) relaxation
+
+    :param min_duration: Static duration data of NxN
+    :param start_node: Starting location of the route
+    :param customers: Customers to be visited
+    :return: Lower bound on the travel time of the route
+    """
+    if not customers:
+        return min_duration[start_node][DEPOT] if start_node != DEPOT else 0
+    # Each of the start node and the customers is followed by one of the customers or the depot
+    rows = [start_node] + customers
+    cols = customers + [DEPOT]
+    cost = [
+        [INF if row_idx == col_idx + 1 else min_duration[u][v] for col_idx, v in enumerate(cols)]
+        for row_idx, u in enumerate(rows)
+    ]
+    if start_node == DEPOT:
+        cost[0][-1] = INF
+    assignment_bound = get_assignment_bound(cost)
+    if start_node != DEPOT:
+        tree_bound = get_spanning_tree_bound(min_duration, [start_node] + customers + [DEPOT])
+    else:
+        depot_edges = sorted(min(min_duration[DEPOT][c], min_duration[c][DEPOT]) for c in customers)
+        tree_bound = get_spanning_tree_bound(min_duration, customers) + sum(depot_edges[:2])
+        if len(customers) == 1:
+            tree_bound += depot_edges[0]
+    return max(assignment_bound, tree_bound)
+
+
+def get_tsp_lower_bound(
+    current_time: float,
+    current_location: int,
+    customers: List[int],
+    duration: List[List[List[float]]],
+    load: List[int],
+    do_loading_unloading: bool,
+    cancelled_customers: List[int],
+    min_duration: Optional[List[List[float]]] = None,
+) -> float:
+    """
+    Gets a lower bound on the time the route of the TSP ends, see route_solution_to_arrivals for the route model
+
+    :param current_time: Current time
+    :param current_location: Current (starting) location
+    :param customers: Customers to be visited
+    :param duration: Dynamic duration data of NxNx12
+    :param load: Loads of locations
+    :param do_loading_unloading: Spend time to do loading/unloading at the current_location
+    :param cancelled_customers: Customers where regarding orders are cancelled
+    :param min_duration: Static duration data of NxN, calculated from duration if not given
+    :return: Lower bound on the finish time of the route
+    """
+    if min_duration is None:
+        min_duration = get_min_duration_matrix(duration)
+    cancelled_load = sum(load[customer] for customer in cancelled_customers)
+    route_load = load[current_location] + load[DEPOT] + sum(load[customer] for customer in customers)
+    service_time = get_start_service_time(current_location, route_load, load, do_loading_unloading)
+    service_time += sum(get_service_time(customer, load, cancelled_load) for customer in customers)
+    service_time += get_service_time(DEPOT, load, cancelled_load)
+    travel_time = get_tsp_travel_bound(min_duration, current_location, customers)
+    return current_time + service_time + travel_time
+
+
+def get_min_cycle_count(q: int, demands: List[int]) -> int:
+    """
+    Gets a lower bound on the number of cycles (bins) needed to serve the given demands with capacity q, as the maximum
+        of the continuous bound and the number of demands that do not fit pairwise into a single cycle
+
+    :param q: Capacity of vehicle
+    :param demands: Positive demands of customers
+    :return: Lower bound on the number of cycles
+    """
+    if not demands:
+        return 0
+    continuous_bound = (sum(demands) + q - 1) // q
+    large_bound = sum(1 for demand in demands if 2 * demand > q)
+    return max(continuous_bound, large_bound)
+
+
+def get_vrp_lower_bound(
+    q: int,
+    customers: List[int],
+    duration: List[List[List[float]]],
+    load: List[int],
+    vehicles_start_times: List[float],
+    min_duration: Optional[List[List[float]]] = None,
+) -> Tuple[float, float]:
+    """
+    Gets lower bounds on the time the latest driver finishes and on the sum of the finish times of all drivers, where
+        each cycle is loaded at the depot and the customers are unloaded on arrival
+
+    :param q: Capacity of vehicle
+    :param customers: List of customers to be visited
+    :param duration: Dynamic duration data of NxNx12
+    :param load: Loads of locations
+    :param vehicles_start_times: List of (expected) start times of the vehicles
+    :param min_duration: Static duration data of NxN, calculated from duration if not given
+    :return: Lower bound on the route max time and lower bound on the route sum time
+    """
+    if min_duration is None:
+        min_duration = get_min_duration_matrix(duration)
+    m = len(vehicles_start_times)
+    if not customers:
+        return max(vehicles_start_times), sum(vehicles_start_times)
+    nodes = customers + [DEPOT]
+
+    # Mandatory loading and unloading times
+    positive_demands = [load[customer] for customer in customers if load[customer] > 0]
+    n_loaded_cycles = get_min_cycle_count(q, positive_demands)
+    n_cycles = max(1, n_loaded_cycles)
+    work = n_loaded_cycles * LOADING_TIME_INIT + LOADING_TIME_PER_UNIT * sum(positive_demands)
+    work += sum(UNLOADING_CUSTOMER_TIME_INIT + UNLOADING_CUSTOMER_TIME_PER_UNIT * load[c] for c in customers)
+
+    # Each customer is entered and left once, the depot is entered and left once per cycle
+    min_in = {v: min(min_duration[u][v] for u in nodes if u != v) for v in nodes}
+    min_out = {u: min(min_duration[u][v] for v in nodes if u != v) for u in nodes}
+    in_bound = sum(min_in[customer] for customer in customers) + n_cycles * min_in[DEPOT]
+    out_bound = sum(min_out[customer] for customer in customers) + n_cycles * min_out[DEPOT]
+    work += max(in_bound, out_bound)
+
+    sum_bound = sum(vehicles_start_times) + work
+    max_bound = max(max(vehicles_start_times), sum_bound / m)
+    earliest_start = min(vehicles_start_times)
+    for customer in customers:
+        single_cycle = (LOADING_TIME_INIT + LOADING_TIME_PER_UNIT * load[customer]) if load[customer] > 0 else 0
+        single_cycle += min_duration[DEPOT][customer] + min_duration[customer][DEPOT]
+        single_cycle += UNLOADING_CUSTOMER_TIME_INIT + UNLOADING_CUSTOMER_TIME_PER_UNIT * load[customer]
+        max_bound = max(max_bound, earliest_start + single_cycle)
+    # The latest driver finishes after max_bound and all the others after their start times
+    sum_bound = max(sum_bound, max_bound + sum(vehicles_start_times) - max(vehicles_start_times))
+    return max_bound, sum_bound
+
+
+def get_perm_lower_bound(
+    perm: Sequence[int],
+    q: int,
+    min_duration: List[List[float]],
+    load: Union[List[int], Dict[int, int]],
+    vehicles_start_times: List[float],
+) -> Tuple[float, float]:
+    """
+    Gets lower bounds on the time the latest driver finishes and on the sum of the finish times of all drivers for the
+        given permutation, where the cycles are cut at the DEPOT nodes and assigned to the earliest available vehicle
+        as in the exact calculation but each cycle takes its static duration. A cycle can not be faster than with the
+        fastest hour of each of its edges, and shorter cycles can not make any vehicle of the assignment finish later.
+
+    :param perm: The locations to visit in order, with the DEPOT nodes as cycle separators
+    :param q: Capacity of vehicle
+    :param min_duration: Static duration data of NxN, see get_min_duration_matrix
+    :param load: Loads of locations
+    :param vehicles_start_times: List of (expected) start times of the vehicles
+    :return: Lower bound on the route max time and lower bound on the route sum time, INF if a cycle is over capacity
+    """
+    vehicle_times = list(vehicles_start_times)
+    heapq.heapify(vehicle_times)
+    cycle_time, cycle_load, curr_capacity, last_node = 0, 0, q, DEPOT
+    for node in list(perm) + [DEPOT]:
+        if node == DEPOT:
+            if last_node != DEPOT:
+                cycle_time += min_duration[last_node][DEPOT]
+                if cycle_load > 0:
+                    cycle_time += LOADING_TIME_INIT + LOADING_TIME_PER_UNIT * cycle_load
+                heapq.heapreplace(vehicle_times, vehicle_times[0] + cycle_time)
+            cycle_time, cycle_load, curr_capacity = 0, 0, q
+        else:
+            curr_capacity -= load[node]
+            if curr_capacity < 0:
+                return INF, INF
+            cycle_load += load[node]
+            cycle_time += min_duration[last_node][node]
+            cycle_time += UNLOADING_CUSTOMER_TIME_INIT + UNLOADING_CUSTOMER_TIME_PER_UNIT * load[node]
+        last_node = node
+    return max(vehicle_times), sum(vehicle_times)
+
+
+def get_gap(value: float, lower_bound: float) -> float:
+    """
+    Gets the relative gap between a solution value and a lower bound on the optimal value
+
+    :param value: Value of the incumbent solution
+    :param lower_bound: Lower bound on the optimal value
+    :return: Relative gap, 0 if the incumbent is proven optimal
+    """
+    if value == INF:
+        return INF
+    if value <= 0:
+        return 0
+    return max(0.0, (value - lower_bound) / value)
@@ -0,0 +1,191 @@
+import bisect
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from src.utilities.helper.tsp_helper import (
+    DEPOT,
+    LOADING_TIME_INIT,
+    LOADING_TIME_PER_UNIT,
+    TIME_UNITS,
+    UNLOADING_CUSTOMER_TIME_INIT,
+    UNLOADING_CUSTOMER_TIME_PER_UNIT,
+)
+
+INF = float("inf")
+DECODERS = ["markers", "split"]  # cut the chromosome at its DEPOT nodes, or find the cut points by Split
+DEFAULT_DECODER = "markers"
+DEFAULT_SPLIT_LABELS = 8  # number of non-dominated vehicle schedules kept for each cut point
+
+Demands = Union[Sequence[int], Dict[int, int]]
+
+
+def cycle_return_time(
+    duration: List[List[List[float]]],
+    demands: Demands,
+    order: Sequence[int],
+    start: int,
+    end: int,
+    cycle_load: int,
+    depart_at: float,
+) -> float:
+    """
+    Gets the time a vehicle is back at the depot after serving a cycle of consecutive customers
+
+    :param duration: Dynamic duration data of NxNx12
+    :param demands: Demand of each node
+    :param order: Customer order without the depot
+    :param start: Index of the first customer of the cycle in the order
+    :param end: Index after the last customer of the cycle in the order
+    :param cycle_load: Total demand of the customers in the cycle
+    :param depart_at: Time the vehicle is available at the depot
+    :return: Time the vehicle is available at the depot again, the last hour is used for late departures
+    """
+    max_hour = len(duration[0][0]) - 1
+    current_time = depart_at
+    if cycle_load > 0:
+        current_time += LOADING_TIME_INIT + LOADING_TIME_PER_UNIT * cycle_load
+    last_node = DEPOT
+    for idx in range(start, end):
+        node = order[idx]
+        current_time += duration[last_node][node][min(int(current_time / TIME_UNITS), max_hour)]
+        current_time += UNLOADING_CUSTOMER_TIME_INIT + UNLOADING_CUSTOMER_TIME_PER_UNIT * demands[node]
+        last_node = node
+    return current_time + duration[last_node][DEPOT][min(int(current_time / TIME_UNITS), max_hour)]
+
+
+def split_single_vehicle(
+    duration: List[List[List[float]]],
+    demands: Demands,
+    q: int,
+    order: Sequence[int],
+    start_time: float = 0,
+) -> Tuple[float, List[List[int]]]:
+    """
+    Splits the customer order of a single vehicle into cycles so that the vehicle is back at the depot as early as
+    possible, by DP over the cut points
+    The result is optimal if arriving later at a node never allows leaving it earlier (FIFO travel times)
+
+    :param duration: Dynamic duration data of NxNx12
+    :param demands: Demand of each node
+    :param q: Capacity of the vehicle
+    :param order: Customer order without the depot
+    :param start_time: Time the vehicle is available at the depot
+    :return: Time the last cycle ends, INF if a customer does not fit in the vehicle, and the cycles as
+        [DEPOT, c_i, ..., c_j, DEPOT]
+    """
+    n = len(order)
+    earliest = [INF] * (n + 1)
+    earliest[0] = start_time
+    predecessor = [-1] * (n + 1)
+    for start in range(n):
+        if earliest[start] == INF:
+            continue
+        cycle_load = 0
+        for end in range(start + 1, n + 1):
+            cycle_load += demands[order[end - 1]]
+            if cycle_load > q:
+                break
+            end_time = cycle_return_time(duration, demands, order, start, end, cycle_load, earliest[start])
+            if end_time < earliest[end]:
+                earliest[end] = end_time
+                predecessor[end] = start
+
+    if earliest[n] == INF:
+        return INF, []
+    cycles = []
+    end = n
+    while end > 0:
+        start = predecessor[end]
+        cycles.append([DEPOT] + list(order[start:end]) + [DEPOT])
+        end = start
+    return earliest[n], cycles[::-1]
+
+
+def dominates(times_a: Tuple[float, ...], times_b: Tuple[float, ...]) -> bool:
+    """
+    :return: True if each vehicle of the sorted schedule a is available no later than that of the sorted schedule b
+    """
+    return all(time_a <= time_b for time_a, time_b in zip(times_a, times_b))
+
+
+def split(
+    duration: List[List[List[float]]],
+    demands: Demands,
+    q: int,
+    order: Sequence[int],
+    vehicles_start_times: List[float],
+    max_labels: int = DEFAULT_SPLIT_LABELS,
+) -> Tuple[float, float, Optional[defaultdict], Optional[defaultdict]]:
+    """
+    Splits a customer order into cycles by DP over the cut points, each cycle is assigned to the vehicle with the
+    earliest available time as in VehiclesPQ
+    Each cut point keeps the non-dominated vehicle schedules, i.e. the sorted available times of the vehicles, up to
+    max_labels of them preferring the least total time, the result is optimal if no schedule is dropped because
+    of the limit and the travel times are FIFO
+
+    :param duration: Dynamic duration data of NxNx12
+    :param demands: Demand of each node
+    :param q: Capacity of vehicle
+    :param order: Customer order without the depot
+    :param vehicles_start_times: List of (expected) start times of the vehicles
+    :param max_labels: Maximum number of vehicle schedules kept for each cut point
+    :return: Total time it takes to visit the locations for the latest driver, sum of the durations of each driver, the
+        routes for each driver and the travel duration for each driver, INF, INF, None, None if a customer does not fit
+        in a vehicle
+    """
+    assert max_labels > 0, "max_labels should be positive"
+    n = len(order)
+    # a label is (schedule, predecessor label, start of the last cycle, vehicle of the last cycle)
+    # where the schedule is the sorted list of (available time, vehicle id) pairs
+    initial_schedule = tuple(
+        sorted((start_time, vehicle_id) for vehicle_id, start_time in enumerate(vehicles_start_times))
+    )
+    labels = [[] for _ in range(n + 1)]
+    labels[0] = [(initial_schedule, None, -1, -1)]
+
+    for start in range(n):
+        # keep the non-dominated schedules of the cut point, the ones with the least total time first
+        candidates = sorted(labels[start], key=lambda label: (sum(t for t, _ in label[0]), label[0][-1][0]))
+        kept = []
+        for label in candidates:
+            times = tuple(t for t, _ in label[0])
+            if not any(dominates(kept_times, times) for kept_times, _ in kept):
+                kept.append((times, label))
+                if len(kept) == max_labels:
+                    break
+        labels[start] = [label for _, label in kept]
+
+        for label in labels[start]:
+            schedule = label[0]
+            vehicle_t, vehicle_id = schedule[0]
+            cycle_load = 0
+            for end in range(start + 1, n + 1):
+                cycle_load += demands[order[end - 1]]
+                if cycle_load > q:
+                    break
+                end_time = cycle_return_time(duration, demands, order, start, end, cycle_load, vehicle_t)
+                new_schedule = list(schedule[1:])
+                bisect.insort(new_schedule, (end_time, vehicle_id))
+                labels[end].append((tuple(new_schedule), label, start, vehicle_id))
+
+    if not labels[n]:
+        return INF, INF, None, None
+
+    best = min(labels[n], key=lambda label: (label[0][-1][0], sum(t for t, _ in label[0])))
+
+    # follow the predecessors back to the first cut point, the cycles of each vehicle are found in reverse order
+    vehicle_routes = defaultdict(list)
+    label = best
+    end = n
+    while label[1] is not None:
+        _, predecessor, start, vehicle_id = label
+        vehicle_routes[vehicle_id].insert(0, [DEPOT] + list(order[start:end]) + [DEPOT])
+        end = start
+        label = predecessor
+
+    vehicle_times = defaultdict(float)
+    for vehicle_t, vehicle_id in best[0]:
+        vehicle_times[vehicle_id] = vehicle_t
+    route_max_time = best[0][-1][0]
+    route_sum_time = sum(vehicle_t for vehicle_t, _ in best[0])
+    return route_max_time, route_sum_time, vehicle_routes, vehicle_times
@@ -0,0 +1,68 @@
+from typing import Dict, List, Literal, Sequence, Union
+
+from src.utilities.helper.lower_bound_helper import get_min_duration_matrix, get_perm_lower_bound
+
+
+class SurrogateScreen:
+    """
+    First stage of a two-stage evaluation of permutations: a lower bound calculated on the static fastest-hour
+    durations screens out the permutations that can not beat a threshold, e.g. the incumbent, so that only the rest is
+    simulated with the dynamic durations
+    The screen is picklable, each worker process counts its own screening statistics
+    """
+
+    def __init__(
+        self,
+        duration: List[List[List[float]]],
+        q: int,
+        load: Union[List[int], Dict[int, int]],
+        vehicles_start_times: List[float],
+        objective_func_type: Literal["min_max_time", "min_sum_time"] = "min_max_time",
+    ):
+        """
+        :param duration: Dynamic duration data of NxNx12
+        :param q: Capacity of vehicle
+        :param load: Loads of locations
+        :param vehicles_start_times: List of (expected) start times of the vehicles
+        :param objective_func_type: Objective compared with the thresholds, the route max time or the route sum time
+        """
+        assert objective_func_type in ["min_max_time", "min_sum_time"], "objective_func_type is not valid"
+        self.min_duration = get_min_duration_matrix(duration)
+        self.q = q
+        self.load = load
+        self.vehicles_start_times = vehicles_start_times
+        self.objective_idx = 0 if objective_func_type == "min_max_time" else 1
+        self.screened = 0
+        self.passed = 0
+
+    def bound(self, perm: Sequence[int]) -> float:
+        """
+        :param perm: The locations to visit in order, with the DEPOT nodes as cycle separators
+        :return: Lower bound on the objective of the permutation, see get_perm_lower_bound
+        """
+        return get_perm_lower_bound(perm, self.q, self.min_duration, self.load, self.vehicles_start_times)[
+            self.objective_idx
+        ]
+
+    def passes(self, perm: Sequence[int], threshold: float) -> bool:
+        """
+        :param perm: The locations to visit in order, with the DEPOT nodes as cycle separators
+        :param threshold: Objective to be beaten, e.g. the one of the incumbent
+        :return: True if the objective of the permutation may be less than the threshold, i.e. it should be simulated
+        """
+        if self.bound(perm) < threshold:
+            self.passed += 1
+            return True
+        self.screened += 1
+        return False
+
+    def stats(self) -> Dict[str, float]:
+        """
+        :return: Number of screened out and passed permutations, and the share of the screened out ones
+        """
+        checked = self.screened + self.passed
+        return {
+            "screened": self.screened,
+            "passed": self.passed,
+            "screened_rate": self.screened / checked if checked > 0 else 0,
+        }
@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 DEPOT = 0
 TIME_UNITS = 3600  # hour = 60*60 seconds
@@ -12,43 +12,145 @@ UNLOADING_CUSTOMER_TIME_INIT = 60
 UNLOADING_CUSTOMER_TIME_PER_UNIT = 10
 
 
-def route_solution_to_arrivals(
+def get_start_service_time(start_node: int, route_load: int, load: List[int], do_loading_unloading: bool) -> float:
+    """
+    Gets the time spent at the first node of a route before departing
+
+    :param start_node: First node of the route
+    :param route_load: Total load of the nodes in the route
+    :param load: Loads of locations
+    :param do_loading_unloading: Spend time to do loading/unloading at the start_node
+    :return: Loading time if the route starts at the depot, unloading time of start_node otherwise
+    """
+    if not do_loading_unloading:
+        return 0
+    if start_node != DEPOT:
+        return UNLOADING_CUSTOMER_TIME_INIT + UNLOADING_CUSTOMER_TIME_PER_UNIT * load[start_node]
+    if route_load > 0:
+        return LOADING_TIME_INIT + LOADING_TIME_PER_UNIT * route_load
+    return 0
+
+
+def get_service_time(node: int, load: List[int], cancelled_load: int) -> float:
+    """
+    Gets the time spent at a node visited after the first node of a route
+
+    :param node: Visited node
+    :param load: Loads of locations
+    :param cancelled_load: Total load of the cancelled customers to be unloaded at the depot
+    :return: Unloading time at the customer or the depot
+    """
+    if node != DEPOT:
+        return UNLOADING_CUSTOMER_TIME_INIT + UNLOADING_CUSTOMER_TIME_PER_UNIT * load[node]
+    if cancelled_load > 0:
+        return UNLOADING_DEPOT_TIME_INIT + UNLOADING_DEPOT_TIME_PER_UNIT * cancelled_load
+    return 0
+
+
+def get_travel_time(current_time: float, current_node: int, next_node: int, duration: List[List[List[float]]]) -> float:
+    """
+    Gets the travel time between two nodes when departing at the given time
+
+    :param current_time: Departure time
+    :param current_node: Source node
+    :param next_node: Destination node
+    :param duration: Dynamic duration data of NxNx12
+    :return: Travel time for the hour of the departure, the last hour is used for late departures
+    """
+    hour = min(int(current_time / TIME_UNITS), TIME_ZONES - 1)
+    return duration[current_node][next_node][hour]
+
+
+def route_times(
     vehicle_start_time: float,
     route: List[int],
     duration: List[List[List[float]]],
     load: List[int],
     do_loading_unloading: bool,
     cancelled_customers: List[int],
-) -> Tuple[List[float], float]:
+    route_load: Optional[int] = None,
+) -> Tuple[List[float], List[float]]:
+    """
+    Gets the time the vehicle arrives at each node of the route and the time the service there is completed
+
+    :param vehicle_start_time: Start time of the vehicle
+    :param route: Nodes to be visited in order
+    :param duration: Dynamic duration data of NxNx12
+    :param load: Loads of locations
+    :param do_loading_unloading: Spend time to do loading/unloading at the first node
+    :param cancelled_customers: Customers where regarding orders are cancelled
+    :param route_load: Total load to be loaded at the depot, the total load of the route is used if not given
+    :return: Arrival time at and departure time from each node of the route
+    """
+    if route_load is None:
+        route_load = 0
+        for customer in route:
+            route_load += load[customer]
+    cancelled_load = 0
+    for customer in cancelled_customers:
+        cancelled_load += load[customer]
     current_time = vehicle_start_time
     current_node = route[0]
-    arrivals_cycle = []
-
+    arrivals, departures = [], []
     for node_idx, node in enumerate(route):
-        hour = int(current_time / TIME_UNITS)
-        hour = min(hour, TIME_ZONES - 1)
-        current_time += duration[current_node][node][hour]
-        arrivals_cycle.append(current_time)
-
-        if node_idx == 0 and do_loading_unloading:
-            if node != DEPOT:
-                current_time += UNLOADING_CUSTOMER_TIME_INIT + UNLOADING_CUSTOMER_TIME_PER_UNIT * load[node]
-            else:
-                total_load = 0
-                for customer in route:
-                    total_load += load[customer]
-                if total_load > 0:
-                    current_time += LOADING_TIME_INIT + LOADING_TIME_PER_UNIT * total_load
-        elif node_idx > 0:
-            if node != DEPOT:
-                current_time += UNLOADING_CUSTOMER_TIME_INIT + UNLOADING_CUSTOMER_TIME_PER_UNIT * load[node]
-            else:
-                total_load = 0
-                for customer in cancelled_customers:
-                    total_load += load[customer]
-                if total_load > 0:
-                    current_time += UNLOADING_DEPOT_TIME_INIT + UNLOADING_DEPOT_TIME_PER_UNIT * total_load
-
+        current_time += get_travel_time(current_time, current_node, node, duration)
+        arrivals.append(current_time)
+        if node_idx == 0:
+            current_time += get_start_service_time(node, route_load, load, do_loading_unloading)
+        else:
+            current_time += get_service_time(node, load, cancelled_load)
+        departures.append(current_time)
         current_node = node
+    return arrivals, departures
+
+
+def route_departure_times(
+    vehicle_start_time: float,
+    route: List[int],
+    duration: List[List[List[float]]],
+    load: List[int],
+    do_loading_unloading: bool,
+    cancelled_customers: List[int],
+    route_load: Optional[int] = None,
+) -> List[float]:
+    """
+    Gets the time the service at each node of the route is completed, the last element is equal to the total time of
+        route_solution_to_arrivals
+
+    :param vehicle_start_time: Start time of the vehicle
+    :param route: Nodes to be visited in order
+    :param duration: Dynamic duration data of NxNx12
+    :param load: Loads of locations
+    :param do_loading_unloading: Spend time to do loading/unloading at the first node
+    :param cancelled_customers: Customers where regarding orders are cancelled
+    :param route_load: Total load to be loaded at the depot, the total load of the route is used if not given
+    :return: Departure time from each node of the route
+    """
+    return route_times(
+        vehicle_start_time, route, duration, load, do_loading_unloading, cancelled_customers, route_load
+    )[1]
+
+
+def route_solution_to_arrivals(
+    vehicle_start_time: float,
+    route: List[int],
+    duration: List[List[List[float]]],
+    load: List[int],
+    do_loading_unloading: bool,
+    cancelled_customers: List[int],
+) -> Tuple[List[float], float]:
+    """
+    Gets the arrival time at each node of the route and the time the route is completed, see route_times
 
-    return arrivals_cycle, current_time
+    :param vehicle_start_time: Start time of the vehicle
+    :param route: Nodes to be visited in order
+    :param duration: Dynamic duration data of NxNx12
+    :param load: Loads of locations
+    :param do_loading_unloading: Spend time to do loading/unloading at the first node
+    :param cancelled_customers: Customers where regarding orders are cancelled
+    :return: Arrival time at each node of the route and the departure time from its last node
+    """
+    arrivals, departures = route_times(
+        vehicle_start_time, route, duration, load, do_loading_unloading, cancelled_customers
+    )
+    return arrivals, departures[-1]
@@ -1,8 +1,10 @@
 from collections import defaultdict
-from typing import List, Tuple, Union
+from typing import Dict, List, Tuple, Union
 
 from src.utilities.helper.tsp_helper import route_solution_to_arrivals
 
+DEPOT = 0
+
 
 def vehicle_solution_to_arrivals(
     vehicle_start_time: float,
@@ -62,3 +64,81 @@ def complete_solution_to_arrivals(
         route_sum_time += vehicle_t
         route_max_time = max(route_max_time, vehicle_t)
     return arrivals, vehicle_times, route_max_time, route_sum_time
+
+
+def remaining_solution(
+    solution: Union[Dict[int, List[List[int]]], List[List[List[int]]]],
+    customers: List[int],
+) -> defaultdict:
+    """
+    Removes the customers that are not in the given list, e.g. the served and the cancelled ones, from a solution so that
+        it can warm start the re-optimization of the remaining customers
+
+    :param solution: Tours for each driver, i.e. cycles where the first and the last element of each cycle is DEPOT
+    :param customers: Remaining customers
+    :return: Remaining cycles for each driver in the same order, the emptied cycles are dropped
+    """
+    remaining_customers = set(customers)
+    vehicle_ids = solution.keys() if isinstance(solution, dict) else range(len(solution))
+    remaining = defaultdict(list)
+    for vehicle_id in vehicle_ids:
+        for cycle in solution[vehicle_id]:
+            remaining_cycle = [node for node in cycle if node in remaining_customers]
+            if len(remaining_cycle) > 0:
+                remaining[vehicle_id].append([DEPOT] + remaining_cycle + [DEPOT])
+    return remaining
+
+
+def solution_to_permutation(
+    solution: Union[Dict[int, List[List[int]]], List[List[List[int]]]],
+    customers: List[int],
+    vehicles_start_times: List[float],
+    load: List[int],
+    q: int,
+    k: int = 1,
+) -> List[int]:
+    """
+    Converts a solution to a sequence of cycles with DEPOT nodes as cycle separators, the form of the GA chromosomes
+    The cycles are ordered by their index in the tours and then by the start times of the drivers, so that a decoder
+    assigning each cycle to the earliest available driver gives the tours back approximately
+    The customers missing from the solution are visited in extra cycles that fit into the capacity, first fit in the
+        order of the customers, the longest cycles are cut into halves until there are at least k cycles
+
+    :param solution: Tours for each driver, i.e. cycles where the first and the last element of each cycle is DEPOT
+    :param customers: Customers to be visited, the others are removed from the solution
+    :param vehicles_start_times: List of start times of vehicles
+    :param load: Loads of locations
+    :param q: Capacity of vehicles
+    :param k: Least number of cycles
+    :return: The sequence with DEPOT nodes at both ends
+    """
+    remaining = remaining_solution(solution, customers)
+    order = sorted(
+        (cycle_idx, vehicles_start_times[vehicle_id] if vehicle_id < len(vehicles_start_times) else 0, vehicle_id)
+        for vehicle_id in remaining
+        for cycle_idx in range(len(remaining[vehicle_id]))
+    )
+    cycles = [remaining[vehicle_id][cycle_idx][1:-1] for cycle_idx, _, vehicle_id in order]
+    visited = {node for cycle in cycles for node in cycle}
+    missing_customers = [customer for customer in customers if customer not in visited]
+    extra_cycles, extra_loads = [], []
+    for customer in missing_customers:
+        cycle_idx = next((idx for idx, cycle_load in enumerate(extra_loads) if cycle_load + load[customer] <= q), None)
+        if cycle_idx is None:
+            extra_cycles.append([])
+            extra_loads.append(0)
+            cycle_idx = len(extra_cycles) - 1
+        extra_cycles[cycle_idx].append(customer)
+        extra_loads[cycle_idx] += load[customer]
+    cycles.extend(extra_cycles)
+    while 0 < len(cycles) < k:
+        longest_idx = max(range(len(cycles)), key=lambda idx: len(cycles[idx]))
+        longest = cycles[longest_idx]
+        if len(longest) < 2:
+            break
+        cycles[longest_idx : longest_idx + 1] = [longest[: len(longest) // 2], longest[len(longest) // 2 :]]
+    perm = [DEPOT]
+    for cycle in cycles:
+        perm.extend(cycle)
+        perm.append(DEPOT)
+    return perm
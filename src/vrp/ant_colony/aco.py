@@ -1,9 +1,10 @@
 import random
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from src.vrp.vehicles_pq import VehiclesPQ
 
 DEPOT = 0  # depot
 N_TIME_ZONES = 12  # hours = time slices
+WARM_START_PHEROMONE = 2  # initial pheromone of the edges of the warm start routes relative to the other edges
 
 
 class ACO_VRP:
@@ -22,6 +23,7 @@ class ACO_VRP:
         duration: List[List[List[float]]],
         load: List[int],
         hyperparams: Dict[str, Any],
+        warm_start_routes: Optional[List[List[int]]] = None,
     ):
         """
         Constructor of VRP with ACO
@@ -41,6 +43,8 @@ class ACO_VRP:
         :param duration: Dynamic duration data
         :param load: Loads of locations
         :param hyperparams: Hyperparameter settings for the given best tour
+        :param warm_start_routes: Cycles of a previous solution whose edges start with more pheromone, e.g. the
+            remaining cycles of the previous solution in a re-optimization
         """
         self.n = n
         self.m = m
@@ -61,6 +65,7 @@ class ACO_VRP:
         self.ALPHA = hyperparams["ALPHA"]
         self.BETA = hyperparams["BETA"]
         self.RHO = hyperparams["RHO"]
+        self.warm_start_routes = warm_start_routes if warm_start_routes is not None else []
         self.pheromone = self.init_pheromone()
         self.duration_power = self.init_duration_power()
         self.vehicles_pq = VehiclesPQ(vehicles_start_times)
@@ -106,6 +111,12 @@ class ACO_VRP:
                 pheromone_val_dest = int(j in self.customers_and_depot)
                 pheromone_src.append(pheromone_val_src * pheromone_val_dest)
             pheromone.append(pheromone_src)
+        # The ants are led towards the previous solution, the edges to removed locations are not reinforced
+        for route in self.warm_start_routes:
+            for idx in range(1, len(route)):
+                u, v = route[idx - 1], route[idx]
+                if u != v and pheromone[u][v] > 0:
+                    pheromone[u][v] = WARM_START_PHEROMONE
         self.normalize_pheromone(pheromone)
         return pheromone
 
@@ -26,6 +26,7 @@ class ACO_VRP_2(ACO_VRP):
         duration: List[List[List[float]]],
         load: List[int],
         hyperparams: Dict[str, Any],
+        warm_start_routes: Optional[List[List[int]]] = None,
     ) -> None:
         """
         Constructor of VRP with ACO
@@ -45,6 +46,7 @@ class ACO_VRP_2(ACO_VRP):
         :param duration: Dynamic duration data
         :param load: Loads of locations
         :param hyperparams: Hyperparameter settings for the given best tour
+        :param warm_start_routes: Cycles of a previous solution whose edges start with more pheromone
         """
         super().__init__(
             n=n,
@@ -60,6 +62,7 @@ class ACO_VRP_2(ACO_VRP):
             duration=duration,
             load=load,
             hyperparams=hyperparams,
+            warm_start_routes=warm_start_routes,
         )
         self.N_SUB_ITERATIONS = hyperparams["N_SUB_ITERATIONS"]
 
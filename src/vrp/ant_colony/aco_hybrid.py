@@ -6,6 +6,7 @@ import numpy as np
 from collections import defaultdict
 from src.vrp.ant_colony.aco_1 import ACO_VRP_1
 from src.vrp.ant_colony.aco_2 import ACO_VRP_2
+from src.utilities.helper.lower_bound_helper import get_gap, get_vrp_lower_bound
 from src.utilities.helper.vrp_helper import complete_solution_to_arrivals
 from src.utilities.helper.data_helper import (
     get_based_and_load_data,
@@ -137,6 +138,7 @@ def solve(
     range_beta: Tuple[int, int] = RANGE_BETA,
     range_rho: Tuple[float, float] = RANGE_RHO,
     is_print_allowed: bool = False,
+    warm_start_routes: Optional[List[List[int]]] = None,
 ) -> List[Tuple]:
     """
     Try different hyperparamater settings and solve VRP with ACO
@@ -157,6 +159,7 @@ def solve(
     :param consider_depots: Flags to consider depot as a candidate place to visit next
     :param pheromone_uses_first_hour: Flags to consider first hour of duration data for pheromone calculations
     :param is_print_allowed: Flag if print is allowed or not
+    :param warm_start_routes: Cycles of a previous solution whose edges start with more pheromone, see ACO_VRP
     :return: Best results
     """
     objective_func_type = objective_func_type.lower()
@@ -202,6 +205,7 @@ def solve(
                         duration=duration,
                         load=load,
                         hyperparams=hyperparams,
+                        warm_start_routes=warm_start_routes,
                     )
                     best_iter, route_max_time, route_sum_time, vehicle_routes, vehicle_times = vrp.solve()
                     if best_iter is not None:
@@ -314,11 +318,14 @@ def run_request(
         **params,
     )
     result = results[0]
+    lower_bound, _ = get_vrp_lower_bound(q, available_customers, duration, load, vehicles_start_times)
     result_dict = {
         "route_max_time": result[0],
         "route_sum_time": result[1],
         "vehicles_routes": result[2],
         "vehicles_times": result[3],
+        "lower_bound": lower_bound,
+        "gap": get_gap(result[0], lower_bound),
     }
     return result_dict
 
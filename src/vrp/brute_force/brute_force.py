@@ -4,6 +4,8 @@ from collections import defaultdict
 from datetime import datetime
 from typing import Dict, List, Literal, Optional, Tuple
 from src.vrp.vehicles_pq import VehiclesPQ
+from src.utilities.helper.lower_bound_helper import get_gap, get_vrp_lower_bound
+from src.utilities.helper.surrogate_helper import SurrogateScreen
 from src.utilities.helper.data_helper import (
     get_based_and_load_data,
     get_google_and_load_data,
@@ -146,10 +148,14 @@ def solve(
     customers: List[int],
     vehicles_start_times: Optional[List[float]],
     objective_func_type: Literal["min_max_time", "min_sum_time"] = "min_max_time",
+    gap: float = 0,
+    lower_bound: Optional[float] = None,
+    surrogate_screening: bool = True,
 ) -> Tuple[float, float, Optional[defaultdict], Optional[defaultdict]]:
     """
     Solves VRP using brute force and gets total time it takes to visit the locations for the latest driver, sum of the
-        durations of each driver and the routes for each driver
+        durations of each driver and the routes for each driver. The enumeration stops early once the incumbent is
+        within the given gap of the lower bound of the objective.
 
     :param k: Max number of cycles
     :param q: Capacity of vehicle
@@ -161,11 +167,20 @@ def solve(
         as zero.
     :param objective_func_type: Type of the objective function to minimize total time it takes to visit the locations
         for the latest driver or sum of the durations of each driver
+    :param gap: Accepted relative gap between the returned and the optimal objective, 0 to find the optimal solution
+    :param lower_bound: Lower bound on the objective of the instance, calculated if not given
+    :param surrogate_screening: Skip the permutations whose lower bound on the static fastest-hour durations is not
+        better than the incumbent, see SurrogateScreen
     :return: Among the all possible routes, total time it takes to visit the locations for the latest driver, sum of the
         durations of each driver, the routes for each driver and the travel duration for each driver
     """
+    assert 0 <= gap < 1, "Gap should be in [0, 1)"
     start_time = datetime.now()
 
+    if lower_bound is None:
+        max_lower_bound, sum_lower_bound = get_vrp_lower_bound(q, customers, duration, load, vehicles_start_times)
+        lower_bound = max_lower_bound if objective_func_type == "min_max_time" else sum_lower_bound
+
     (
         best_route_max_time,
         best_route_sum_time,
@@ -176,8 +191,16 @@ def solve(
     nodes = copy.deepcopy(customers)
     nodes.extend([DEPOT for _ in range(1, k)])
 
+    screen = None
+    if surrogate_screening:
+        screen = SurrogateScreen(duration, q, load, vehicles_start_times, objective_func_type)
+
     # Look for each permutation of visiting orders
     for perm in itertools.permutations(nodes):
+        best_objective = best_route_max_time if objective_func_type == "min_max_time" else best_route_sum_time
+        # A permutation can not be better than the incumbent if its lower bound is not
+        if screen is not None and not screen.passes(perm, best_objective):
+            continue
         (
             route_max_time,
             route_sum_time,
@@ -193,6 +216,9 @@ def solve(
             best_route_sum_time = route_sum_time
             best_vehicle_routes = vehicle_routes
             best_vehicle_times = vehicle_times
+            best_objective = best_route_max_time if objective_func_type == "min_max_time" else best_route_sum_time
+            if get_gap(best_objective, lower_bound) <= gap:
+                break
 
     if best_vehicle_times is None:
         print("No feasible solution")
@@ -203,6 +229,9 @@ def solve(
             print(f"Route of vehicle {vehicle_id}: {vehicle_cycles}")
         for vehicle_id, vehicle_time in best_vehicle_times.items():
             print(f"Time of vehicle {vehicle_id}: {vehicle_time}")
+        print(f"Lower bound: {lower_bound}")
+    if screen is not None:
+        print(f"Surrogate screening: {screen.stats()}")
 
     end_time = datetime.now()
     print(f"Time: {end_time-start_time}")
@@ -223,11 +252,14 @@ def run_request(
     vehicles_start_times: Optional[List[float]],
     ignore_long_trip: bool = False,
     objective_func_type: Literal["min_max_time", "min_sum_time"] = "min_max_time",
+    gap: float = 0,
 ) -> Dict:
     sum_demand = 0
     for customer in available_customers:
         sum_demand += load[customer]
     k = (sum_demand + q - 1) // q
+    max_lower_bound, sum_lower_bound = get_vrp_lower_bound(q, available_customers, duration, load, vehicles_start_times)
+    lower_bound = max_lower_bound if objective_func_type == "min_max_time" else sum_lower_bound
     result = solve(
         k=k,
         q=q,
@@ -237,12 +269,17 @@ def run_request(
         customers=available_customers,
         vehicles_start_times=vehicles_start_times,
         objective_func_type=objective_func_type,
+        gap=gap,
+        lower_bound=lower_bound,
     )
+    objective = result[0] if objective_func_type == "min_max_time" else result[1]
     result_dict = {
         "route_max_time": result[0],
         "route_sum_time": result[1],
         "vehicles_routes": result[2],
         "vehicles_times": result[3],
+        "lower_bound": lower_bound,
+        "gap": get_gap(objective, lower_bound),
     }
     return result_dict
 
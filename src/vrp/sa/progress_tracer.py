@@ -0,0 +1,74 @@
+from typing import Callable, Dict, List, Optional, TextIO
+
+DEFAULT_TRACE_CAPACITY = 1000
+DEFAULT_TRACE_STRIDE = 100
+
+
+class ProgressTracer:
+    """
+    Keeps the convergence of an annealer in a fixed-size ring buffer, sampled once every `stride` iterations.
+    Samples can also be streamed to a callback and/or a file as they are recorded.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_TRACE_CAPACITY,
+        stride: int = DEFAULT_TRACE_STRIDE,
+        callback: Optional[Callable[[int, float, float, float], None]] = None,
+        file: Optional[TextIO] = None,
+    ):
+        """
+        :param capacity: Number of the most recent samples to be kept
+        :param stride: Number of iterations between two samples
+        :param callback: Called with (iteration, temperature, cost, best) for each sample
+        :param file: Text file where each sample is written as a comma separated line
+        """
+        assert capacity > 0, "capacity should be positive"
+        assert stride > 0, "stride should be positive"
+        self.capacity = capacity
+        self.stride = stride
+        self.callback = callback
+        self.file = file
+        self.iterations = [0] * capacity
+        self.temperatures = [0.0] * capacity
+        self.costs = [0.0] * capacity
+        self.bests = [0.0] * capacity
+        self.count = 0
+
+    def record(self, iteration: int, temperature: float, cost: float, best: float) -> None:
+        """
+        Records a sample, overwriting the oldest one if the buffer is full
+
+        :param iteration: Iteration of the annealer
+        :param temperature: Current temperature
+        :param cost: Cost of the current solution
+        :param best: Cost of the best solution so far
+        """
+        position = self.count % self.capacity
+        self.iterations[position] = iteration
+        self.temperatures[position] = temperature
+        self.costs[position] = cost
+        self.bests[position] = best
+        self.count += 1
+        if self.callback is not None:
+            self.callback(iteration, temperature, cost, best)
+        if self.file is not None:
+            self.file.write(f"{iteration},{temperature},{cost},{best}\n")
+
+    def samples(self) -> Dict[str, List[float]]:
+        """
+        Gets the samples kept in the buffer
+
+        :return: Iterations, temperatures, costs and bests of the samples, from the oldest to the newest
+        """
+        if self.count <= self.capacity:
+            order = range(self.count)
+        else:
+            start = self.count % self.capacity
+            order = list(range(start, self.capacity)) + list(range(start))
+        return {
+            "iterations": [self.iterations[idx] for idx in order],
+            "temperatures": [self.temperatures[idx] for idx in order],
+            "costs": [self.costs[idx] for idx in order],
+            "bests": [self.bests[idx] for idx in order],
+        }
@@ -1,7 +1,14 @@
+import heapq
 import math
+import multiprocessing
 import random
 import numpy as np
+from multiprocessing import shared_memory
 from time import time
+from src.utilities.helper.cpu_helper import CPU_BUDGET
+from src.utilities.helper.lower_bound_helper import get_gap, get_vrp_lower_bound
+from src.utilities.helper.split_helper import DECODERS, DEFAULT_DECODER, split_single_vehicle
+from src.vrp.sa.progress_tracer import ProgressTracer
 
 INF = 999999
 LOADING_TIME_INIT = 30
@@ -10,6 +17,14 @@ UNLOADING_DEPOT_TIME_INIT = 30  # not used
 UNLOADING_DEPOT_TIME_PER_UNIT = 10  # not used
 UNLOADING_CUSTOMER_TIME_INIT = 60
 UNLOADING_CUSTOMER_TIME_PER_UNIT = 10
+LONGEST_PLANS_TRACKED = 3  # a move changes at most two plans, so the third longest is enough
+RANDOM_BLOCK_SIZE = 4096
+DEFAULT_EXCHANGE_INTERVAL = 1000  # iterations each replica runs between two exchange rounds
+MIN_TEMPERATURE = 1e-6
+OPERATOR_SELECTIONS = ['all', 'adaptive']
+BANDIT_EPSILON = 0.1  # probability of selecting a random operator in the adaptive mode
+BANDIT_DECAY = 0.1  # weight of the latest reward in the recency weighted operator values
+BANDIT_INITIAL_VALUE = 1  # optimistic so that every operator gets tried early on
 
 
 def step_duration(duration_matrix: list, current_node: int, next_node: int, depart_at: int):
@@ -20,18 +35,24 @@ def step_duration(duration_matrix: list, current_node: int, next_node: int, depa
     return duration_matrix[current_node][next_node][current_hour]
 
 
-def resupply_time(duration_matrix: list, customer_demands: list, vehicle_capacity: int, plan: list):
+def resupply_time(duration_matrix: list, customer_demands: list, vehicle_capacity: int, plan: list, start=0):
+    '''Returns the time needed to load the cycle of the plan starting at the given index.'''
 
-    # Determine the first cycle in the given plan
-    cycle_end = plan.index(0) if 0 in plan else len(plan)
-    cycle = plan[:cycle_end]
+    # Determine the cycle starting at the given index, without slicing the plan
+    cycle_length = 0
+    supply_need = 0
+    for idx in range(start, len(plan)):
+        node = plan[idx]
+        if node == 0:
+            break
+        cycle_length += 1
+        supply_need += customer_demands[node]
 
     # Return zero resupply time for empty tours
-    if len(cycle) == 0:
+    if cycle_length == 0:
         return 0
 
     # Calculate and return the time needed for resupply
-    supply_need = sum((customer_demands[node] for node in cycle))
     supply_time = LOADING_TIME_INIT + LOADING_TIME_PER_UNIT * supply_need
 
     return supply_time if supply_need <= vehicle_capacity else INF
@@ -39,36 +60,27 @@ def resupply_time(duration_matrix: list, customer_demands: list, vehicle_capacit
 
 def plan_duration(duration_matrix: list, customer_demands: list, vehicle_capacity: int, plan: list):
 
+    max_hour = len(duration_matrix[0][0]) - 1
+    plan_length = len(plan)
     current_node = 0  # Current node index, starting at warehouse
-    current_time = 0  # Current seconds since the start of the plan
-    current_load = vehicle_capacity  # Current load of the vehicle
 
-    # Load supplies from warehouse at day start
+    # Load supplies from warehouse at day start, infeasible cycles take INF time to load
     current_time = resupply_time(
         duration_matrix, customer_demands, vehicle_capacity, plan)
 
-    for next_node_idx, next_node in enumerate(plan + [0]):
-        customer_demand = customer_demands[next_node]
-        arrival_time = current_time + \
-            step_duration(duration_matrix, current_node,
-                          next_node, current_time)
+    for next_node_idx in range(plan_length + 1):
+        next_node = plan[next_node_idx] if next_node_idx < plan_length else 0
+        current_hour = min(int(current_time / (60 * 60)), max_hour)
+        current_time += duration_matrix[current_node][next_node][current_hour]
 
         # Resupply if arriving at warehouse
         if next_node == 0:
-            current_load = vehicle_capacity
-            finish_time = arrival_time + \
-                resupply_time(duration_matrix, customer_demands,
-                              vehicle_capacity, plan[next_node_idx + 1:])
+            current_time += resupply_time(
+                duration_matrix, customer_demands, vehicle_capacity, plan, next_node_idx + 1)
         else:
-            unload_time = UNLOADING_CUSTOMER_TIME_INIT + \
-                UNLOADING_CUSTOMER_TIME_PER_UNIT * customer_demand
-            finish_time = arrival_time + unload_time
-            # Return infinity if infeasible action
-            if current_load < customer_demand:
-                return INF
-
-        current_load = current_load - customer_demand
-        current_time = finish_time
+            current_time += UNLOADING_CUSTOMER_TIME_INIT + \
+                UNLOADING_CUSTOMER_TIME_PER_UNIT * customer_demands[next_node]
+
         current_node = next_node
 
         # Terminate early if infeasible
@@ -78,6 +90,21 @@ def plan_duration(duration_matrix: list, customer_demands: list, vehicle_capacit
     return current_time
 
 
+def plan_cost(duration_matrix: list, customer_demands: list, vehicle_capacity: int, plan: list,
+              decoder=DEFAULT_DECODER):
+    '''Returns the duration of the plan, the split decoder ignores the warehouse visits of the plan and
+    finds the best ones for its customer order instead.'''
+    if decoder == 'split':
+        cost, _ = split_single_vehicle(duration_matrix, customer_demands, vehicle_capacity, split_order(plan))
+        return min(cost, INF)
+    return plan_duration(duration_matrix, customer_demands, vehicle_capacity, plan)
+
+
+def split_order(plan: list):
+    '''Returns the customer order of the plan without the warehouse visits.'''
+    return [node for node in plan if node != 0]
+
+
 def solution_cost_sum(duration_matrix: list, customer_demands: list, vehicle_capacity: int, solution: list):
     return sum((plan_duration(duration_matrix, customer_demands, vehicle_capacity, plan) for plan in solution))
 
@@ -90,103 +117,171 @@ def solution_longest_plan(duration_matrix: list, customer_demands: list, vehicle
     return max((plan_duration(duration_matrix, customer_demands, vehicle_capacity, plan) for plan in solution))
 
 
+def solution_plan_costs(duration_matrix: list, customer_demands: list, vehicle_capacity: int, solution: list,
+                        decoder=DEFAULT_DECODER):
+    '''Returns the duration of each plan in the solution.'''
+    return [plan_cost(duration_matrix, customer_demands, vehicle_capacity, plan, decoder) for plan in solution]
+
+
+def longest_plans(plan_costs: list):
+    '''Returns the indexes of the few longest plans, from the longest to the shortest.'''
+    return heapq.nlargest(LONGEST_PLANS_TRACKED, range(len(plan_costs)), key=plan_costs.__getitem__)
+
+
+def solution_cost_max_after(plan_costs: list, longest: list, a: int, cost_a: float, b: int, cost_b: float):
+    '''Returns the max cost of the solution after the plans a and b get the given durations,
+    without looking at the untouched plans except the longest ones.'''
+    cost = max(cost_a, cost_b)
+    for idx in longest:
+        if idx != a and idx != b:
+            return max(cost, plan_costs[idx])
+    return cost
+
+
+class RandomStream:
+    '''Uniform random numbers drawn from NumPy in blocks, so that a single draw is a list lookup.'''
+
+    def __init__(self, block_size=RANDOM_BLOCK_SIZE):
+        self.block_size = block_size
+        self.values = np.random.random(block_size).tolist()
+        self.position = 0
+
+    def uniform(self):
+        if self.position == self.block_size:
+            self.values = np.random.random(self.block_size).tolist()
+            self.position = 0
+        value = self.values[self.position]
+        self.position += 1
+        return value
+
+    def integer(self, n: int):
+        '''Returns an integer in [0, n) uniformly random.'''
+        return min(int(self.uniform() * n), n - 1)
+
+    def pair(self, n: int):
+        '''Returns two different integers in [0, n) uniformly random.'''
+        i = self.integer(n)
+        j = self.integer(n - 1)
+        return i, j + 1 if j >= i else j
+
+
+# Moves are (operator, a, i, b, j) tuples applied to the solution in place
+SWAP_INTRA = 0
+SWAP_INTER = 1
+MOVE_INTER = 2
+
+
+def apply_move(solution: list, move: tuple):
+    operator, a, i, b, j = move
+    if operator == MOVE_INTER:
+        # Move the node at index i of plan a to index j of plan b
+        solution[b].insert(j, solution[a].pop(i))
+    else:
+        # Swap the node at index i of plan a and the node at index j of plan b
+        solution[a][i], solution[b][j] = solution[b][j], solution[a][i]
+
+
+def undo_move(solution: list, move: tuple):
+    operator, a, i, b, j = move
+    if operator == MOVE_INTER:
+        solution[a].insert(i, solution[b].pop(j))
+    else:
+        solution[a][i], solution[b][j] = solution[b][j], solution[a][i]
+
+
+def evaluate_move(duration_matrix: list,
+                  customer_demands: list,
+                  vehicle_capacity: int,
+                  solution: list,
+                  plan_costs: list,
+                  longest: list,
+                  move: tuple,
+                  decoder=DEFAULT_DECODER):
+    '''Evaluates the move by applying and undoing it in place, the solution is left unchanged.'''
+    _, a, _, b, _ = move
+    apply_move(solution, move)
+    cost_a = plan_cost(duration_matrix, customer_demands, vehicle_capacity, solution[a], decoder)
+    cost_b = cost_a if b == a else \
+        plan_cost(duration_matrix, customer_demands, vehicle_capacity, solution[b], decoder)
+    undo_move(solution, move)
+    new_cost = solution_cost_max_after(plan_costs, longest, a, cost_a, b, cost_b)
+
+    return new_cost, move, cost_a, cost_b
+
+
 def swap_intra(duration_matrix: list,
                customer_demands: list,
                vehicle_capacity: int,
-               sol_current: list):
+               sol_current: list,
+               plan_costs: list,
+               longest: list,
+               stream: RandomStream,
+               decoder=DEFAULT_DECODER):
 
     # Select a random plan
-    a = np.random.choice(range(len(sol_current)))
-    plan = sol_current[a].copy()
+    a = stream.integer(len(sol_current))
 
     # Assert that the select plan is longer than 1 node
-    if len(plan) < 2:
+    if len(sol_current[a]) < 2:
         return None
 
     # Select two node indexes uniformly random
-    i, j = np.random.choice(range(len(plan)), size=2, replace=False)
+    i, j = stream.pair(len(sol_current[a]))
 
-    # Swap the selected nodes inside the plan
-    plan[i], plan[j] = plan[j], plan[i]
-
-    # Calculate the cost
-
-    new_solution = sol_current.copy()
-    new_solution[a] = plan
-    new_cost = solution_cost_max(
-        duration_matrix, customer_demands, vehicle_capacity, new_solution)
-
-    return new_cost, new_solution
+    # Swap the selected nodes inside the plan, only the modified plan is re-evaluated
+    return evaluate_move(duration_matrix, customer_demands, vehicle_capacity,
+                         sol_current, plan_costs, longest, (SWAP_INTRA, a, i, a, j), decoder)
 
 
 def swap_inter(duration_matrix: list,
                customer_demands: list,
                vehicle_capacity: int,
                sol_current: list,
-               move=False):
+               plan_costs: list,
+               longest: list,
+               stream: RandomStream,
+               move=False,
+               decoder=DEFAULT_DECODER):
+
+    # Assert there are at least two plans
+    if len(sol_current) < 2:
+        return None
 
-    # Select a random plan idx with probability *directly* proportional to total duration
-    a, b = np.random.choice(range(len(sol_current)), 2, replace=False)
+    # Select two different plans uniformly random
+    a, b = stream.pair(len(sol_current))
 
-    # Assert selected plans are different and not empty
-    if a == b or len(sol_current[a]) == 0 or len(sol_current[b]) == 0:
+    # Assert selected plans are not empty
+    if len(sol_current[a]) == 0 or len(sol_current[b]) == 0:
         return None
 
-    # Plan A is most likely expensive, plan B is most likely cheap
-    plan_a = sol_current[a].copy()
-    plan_b = sol_current[b].copy()
-
     # Select two node indexes uniformly random
-    i = np.random.choice(range(len(plan_a)), replace=False)
-    j = np.random.choice(range(len(plan_b)), replace=False)
-
-    if move:
-        # Move the selected node from plan a to plan b
-        node = plan_a.pop(i)
-        plan_b.insert(j, node)
-    else:
-        # Swap the selected nodes between routes
-        plan_a[i], plan_b[j] = plan_b[j], plan_a[i]
+    i = stream.integer(len(sol_current[a]))
+    j = stream.integer(len(sol_current[b]))
 
-    new_solution = sol_current.copy()
-    new_solution[a], new_solution[b] = plan_a, plan_b
-    new_cost = solution_cost_max(
-        duration_matrix, customer_demands, vehicle_capacity, new_solution)
-
-    return new_cost, new_solution
+    # Move the selected node from plan a to plan b, or swap the selected nodes between routes
+    operator = MOVE_INTER if move else SWAP_INTER
+    return evaluate_move(duration_matrix, customer_demands, vehicle_capacity,
+                         sol_current, plan_costs, longest, (operator, a, i, b, j), decoder)
 
 
 def move_inter(duration_matrix: list,
                customer_demands: list,
                vehicle_capacity: int,
                sol_current: list,
-               move=False):
-
-    # Select a random plan idx with probability *directly* proportional to total duration
-    a, b = np.random.choice(range(len(sol_current)), 2, replace=False)
+               plan_costs: list,
+               longest: list,
+               stream: RandomStream,
+               decoder=DEFAULT_DECODER):
+    return swap_inter(duration_matrix, customer_demands, vehicle_capacity,
+                      sol_current, plan_costs, longest, stream, move=True, decoder=decoder)
 
-    # Assert selected plans are different and not empty
-    if a == b or len(sol_current[a]) == 0 or len(sol_current[b]) == 0:
-        return None
-
-    # Plan A is most likely expensive, plan B is most likely cheap
-    plan_a = sol_current[a].copy()
-    plan_b = sol_current[b].copy()
-
-    # Select two node indexes uniformly random
-    i = np.random.choice(range(len(plan_a)), replace=False)
-    j = np.random.choice(range(len(plan_b)), replace=False)
 
-    # Move the selected node from plan a to plan b
-    node = plan_a.pop(i)
-    plan_b.insert(j, node)
+OPERATORS = [swap_intra, swap_inter, move_inter]
 
-    new_solution = sol_current.copy()
-    new_solution[a], new_solution[b] = plan_a, plan_b
-    new_cost = solution_cost_max(
-        duration_matrix, customer_demands, vehicle_capacity, new_solution)
 
-    return new_cost, new_solution
+def move_evaluations(move: tuple):
+    '''Returns the number of plans re-evaluated for the move.'''
+    return 1 if move[1] == move[3] else 2
 
 
 def generate_random_initial_solution(customer_count: int, vehicle_count: int, max_cycles: int, ignored_customers=[]):
@@ -194,14 +289,42 @@ def generate_random_initial_solution(customer_count: int, vehicle_count: int, ma
     customer_idxs = [
         idx for idx in customer_idxs if idx not in ignored_customers]
     random.shuffle(customer_idxs)
-    solution = [list(plan) for plan in np.array_split(
-        np.array(customer_idxs), vehicle_count)]
+    solution = [plan.tolist() for plan in np.array_split(
+        np.array(customer_idxs, dtype=int), vehicle_count)]
     for plan in solution:
         plan += [0] * (max_cycles - 1)
         random.shuffle(plan)
     return solution
 
 
+def generate_warm_start_initial_solution(tours: list, customer_count: int, vehicle_count: int, max_cycles: int,
+                                         ignored_customers=[]):
+    '''Converts the tours of a previous solution, the cycles of each vehicle, to the plans of the vehicles.
+    The customers missing from the tours are appended to the shortest plans, the others are dropped.'''
+    if isinstance(tours, dict):
+        tours = [tours.get(vehicle_idx, []) for vehicle_idx in range(vehicle_count)]
+    customer_idxs = [idx for idx in range(1, customer_count + 1) if idx not in ignored_customers]
+    remaining = set(customer_idxs)
+    solution = []
+    for vehicle_idx in range(vehicle_count):
+        plan = []
+        for cycle in (tours[vehicle_idx] if vehicle_idx < len(tours) else []):
+            nodes = [node for node in cycle if node in remaining]
+            remaining -= set(nodes)
+            if nodes:
+                plan += ([0] if plan else []) + nodes
+        solution.append(plan)
+    for idx in customer_idxs:
+        if idx in remaining:
+            min(solution, key=len).append(idx)
+    for plan in solution:
+        if max_cycles == 1:
+            plan[:] = [node for node in plan if node != 0]
+        else:
+            plan += [0] * max(0, max_cycles - 1 - plan.count(0))
+    return solution
+
+
 def insert_resupply_runs(plan: list, customer_demands, vehicle_capacity, min_cycles: int):
     current_node = 0
     current_load = vehicle_capacity
@@ -235,85 +358,343 @@ def anneal(duration_matrix: list,
            terminate_after: int,
            trace_progress=True,
            icon=None,
-           ignored_customers=[]):
+           ignored_customers=[],
+           operator_selection='all',
+           tracer=None,
+           decoder=DEFAULT_DECODER):
+
+    assert operator_selection in OPERATOR_SELECTIONS, \
+        f'operator_selection should be one of {OPERATOR_SELECTIONS}'
+    assert decoder in DECODERS, f'decoder should be one of {DECODERS}'
 
     # Start timer
     time_start = time()
 
-    # Initialize solutions
-    sol_optimal = initial_solution.copy()
-    sol_current = initial_solution.copy()
-    cost_optimal = solution_cost_max(
-        duration_matrix, customer_demands, vehicle_capacity, sol_optimal)
+    # Moves are applied in place, so neither the initial solution nor the optimal one is shared
+    sol_current = [plan.copy() for plan in initial_solution]
+    sol_optimal = [plan.copy() for plan in initial_solution]
+    if not isinstance(duration_matrix, list):
+        duration_matrix = np.asarray(duration_matrix).tolist()
+    stream = RandomStream()
+
+    # Cache the duration of each plan, a move re-evaluates only the plans it modifies
+    plan_costs_current = solution_plan_costs(
+        duration_matrix, customer_demands, vehicle_capacity, sol_current, decoder)
+    plan_costs_optimal = plan_costs_current.copy()
+    longest_current = longest_plans(plan_costs_current)
+    cost_optimal = max(plan_costs_current)
     cost_current = cost_optimal
 
     # Initialize variables
     temperature = initial_temperature
     total_iterations = 0
 
-    # Initialize tracers
-    tracer_bests = []
-    tracer_costs = []
-    tracer_temps = []
+    # Initialize operator stats, rewards are the relative improvements per plan evaluation
+    operator_values = [BANDIT_INITIAL_VALUE] * len(OPERATORS)
+    operator_selected = [0] * len(OPERATORS)
+    operator_evaluations = [0] * len(OPERATORS)
+    operator_improvements = [0] * len(OPERATORS)
+    operator_rewards = [0.0] * len(OPERATORS)
+
+    # Initialize the tracer, samples are kept in a bounded buffer
+    if trace_progress and tracer is None:
+        tracer = ProgressTracer()
+    if not trace_progress:
+        tracer = None
+    trace_stride = tracer.stride if tracer is not None else 0
 
     # Main simulated annealing loop
     while total_iterations < terminate_after:
 
         for _ in range(step_length):
+            if trace_stride and total_iterations % trace_stride == 0:
+                tracer.record(total_iterations, temperature, cost_current, cost_optimal)
+
             total_iterations += 1
 
-            if trace_progress:
-                tracer_temps.append(temperature)
-                tracer_costs.append(cost_current)
-                tracer_bests.append(cost_optimal)
-
-            experiments = sorted([proposal for proposal in [
-                swap_intra(duration_matrix, customer_demands,
-                           vehicle_capacity, sol_current),
-                swap_inter(duration_matrix, customer_demands,
-                           vehicle_capacity, sol_current),
-                move_inter(duration_matrix, customer_demands,
-                           vehicle_capacity, sol_current)
-            ] if proposal is not None])
-
-            if len(experiments) == 0:
-                continue
+            if operator_selection == 'adaptive':
+                # Select a single operator, epsilon-greedy on the recent rewards of the operators
+                if stream.uniform() < BANDIT_EPSILON:
+                    best_operator = stream.integer(len(OPERATORS))
+                else:
+                    best_operator = max(range(len(OPERATORS)), key=operator_values.__getitem__)
+                best_proposal = OPERATORS[best_operator](duration_matrix, customer_demands, vehicle_capacity,
+                                                         sol_current, plan_costs_current, longest_current, stream,
+                                                         decoder=decoder)
+                operator_selected[best_operator] += 1
+                if best_proposal is None:
+                    operator_values[best_operator] -= BANDIT_DECAY * operator_values[best_operator]
+                    continue
+                operator_evaluations[best_operator] += move_evaluations(best_proposal[1])
+
+            else:
+                # Keep the cheapest proposal, ties are resolved in the order of the operators
+                best_proposal = None
+                for operator_idx, operator in enumerate(OPERATORS):
+                    proposal = operator(duration_matrix, customer_demands, vehicle_capacity,
+                                        sol_current, plan_costs_current, longest_current, stream,
+                                        decoder=decoder)
+                    if proposal is None:
+                        continue
+                    operator_evaluations[operator_idx] += move_evaluations(proposal[1])
+                    if best_proposal is None or proposal[0] < best_proposal[0]:
+                        best_proposal = proposal
+                        best_operator = operator_idx
+
+                if best_proposal is None:
+                    continue
+                operator_selected[best_operator] += 1
 
-            cost_new, sol_new = experiments[0]
+            cost_new, move, cost_a, cost_b = best_proposal
             delta = cost_new - cost_current
 
-            # Update the current solution if improved
-            if delta <= 0:
-                sol_current = sol_new
-                cost_current = cost_new
+            # Reward the selected operator with its relative improvement per plan evaluation
+            reward = -delta / cost_current / move_evaluations(move) if delta < 0 else 0
+            operator_values[best_operator] += BANDIT_DECAY * (reward - operator_values[best_operator])
+            operator_rewards[best_operator] += reward
+            if delta < 0:
+                operator_improvements[best_operator] += 1
 
-                # Update the optimal solution if improved
-                if cost_new < cost_optimal:
-                    sol_optimal = sol_new.copy()  # must be a copy!
-                    cost_optimal = cost_new
-                    continue
+            # Reject the new solution without improvement unless lucky
+            if delta > 0 and stream.uniform() >= math.exp(-delta / temperature):
+                continue
+
+            # Update the current solution
+            apply_move(sol_current, move)
+            plan_costs_current[move[1]] = cost_a
+            plan_costs_current[move[3]] = cost_b
+            longest_current = longest_plans(plan_costs_current)
+            cost_current = cost_new
 
-            # Accept the new solution without improvement if lucky
-            elif random.uniform(0, 1) < math.exp(-delta / temperature):
-                sol_current = sol_new
-                cost_current = cost_new
+            # Update the optimal solution if improved
+            if cost_new < cost_optimal:
+                sol_optimal = [plan.copy() for plan in sol_current]  # must be a copy!
+                plan_costs_optimal = plan_costs_current.copy()
+                cost_optimal = cost_new
 
         # Decrease temperature after
         temperature *= cooling_factor
 
-    if trace_progress:
-        tracer_temps.append(temperature)
-        tracer_costs.append(cost_current)
-        tracer_bests.append(cost_optimal)
+    if tracer is not None:
+        tracer.record(total_iterations, temperature, cost_current, cost_optimal)
 
     # Calculate stats about the solution
     exec_time = time() - time_start
-    sol_sum = int(solution_cost_sum(duration_matrix,
-                  customer_demands, vehicle_capacity, sol_optimal))
-    sol_max = int(solution_cost_max(duration_matrix,
-                  customer_demands, vehicle_capacity, sol_optimal))
+    sol_sum = int(sum(plan_costs_optimal))
+    sol_max = int(max(plan_costs_optimal))
+    operator_stats = {operator.__name__: {
+        'selected': operator_selected[idx],
+        'evaluations': operator_evaluations[idx],
+        'improvements': operator_improvements[idx],
+        'reward': operator_rewards[idx]} for idx, operator in enumerate(OPERATORS)}
+
+    return {'plans': sol_optimal, 'sol_sum': sol_sum, 'sol_max': sol_max, 'exec_time': exec_time,
+            'current_plans': sol_current, 'current_max': cost_current, 'operator_stats': operator_stats,
+            'trace': tracer.samples() if tracer is not None else None}
+
+
+def merge_operator_stats(results: list):
+    '''Sums the operator stats of several anneal results.'''
+    operator_stats = {}
+    for result in results:
+        for name, stats in result['operator_stats'].items():
+            merged = operator_stats.setdefault(name, dict.fromkeys(stats, 0))
+            for key, value in stats.items():
+                merged[key] += value
+    return operator_stats
+
+
+def temperature_ladder(initial_temperature: float, final_temperature: float, replicas: int):
+    '''Returns geometrically spaced temperatures from the hottest to the coldest replica.'''
+    final_temperature = min(max(final_temperature, MIN_TEMPERATURE), initial_temperature)
+    if replicas == 1:
+        return [initial_temperature]
+    ratio = (final_temperature / initial_temperature) ** (1 / (replicas - 1))
+    return [initial_temperature * ratio ** idx for idx in range(replicas)]
+
+
+def anneal_replica(duration_matrix: list,
+                   customer_demands: list,
+                   vehicle_capacity: int,
+                   plans: list,
+                   temperature: float,
+                   iterations: int,
+                   seed: int,
+                   operator_selection='all',
+                   decoder=DEFAULT_DECODER):
+    '''Runs a replica at a fixed temperature, starting from the given plans.'''
+    random.seed(seed)
+    np.random.seed(seed)
+    return anneal(duration_matrix,
+                  customer_demands,
+                  vehicle_capacity,
+                  plans,
+                  temperature,
+                  1,
+                  iterations,
+                  iterations,
+                  trace_progress=False,
+                  icon=None,
+                  operator_selection=operator_selection,
+                  decoder=decoder)
+
+
+# Dataset of the replicas annealed by the current process, set once per process by init_replicas
+_replica_dataset = {}
+
+
+def init_replicas(shm_name,
+                  duration_shape: tuple,
+                  duration_dtype: str,
+                  duration_matrix,
+                  customer_demands: list,
+                  vehicle_capacity: int,
+                  operator_selection='all',
+                  decoder=DEFAULT_DECODER):
+    '''Sets the dataset of the replicas annealed by the current process, the duration matrix is read from the
+    shared memory block unless it is given.'''
+    if duration_matrix is None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        duration_matrix = np.ndarray(duration_shape, dtype=duration_dtype, buffer=shm.buf).tolist()
+        shm.close()
+    else:
+        # Converted once, element access from the anneal loops is much faster on nested lists
+        duration_matrix = np.asarray(duration_matrix).tolist()
+    _replica_dataset.clear()
+    _replica_dataset.update(duration_matrix=duration_matrix, customer_demands=customer_demands,
+                            vehicle_capacity=vehicle_capacity, operator_selection=operator_selection, decoder=decoder)
+
+
+def anneal_pooled_replica(plans: list, temperature: float, iterations: int, seed: int):
+    '''Runs a replica with the dataset of the current process, see anneal_replica.'''
+    return anneal_replica(_replica_dataset['duration_matrix'],
+                          _replica_dataset['customer_demands'],
+                          _replica_dataset['vehicle_capacity'],
+                          plans,
+                          temperature,
+                          iterations,
+                          seed,
+                          _replica_dataset['operator_selection'],
+                          _replica_dataset['decoder'])
+
+
+class ReplicaPool:
+    '''Long-lived pool of the parallel tempering replicas.
+    The duration matrix is sent to the worker processes once through shared memory, then only the replica states
+    are exchanged with them at each exchange round, the replicas are annealed in the current process if there is
+    a single process.'''
+
+    def __init__(self,
+                 n_processes: int,
+                 duration_matrix,
+                 customer_demands: list,
+                 vehicle_capacity: int,
+                 operator_selection='all',
+                 decoder=DEFAULT_DECODER):
+        self.pool = None
+        self.shm = None
+        if n_processes == 1:
+            init_replicas(None, (), '', duration_matrix, customer_demands, vehicle_capacity,
+                          operator_selection, decoder)
+            return
+        duration_array = np.asarray(duration_matrix)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, duration_array.nbytes))
+        np.ndarray(duration_array.shape, dtype=duration_array.dtype, buffer=self.shm.buf)[...] = duration_array
+        self.pool = multiprocessing.Pool(
+            n_processes,
+            initializer=init_replicas,
+            initargs=(self.shm.name, duration_array.shape, duration_array.dtype.str, None, customer_demands,
+                      vehicle_capacity, operator_selection, decoder))
+
+    def anneal(self, states: list, temperatures: list, iterations: int):
+        '''Runs each replica for the given number of iterations from its state at its temperature.'''
+        tasks = [(states[idx], temperatures[idx], iterations, np.random.randint(2 ** 31))
+                 for idx in range(len(states))]
+        if self.pool is None:
+            # The replicas seed the random generators, the ones of the current process are restored as in a worker
+            random_state, np_random_state = random.getstate(), np.random.get_state()
+            results = [anneal_pooled_replica(*task) for task in tasks]
+            random.setstate(random_state)
+            np.random.set_state(np_random_state)
+            return results
+        return self.pool.starmap(anneal_pooled_replica, tasks)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+        _replica_dataset.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def parallel_tempering(duration_matrix: list,
+                       customer_demands: list,
+                       vehicle_capacity: int,
+                       initial_solutions: list,
+                       temperatures: list,
+                       terminate_after: int,
+                       exchange_interval: int,
+                       n_jobs: int,
+                       operator_selection='all',
+                       decoder=DEFAULT_DECODER):
+    '''Runs one replica per temperature in parallel and periodically exchanges the states of
+    neighbouring replicas with the replica exchange Metropolis criterion.'''
 
-    return {'plans': sol_optimal, 'sol_sum': sol_sum, 'sol_max': sol_max, 'exec_time': exec_time}
+    # Start timer
+    time_start = time()
+
+    replicas = len(temperatures)
+    states = initial_solutions
+    best_result = None
+    all_results = []
+    total_iterations = 0
+    exchange_round = 0
+    exchanges_tried = 0
+    exchanges_accepted = 0
+
+    # The worker processes live until the last exchange round and receive the duration matrix only once
+    with ReplicaPool(n_jobs, duration_matrix, customer_demands, vehicle_capacity, operator_selection,
+                     decoder) as replica_pool:
+        while total_iterations < terminate_after:
+            iterations = min(exchange_interval, terminate_after - total_iterations)
+            results = replica_pool.anneal(states, temperatures, iterations)
+            total_iterations += iterations
+            all_results += results
+
+            # Keep the global best over all replicas
+            for result in results:
+                if best_result is None or result['sol_max'] < best_result['sol_max']:
+                    best_result = result
+
+            states = [result['current_plans'] for result in results]
+            costs = [result['current_max'] for result in results]
+
+            # Exchange neighbouring replicas, alternating between the even and the odd pairs
+            for idx in range(exchange_round % 2, replicas - 1, 2):
+                exchanges_tried += 1
+                exponent = (1 / temperatures[idx] - 1 / temperatures[idx + 1]) * \
+                    (costs[idx] - costs[idx + 1])
+                if exponent >= 0 or random.uniform(0, 1) < math.exp(exponent):
+                    exchanges_accepted += 1
+                    states[idx], states[idx + 1] = states[idx + 1], states[idx]
+                    costs[idx], costs[idx + 1] = costs[idx + 1], costs[idx]
+            exchange_round += 1
+
+    best_result['exec_time'] = time() - time_start
+    best_result['exchange_rate'] = exchanges_accepted / exchanges_tried if exchanges_tried else 0
+    best_result['operator_stats'] = merge_operator_stats(all_results)
+
+    return best_result
 
 
 def solve(durations: list,
@@ -327,21 +708,59 @@ def solve(durations: list,
           step_length: int,
           terminate_after: int,
           repeat_annealing: int,
-          ignored_customers=[]):
+          ignored_customers=[],
+          replicas=1,
+          exchange_interval=DEFAULT_EXCHANGE_INTERVAL,
+          operator_selection='all',
+          decoder=DEFAULT_DECODER,
+          initial_tours=None):
 
     # Prepare parameters for Simulated Annealing
     N = customer_count
     duration_matrix = np.array(durations[:N+1])
     customer_demands = [location['demand'] for location in locations][:N+1]
 
+    # The split decoder finds the warehouse visits itself, so the plans consist of the customers only
+    if decoder == 'split':
+        max_cycles = 1
+
     # Initialize results for each repeated SA call
     best_score = INF + 1
     best_result = None
-
-    for _ in range(repeat_annealing):
-
-        initial_solution = generate_random_initial_solution(
-            customer_count, vehicle_count, max_cycles, ignored_customers)
+    results = []
+
+    # The first anneal starts from the given tours, e.g. the remaining tours of a re-optimization, the others at random
+    def initial_solution_at(idx):
+        if idx == 0 and initial_tours is not None:
+            return generate_warm_start_initial_solution(
+                initial_tours, customer_count, vehicle_count, max_cycles, ignored_customers)
+        return generate_random_initial_solution(customer_count, vehicle_count, max_cycles, ignored_customers)
+
+    # Replace the repeated anneals with replica exchange over the cooling schedule's temperatures
+    if replicas > 1:
+        # The cores are granted by the CPU budget of the process, so that concurrent runs do not oversubscribe the CPU
+        with CPU_BUDGET.grant(replicas) as n_jobs:
+            # Each replica runs as long as the repeated anneals would, given the number of cores
+            iterations = max(1, terminate_after * repeat_annealing // math.ceil(replicas / n_jobs))
+            final_temperature = initial_temperature * \
+                cooling_factor ** (terminate_after / step_length)
+            initial_solutions = [initial_solution_at(idx) for idx in range(replicas)]
+
+            best_result = parallel_tempering(duration_matrix,
+                                             customer_demands,
+                                             vehicle_capacity,
+                                             initial_solutions,
+                                             temperature_ladder(initial_temperature, final_temperature, replicas),
+                                             iterations,
+                                             exchange_interval,
+                                             n_jobs,
+                                             operator_selection,
+                                             decoder)
+            repeat_annealing = 0
+
+    for repeat_idx in range(repeat_annealing):
+
+        initial_solution = initial_solution_at(repeat_idx)
 
         result = anneal(duration_matrix,
                         customer_demands,
@@ -352,7 +771,10 @@ def solve(durations: list,
                         step_length,
                         terminate_after,
                         trace_progress=False,
-                        icon=None)
+                        icon=None,
+                        operator_selection=operator_selection,
+                        decoder=decoder)
+        results.append(result)
 
         if result["sol_max"] < best_score:
             best_result = result
@@ -360,6 +782,14 @@ def solve(durations: list,
 
     # Result found here
 
+    # Inserts the warehouse visits found by the split decoder into a plan
+    def split_plan(plan):
+        cost, cycles = split_single_vehicle(duration_matrix.tolist(), customer_demands, vehicle_capacity,
+                                            split_order(plan))
+        if cost >= INF:
+            return plan
+        return [node for cycle in cycles for node in cycle[1:]][:-1]
+
     # Adds warehouse to the begin and end of a plans
     def add_begin_and_end(solution):
         return [[0] + plan + [0] for plan in solution]
@@ -413,8 +843,20 @@ def solve(durations: list,
     if best_result is None:
         return {}
 
+    if results:
+        best_result['operator_stats'] = merge_operator_stats(results)
+
+    # All vehicles start at the beginning of the day
+    customers = [idx for idx in range(1, N + 1) if idx not in ignored_customers]
+    lower_bound, _ = get_vrp_lower_bound(vehicle_capacity, customers, durations, customer_demands,
+                                         [0] * vehicle_count)
+
     return {
         "durationMax": best_result['sol_max'],
         "durationSum": best_result['sol_sum'],
-        "vehicles": standardize_solution(best_result['plans'])
+        "lowerBound": lower_bound,
+        "gap": get_gap(best_result['sol_max'], lower_bound),
+        "vehicles": standardize_solution([split_plan(plan) for plan in best_result['plans']]
+                                         if decoder == 'split' else best_result['plans']),
+        "operatorStats": best_result['operator_stats']
     }